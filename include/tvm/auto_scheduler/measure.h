@@ -171,6 +171,11 @@ class MeasureResultNode : public Object {
   double all_cost;
   /*! \brief The time stamps of this measurement. */
   double timestamp;
+  /*!
+   * \brief The sample variance of the measured costs, -1 if unknown.
+   * It is not written to the tuning logs.
+   */
+  double variance = -1;
 
   void VisitAttrs(tvm::AttrVisitor* v) {
     v->Visit("costs", &costs);
@@ -178,6 +183,7 @@ class MeasureResultNode : public Object {
     v->Visit("error_msg", &error_msg);
     v->Visit("all_cost", &all_cost);
     v->Visit("timestamp", &timestamp);
+    v->Visit("variance", &variance);
   }
 
   /*! \brief Do shallow copy. */
@@ -200,9 +206,10 @@ class MeasureResult : public ObjectRef {
    * \param error_msg The error message if there is any error.
    * \param all_cost The time cost of build and run.
    * \param timestamp The time stamps of this measurement.
+   * \param variance The sample variance of the measured costs, -1 if unknown.
    */
   MeasureResult(Array<PrimExpr> costs, int error_no, String error_msg, double all_cost,
-                double timestamp);
+                double timestamp, double variance = -1);
 
   TVM_DEFINE_OBJECT_REF_METHODS(MeasureResult, ObjectRef, MeasureResultNode);
 };
@@ -279,6 +286,14 @@ class ProgramRunnerNode : public Object {
   double cooldown_interval;
   /*! \brief Whether to flush cache on CPU between repeated measurements. */
   bool enable_cpu_cache_flush;
+  /*! \brief Whether to choose the number of repeats of every program adaptively. */
+  bool adaptive;
+  /*! \brief The maximum number of repeats in the adaptive mode. */
+  int max_repeat;
+  /*! \brief The ratio to the best cost above which a program is stopped in the adaptive mode. */
+  double early_stop_ratio;
+  /*! \brief The target relative half width of the 95% confidence interval of the mean cost. */
+  double target_ci;
 
   /*!
    * \brief Run measurement and return results.
@@ -311,6 +326,8 @@ class LocalBuilderNode : public ProgramBuilderNode {
  public:
   /*! \brief Build function. */
   String build_func;
+  /*! \brief Whether to build in a pool of long-lived worker processes. */
+  bool reuse_workers;
 
   Array<BuildResult> Build(const Array<MeasureInput>& inputs, int verbose) final;
 
@@ -330,8 +347,9 @@ class LocalBuilder : public ProgramBuilder {
    * This will be used in a wrapper of the multiprocessing.Process.join().
    * \param n_parallel The number of threads used to build in parallel.
    * \param build_func The name of the registered build function.
+   * \param reuse_workers Whether to build in a pool of long-lived worker processes.
    */
-  LocalBuilder(int timeout, int n_parallel, const String& build_func);
+  LocalBuilder(int timeout, int n_parallel, const String& build_func, bool reuse_workers = false);
 
   TVM_DEFINE_OBJECT_REF_METHODS(LocalBuilder, ProgramBuilder, LocalBuilderNode);
 };
@@ -362,9 +380,16 @@ class LocalRunner : public ProgramRunner {
    * \param min_repeat_ms The minimum duration of one repeat in milliseconds.
    * \param cooldown_interval The cool down interval between two measurements.
    * \param enable_cpu_cache_flush Whether to flush cache on CPU between repeated measurements.
+   * \param adaptive Whether to choose the number of repeats of every program adaptively.
+   * \param max_repeat The maximum number of repeats in the adaptive mode.
+   * \param early_stop_ratio The ratio to the best cost above which a program is stopped in the
+   * adaptive mode.
+   * \param target_ci The target relative half width of the confidence interval of the mean cost
+   * in the adaptive mode.
    */
   LocalRunner(int timeout, int number, int repeat, int min_repeat_ms, double cooldown_interval,
-              bool enable_cpu_cache_flush);
+              bool enable_cpu_cache_flush, bool adaptive = false, int max_repeat = 0,
+              double early_stop_ratio = 2.0, double target_ci = 0.05);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(LocalRunner, ProgramRunner, LocalRunnerNode);
 };
@@ -386,6 +411,20 @@ class RPCRunnerNode : public ProgramRunnerNode {
   int priority;
   /*! \brief The number of tasks run in parallel. */
   int n_parallel;
+  /*! \brief Whether to reuse long-lived RPC sessions across measurements. */
+  bool reuse_session;
+  /*! \brief The maximum number of programs measured with one RPC call. */
+  int batch_size;
+
+  void VisitAttrs(tvm::AttrVisitor* v) {
+    v->Visit("key", &key);
+    v->Visit("host", &host);
+    v->Visit("port", &port);
+    v->Visit("priority", &priority);
+    v->Visit("n_parallel", &n_parallel);
+    v->Visit("reuse_session", &reuse_session);
+    v->Visit("batch_size", &batch_size);
+  }
 
   Array<MeasureResult> Run(const Array<MeasureInput>& inputs,
                            const Array<BuildResult>& build_results, int verbose) final;
@@ -414,10 +453,20 @@ class RPCRunner : public ProgramRunner {
    * \param min_repeat_ms The minimum duration of one repeat in milliseconds.
    * \param cooldown_interval The cool down interval between two measurements.
    * \param enable_cpu_cache_flush Whether to flush cache on CPU between repeated measurements.
+   * \param reuse_session Whether to reuse long-lived RPC sessions across measurements.
+   * \param batch_size The maximum number of programs measured with one RPC call.
+   * \param adaptive Whether to choose the number of repeats of every program adaptively.
+   * \param max_repeat The maximum number of repeats in the adaptive mode.
+   * \param early_stop_ratio The ratio to the best cost above which a program is stopped in the
+   * adaptive mode.
+   * \param target_ci The target relative half width of the confidence interval of the mean cost
+   * in the adaptive mode.
    */
   RPCRunner(const String& key, const String& host, int port, int priority, int n_parallel,
             int timeout, int number, int repeat, int min_repeat_ms, double cooldown_interval,
-            bool enable_cpu_cache_flush);
+            bool enable_cpu_cache_flush, bool reuse_session = false, int batch_size = 1,
+            bool adaptive = false, int max_repeat = 0, double early_stop_ratio = 2.0,
+            double target_ci = 0.05);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(RPCRunner, ProgramRunner, RPCRunnerNode);
 };
@@ -473,6 +522,18 @@ class ProgramMeasurerNode : public Object {
   void SilentMeasure(const SearchTask& task, const Array<MeasureInput>& inputs,
                      Array<MeasureResult>* results);
 
+  /*!
+   * \brief Update the book keeping variables with a measured batch and call the callbacks.
+   * Measure does this for every batch it measures, it is exposed for the measurements that are
+   * done with the builder and runner directly (e.g. in another thread).
+   * \param task The current SearchTask.
+   * \param policy The current SearchPolicy.
+   * \param inputs The measured MeasureInputs.
+   * \param results The MeasureResults of the inputs.
+   */
+  void UpdateWithResults(const SearchTask& task, const SearchPolicy& policy,
+                         const Array<MeasureInput>& inputs, const Array<MeasureResult>& results);
+
   /*! \brief The default max continuous error setting. */
   static const int DEFAULT_MAX_CONTINUOUS_ERROR = 150;
 
@@ -162,6 +162,24 @@ class SearchPolicyNode : public Object {
   virtual std::pair<Array<MeasureInput>, Array<MeasureResult>> ContinueSearchOneRound(
       int num_measure, ProgramMeasurer measurer) = 0;
 
+  /*!
+   * \brief Do the search part of a search round and pick the programs to measure.
+   * ContinueSearchOneRound is this followed by the measurement and UpdateWithMeasureResults,
+   * the split lets the caller do the measurement somewhere else (e.g. in another thread).
+   * \param num_measure The number of measurements
+   * \return The programs to measure in this search round
+   */
+  virtual Array<MeasureInput> PickMeasureInputs(int num_measure) = 0;
+
+  /*!
+   * \brief Update the search policy (e.g. the cost model) with the measurements of the programs
+   * returned by the last PickMeasureInputs.
+   * \param inputs The measured programs
+   * \param results The measurement results
+   */
+  virtual void UpdateWithMeasureResults(const Array<MeasureInput>& inputs,
+                                        const Array<MeasureResult>& results) = 0;
+
   /*!
    * \brief Preload measured states from a log file to resume the state of the search policy.
    * \param log_file The name of the record log file.
@@ -17,15 +17,23 @@
 # pylint: disable=invalid-name
 
 """Cost model based on xgboost"""
+import inspect
 import multiprocessing
 import logging
+import time
 from collections import defaultdict
 
 import numpy as np
 
 from tvm.autotvm.tuner.metric import max_curve
+from tvm.contrib import utils
 from .cost_model import PythonBasedModel
-from ..feature import get_per_store_features_from_measure_pairs, get_per_store_features_from_states
+from ..feature import (
+    get_per_store_features_from_measure_pairs,
+    get_per_store_features_from_states,
+    load_per_store_features,
+    save_per_store_features_from_file,
+)
 from ..measure_record import RecordReader
 
 xgb = None
@@ -86,9 +94,35 @@ class XGBModel(PythonBasedModel):
     of several samples, so we implemented a custom loss function and call it pack-sum-rmse.
     It is called "pack-sum" because we combine several samples into a "pack" and sum up
     their predictions.
+
+    Parameters
+    ----------
+    verbose_eval: int = 25
+        Print training log every `verbose_eval` iterations.
+    num_warmup_sample: int = 100
+        The minimum number of samples to start to use the trained model.
+        Before that, the model predicts random scores.
+    seed: Optional[int]
+        The random seed of xgboost.
+    incremental: bool = False
+        Whether to train incrementally. In incremental mode, the flattened features of
+        all measured programs are cached, so a round only flattens the features of the new
+        programs. The booster continues boosting from the previous model instead of being
+        re-trained from scratch, except for every `full_refit_interval`-th round.
+    full_refit_interval: int = 10
+        In incremental mode, re-train the model from scratch every `full_refit_interval`
+        rounds. This bounds the size of the model and lets it catch up with the
+        normalized throughputs, which change when faster programs are found.
     """
 
-    def __init__(self, verbose_eval=25, num_warmup_sample=100, seed=None):
+    def __init__(
+        self,
+        verbose_eval=25,
+        num_warmup_sample=100,
+        seed=None,
+        incremental=False,
+        full_refit_interval=10,
+    ):
         global xgb
         try:
             if xgb is None:
@@ -116,6 +150,8 @@ class XGBModel(PythonBasedModel):
         self.plan_size = 32
         self.num_warmup_sample = num_warmup_sample
         self.verbose_eval = verbose_eval
+        self.incremental = incremental
+        self.full_refit_interval = full_refit_interval
 
         super().__init__()
 
@@ -123,10 +159,24 @@ class XGBModel(PythonBasedModel):
         self.inputs = []
         self.results = []
         self.inputs_feature_cache = []
+        # flattened feature rows of all measured programs and their number of rows,
+        # only used in incremental mode
+        self.flat_features = None
+        self.pack_sizes = np.empty((0,), dtype=np.int64)
+        # memory-mapped features loaded by update_from_file with a chunk_size, as
+        # (temp directory, feature rows, pack sizes, normalized throughputs, task ids)
+        self.pretrain_sets = []
+        self.num_pretrain_samples = 0
+        # the number of updates and the time spent in every update
+        self.num_updates = 0
+        self.fit_times = []
 
     def update(self, inputs, results):
         """Update the cost model according to new measurement results (training data).
-        XGBoost does not support incremental training, so we re-train a new model every time.
+        By default, a new model is trained from scratch on all samples every time. With
+        `incremental`, the booster continues boosting from the previous model on the cached
+        features instead, and is only re-trained from scratch every `full_refit_interval`
+        updates.
         Parameters
         ----------
         inputs : List[MeasureInput]
@@ -138,6 +188,11 @@ class XGBModel(PythonBasedModel):
             return
         assert len(inputs) == len(results)
 
+        self._fit(*self._extract_features(inputs, results))
+
+    def _extract_features(self, inputs, results):
+        """Add new samples and extract their features.
+        Returns the features, normalized throughputs and task ids of all samples."""
         self.inputs.extend(inputs)
         self.results.extend(results)
 
@@ -151,15 +206,52 @@ class XGBModel(PythonBasedModel):
             features[:n_cached] = self.inputs_feature_cache
             features = np.array(features, dtype=object)
         self.inputs_feature_cache = features
-        dtrain = pack_sum_xgbmatrix(
-            features, normalized_throughputs, task_ids, normalized_throughputs
-        )
+        if self.incremental:
+            self._append_flat_features(features[n_cached:])
+        return features, normalized_throughputs, task_ids
+
+    def _fit(self, features, normalized_throughputs, task_ids):
+        """Train the model on all samples"""
+        tic = time.time()
+        if self.incremental or self.pretrain_sets:
+            if self.incremental:
+                flat_features, pack_sizes = self.flat_features, self.pack_sizes
+            else:
+                flat_features, pack_sizes = flatten_features(features)
+            row_chunks, pack_sizes, normalized_throughputs, task_ids = self._merge_pretrain_sets(
+                flat_features, pack_sizes, normalized_throughputs, task_ids
+            )
+            # stream the memory-mapped pretraining sets into an external-memory DMatrix
+            cache = utils.tempdir() if self.pretrain_sets else None
+            dtrain = flat_pack_sum_xgbmatrix(
+                row_chunks,
+                pack_sizes,
+                normalized_throughputs,
+                task_ids,
+                normalized_throughputs,
+                cache_prefix=cache.relpath("dtrain") if cache else None,
+            )
+            full_refit = (
+                not self.incremental
+                or self.bst is None
+                or self.num_updates % self.full_refit_interval == 0
+            )
+        else:
+            dtrain = pack_sum_xgbmatrix(
+                features, normalized_throughputs, task_ids, normalized_throughputs
+            )
+            full_refit = True
+
+        if not full_refit:
+            # forget the early stopping status of the last training,
+            # which was evaluated on the old training set
+            self.bst.set_attr(best_score=None, best_iteration=None, best_msg=None)
 
         # train xgb model
         self.bst = xgb.train(
             self.xgb_params,
             dtrain,
-            num_boost_round=10000,
+            num_boost_round=10000 if full_refit else 100,
             obj=pack_sum_square_error,
             callbacks=[
                 custom_callback(
@@ -174,8 +266,63 @@ class XGBModel(PythonBasedModel):
                     verbose_eval=self.verbose_eval,
                 )
             ],
+            xgb_model=None if full_refit else self.bst,
+        )
+
+        self.num_updates += 1
+        self.fit_times.append(time.time() - tic)
+        logger.info(
+            "XGBModel: %s on %d samples in %.2f s",
+            "Fitted" if full_refit else "Continued fitting",
+            self.num_samples(),
+            self.fit_times[-1],
         )
 
+    def _append_flat_features(self, features):
+        """Append the feature rows of new programs to the flattened feature cache"""
+        rows, pack_sizes = flatten_features(features)
+        if rows is not None:
+            if self.flat_features is not None:
+                rows = np.concatenate((self.flat_features, rows))
+            self.flat_features = rows
+        self.pack_sizes = np.concatenate((self.pack_sizes, pack_sizes))
+
+    def _merge_pretrain_sets(self, flat_features, pack_sizes, normalized_throughputs, task_ids):
+        """Merge the memory-mapped pretraining sets and the measured samples, sorted by group.
+        Every set keeps its own task ids, as its throughputs are normalized on their own.
+        The rows are returned as a list of chunks, so the memory-mapped rows are not copied."""
+        row_chunks, all_pack_sizes, all_throughputs, all_task_ids = [], [], [], []
+        n_tasks = 0
+        task_ids = np.asarray(task_ids, dtype=np.int64)
+        if np.any(np.diff(task_ids) < 0):
+            # the pretraining sets are saved sorted by task, only the new samples may need it
+            if flat_features is not None:
+                flat_features, order = sort_rows_by_group(flat_features, pack_sizes, task_ids)
+            else:
+                order = np.argsort(task_ids, kind="stable")
+            pack_sizes, normalized_throughputs = pack_sizes[order], normalized_throughputs[order]
+            task_ids = task_ids[order]
+        measured = (flat_features, pack_sizes, normalized_throughputs, task_ids)
+        for rows, sizes, throughputs, ids in [x[1:] for x in self.pretrain_sets] + [measured]:
+            if len(sizes) == 0:
+                continue
+            if rows is not None:
+                row_chunks.append(rows)
+            all_pack_sizes.append(sizes)
+            all_throughputs.append(throughputs)
+            all_task_ids.append(np.asarray(ids, dtype=np.int64) + n_tasks)
+            n_tasks = int(all_task_ids[-1].max()) + 1
+        return (
+            row_chunks,
+            np.concatenate(all_pack_sizes),
+            np.concatenate(all_throughputs),
+            np.concatenate(all_task_ids),
+        )
+
+    def num_samples(self):
+        """The number of samples the model is trained on, including the pretraining sets"""
+        return len(self.inputs) + self.num_pretrain_samples
+
     def predict(self, task, states):
         """Predict the scores of states
         Parameters
@@ -190,7 +337,7 @@ class XGBModel(PythonBasedModel):
             The predicted scores for all states
         """
         features = get_per_store_features_from_states(states, task)
-        if self.bst is not None and len(self.inputs) > self.num_warmup_sample:
+        if self.bst is not None and self.num_samples() > self.num_warmup_sample:
             dtest, pack_ids = feature_to_pack_sum_xgbmatrix(features)
             raw_preds = self.bst.predict(dtest)
             ret = predict_throughput_pack_sum(raw_preds, pack_ids)
@@ -241,7 +388,7 @@ class XGBModel(PythonBasedModel):
         into a single float array.
         """
         features = get_per_store_features_from_states(states, task)
-        if self.bst is not None and len(self.inputs) > self.num_warmup_sample:
+        if self.bst is not None and self.num_samples() > self.num_warmup_sample:
             dtest, pack_ids = feature_to_pack_sum_xgbmatrix(features)
             raw_preds = self.bst.predict(dtest)
             breakdown = predict_throughput_pack_sum(raw_preds, pack_ids)
@@ -268,7 +415,7 @@ class XGBModel(PythonBasedModel):
 
         return breakdown
 
-    def update_from_file(self, file_name, n_lines=None):
+    def update_from_file(self, file_name, n_lines=None, chunk_size=None):
         """Load measure records from a log file to update the cost model.
         This function can be used to pre-train the cost model with history log files.
         Parameters
@@ -277,10 +424,37 @@ class XGBModel(PythonBasedModel):
             The filename
         n_lines: Optional[int]
             Only load first n lines of the log file
+        chunk_size: Optional[int]
+            If set, do not keep the records in memory. Their features are extracted in
+            chunks of this size into memory-mapped files in a temporary directory, see
+            :code:`auto_scheduler.feature.save_per_store_features_from_file`, and the
+            model is trained on these files now and in all later updates. With
+            xgboost>=1.5, the files are read block by block into an external-memory
+            DMatrix instead of being loaded into memory. The throughputs of the records
+            are normalized within the file.
         """
-        inputs, results = RecordReader(file_name).read_lines(n_lines)
-        logger.info("XGBModel: Loaded %s measurement records from %s", len(inputs), file_name)
-        self.update(inputs, results)
+        if chunk_size is None:
+            inputs, results = RecordReader(file_name).read_lines(n_lines)
+            logger.info("XGBModel: Loaded %s measurement records from %s", len(inputs), file_name)
+            self.update(inputs, results)
+            return
+
+        temp = utils.tempdir()
+        prefix = temp.relpath("features")
+        n_loaded = save_per_store_features_from_file(file_name, prefix, chunk_size, n_lines)
+        logger.info("XGBModel: Loaded %s measurement records from %s", n_loaded, file_name)
+        if n_loaded == 0:
+            return
+        self.pretrain_sets.append((temp,) + load_per_store_features(prefix))
+        self.num_pretrain_samples += n_loaded
+        if self.inputs:
+            self._fit(*self._extract_features([], []))
+        else:
+            self._fit(
+                np.empty((0,), dtype=object),
+                np.empty((0,), dtype=np.float32),
+                np.empty((0,), dtype=np.int64),
+            )
 
     def save(self, file_name: str):
         """Save the model to a file
@@ -383,6 +557,157 @@ def pack_sum_xgbmatrix(xs, ys, gids=None, weights=None):
     return ret
 
 
+def flatten_features(features):
+    """Concatenate the feature rows of several programs
+    Parameters
+    ----------
+    features: np.ndarray
+        The feature vectors of programs, one array of rows per program
+    Returns
+    -------
+    x_flatten: Optional[np.ndarray]
+        The feature rows of all programs, or None if there are no rows
+    pack_sizes: np.ndarray
+        The number of feature rows of every program
+    """
+    pack_sizes = np.array([len(x) for x in features], dtype=np.int64)
+    rows = [np.asarray(x, dtype=np.float32) for x in features if len(x)]
+    return (np.concatenate(rows) if rows else None), pack_sizes
+
+
+def sort_rows_by_group(x_flatten, pack_sizes, gids):
+    """Sort flattened features by group, keeping the order of the samples in a group
+    Parameters
+    ----------
+    x_flatten: np.ndarray
+        The feature rows of all samples, concatenated in the order of samples
+    pack_sizes: np.ndarray
+        The number of feature rows of every sample
+    gids: np.ndarray
+        Group id (task id)
+    Returns
+    -------
+    x_sorted: np.ndarray
+        The feature rows in the sorted order of samples
+    sample_order: np.ndarray
+        The sorted order of samples, to sort the other arrays of samples with
+    """
+    sample_order = np.argsort(gids, kind="stable")
+    sizes = pack_sizes[sample_order]
+    starts = (np.cumsum(pack_sizes) - pack_sizes)[sample_order]
+    rows = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(np.sum(sizes))
+    return x_flatten[rows], sample_order
+
+
+def iter_row_blocks(row_chunks, block_size=65536):
+    """Generator: split consecutive chunks of rows into blocks without copying them
+    Parameters
+    ----------
+    row_chunks: List[np.ndarray]
+        The chunks of rows, e.g. memory-mapped arrays
+    block_size: int = 65536
+        The maximum number of rows in a block
+    Yields
+    ------
+    begin: int
+        The index of the first row of the block in the concatenation of all chunks
+    rows: np.ndarray
+        A view of the rows of the block
+    """
+    begin = 0
+    for chunk in row_chunks:
+        for i in range(0, len(chunk), block_size):
+            rows = chunk[i : i + block_size]
+            yield begin, rows
+            begin += len(rows)
+
+
+def _supports_external_memory():
+    """Whether xgboost can build an external-memory DMatrix from a DataIter (xgboost>=1.5)"""
+    return hasattr(xgb, "DataIter") and (
+        "cache_prefix" in inspect.signature(xgb.DataIter.__init__).parameters
+    )
+
+
+def _row_chunk_iter(row_chunks, labels, weights, cache_prefix):
+    """Make a xgboost DataIter that feeds the chunks of rows to a DMatrix block by block"""
+
+    class RowChunkIter(xgb.DataIter):
+        """Iterate over the blocks of the chunks of rows"""
+
+        def __init__(self):
+            super().__init__(cache_prefix=cache_prefix)
+            self.blocks = None
+
+        def next(self, input_data):
+            if self.blocks is None:
+                self.blocks = iter_row_blocks(row_chunks)
+            begin, rows = next(self.blocks, (None, None))
+            if rows is None:
+                return 0
+            meta = {"label": labels[begin : begin + len(rows)]}
+            if weights is not None:
+                meta["weight"] = weights[begin : begin + len(rows)]
+            input_data(data=rows, **meta)
+            return 1
+
+        def reset(self):
+            self.blocks = None
+
+    return RowChunkIter()
+
+
+def flat_pack_sum_xgbmatrix(x_flatten, pack_sizes, ys, gids, weights=None, cache_prefix=None):
+    """Convert flattened features into a xgb matrix with pack-sum format.
+    This is the same as :code:`pack_sum_xgbmatrix`, but takes the feature rows of all samples
+    concatenated into one array, so no python loop over the rows is needed.
+    Parameters
+    ----------
+    x_flatten: Union[np.ndarray, List[np.ndarray]]
+        The feature rows of all samples, concatenated in the order of samples, or a list of
+        consecutive chunks of them (e.g. memory-mapped arrays). If the samples are already
+        sorted by group, the rows are used as they are.
+    pack_sizes: np.ndarray
+        The number of feature rows of every sample
+    ys: np.ndarray
+        The normaizlied throughput
+    gids: np.ndarray
+        Group id (task id)
+    weights: Optional[np.ndarray]
+        The weight of samples
+    cache_prefix: Optional[str]
+        If set and supported by xgboost, build an external-memory DMatrix cached in files
+        with this prefix, which reads the rows block by block instead of copying all of them
+        into memory.
+    Returns
+    -------
+    dmatrix: xgb.DMatrix
+        The DMatrix with pack-sum information
+    """
+    row_chunks = list(x_flatten) if isinstance(x_flatten, (list, tuple)) else [x_flatten]
+    if np.any(np.diff(gids) < 0):
+        rows = row_chunks[0] if len(row_chunks) == 1 else np.concatenate(row_chunks)
+        rows, sample_order = sort_rows_by_group(rows, pack_sizes, gids)
+        row_chunks = [rows]
+        pack_sizes, ys, gids = pack_sizes[sample_order], ys[sample_order], gids[sample_order]
+        if weights is not None:
+            weights = weights[sample_order]
+
+    pack_ids = np.repeat(np.arange(len(pack_sizes)), pack_sizes)
+    labels = ys[pack_ids]
+    row_weights = None if weights is None else weights[pack_ids]
+    if cache_prefix is not None and _supports_external_memory():
+        ret = xgb.DMatrix(_row_chunk_iter(row_chunks, labels, row_weights, cache_prefix))
+    else:
+        rows = row_chunks[0] if len(row_chunks) == 1 else np.concatenate(row_chunks)
+        ret = xgb.DMatrix(rows, labels)
+        if row_weights is not None:
+            ret.set_weight(row_weights)
+    dmatrix_context.set("pack_ids", ret, pack_ids)
+    dmatrix_context.set("group_sizes", ret, np.bincount(gids))
+    return ret
+
+
 def predict_throughput_pack_sum(raw_preds, pack_ids):
     """Predict the throughputs for predictions in pack-sum format
     Parameters
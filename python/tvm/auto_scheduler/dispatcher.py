@@ -29,7 +29,7 @@ import pathlib
 import numpy as np
 
 from tvm.tir.expr import FloatImm
-from .measure_record import load_records
+from .measure_record import find_record_index, load_record_index, load_records
 
 logger = logging.getLogger("auto_scheduler")
 
@@ -125,6 +125,9 @@ class ApplyHistoryBest(DispatchContext):
         Collection of tuning records.
         If is str, then it should be the filename of a records log file.
         Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+        The filename can also be a best record index built by
+        :code:`auto_scheduler.measure_record.make_record_index`. For a log file, an
+        up-to-date index built next to it is loaded instead of the log file.
     n_lines: Optional[int]
         if it is not None, only load the first `n_lines` lines of log
     """
@@ -135,6 +138,9 @@ class ApplyHistoryBest(DispatchContext):
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        # the mean costs of the records in best_by_targetkey and best_by_model
+        self._targetkey_costs = {}
+        self._model_costs = {}
 
         self.load(records, n_lines)
 
@@ -155,14 +161,15 @@ class ApplyHistoryBest(DispatchContext):
             records = str(records)
 
         if isinstance(records, str):
+            index_file = find_record_index(records) if n_lines is None else None
+            if index_file is not None:
+                self._load_index(index_file)
+                return
             records = load_records(records)
 
         if not records:
             return
 
-        best_by_targetkey = self.best_by_targetkey
-        best_by_model = self.best_by_model
-
         counter = 0
         for inp, res in records:
             if n_lines is not None and counter >= n_lines:
@@ -171,32 +178,38 @@ class ApplyHistoryBest(DispatchContext):
             if res.error_no != 0:
                 continue
 
+            cost = np.mean([x.value for x in res.costs if isinstance(x, FloatImm)])
             # use target keys in tvm target system as key to build best map
             for k in inp.task.target.keys:
                 key = (k, inp.task.workload_key)
-                if key not in best_by_targetkey:
-                    best_by_targetkey[key] = (inp, res)
-                else:
-                    _, other_res = best_by_targetkey[key]
-                    other_costs = [x.value for x in other_res.costs if isinstance(x, FloatImm)]
-                    costs = [x.value for x in res.costs if isinstance(x, FloatImm)]
-                    if np.mean(other_costs) > np.mean(costs):
-                        best_by_targetkey[key] = (inp, res)
+                self._update_best(
+                    self.best_by_targetkey, self._targetkey_costs, key, inp, res, cost
+                )
 
             # use model as key to build best map
             key = (inp.task.target.model, inp.task.workload_key)
-            if key not in best_by_model:
-                if inp.task.target.model != "unknown":
-                    best_by_model[key] = (inp, res)
-            else:
-                _, other_res = best_by_model[key]
-                other_costs = [x.value for x in other_res.costs if isinstance(x, FloatImm)]
-                costs = [x.value for x in res.costs if isinstance(x, FloatImm)]
-                if np.mean(other_costs) > np.mean(costs):
-                    best_by_model[key] = (inp, res)
+            if inp.task.target.model != "unknown":
+                self._update_best(self.best_by_model, self._model_costs, key, inp, res, cost)
 
         logger.debug("Finish loading %d records", counter)
 
+    def _load_index(self, index_file):
+        """Load the best records from a best record index"""
+        index, inputs, results = load_record_index(index_file)
+        for name, best, costs in [
+            ("best_by_targetkey", self.best_by_targetkey, self._targetkey_costs),
+            ("best_by_model", self.best_by_model, self._model_costs),
+        ]:
+            for key, workload_key, idx, cost in index[name]:
+                self._update_best(best, costs, (key, workload_key), inputs[idx], results[idx], cost)
+        logger.debug("Finish loading %d records from index %s", len(inputs), index_file)
+
+    @staticmethod
+    def _update_best(best, costs, key, inp, res, cost):
+        if key not in best or costs[key] > cost:
+            best[key] = (inp, res)
+            costs[key] = cost
+
     def _query_inside(self, target, workload_key):
         if target is None:
             raise RuntimeError(
@@ -26,13 +26,16 @@ the predicted score of each BufferStoreNode as the score of a TIR Stmt.
 The feature specification is defined by `src/auto_scheduler/feature.cc::FeatureSet`
 """
 
-from typing import List, Tuple, Union, Optional
+from typing import Iterator, List, Tuple, Union, Optional
+import os
 import struct
 
 import numpy as np
 
 from .loop_state import State, StateObject
 from .measure import MeasureInput, MeasureResult
+from .measure_record import RecordReader
+from .utils import array_mean
 from . import _ffi_api
 
 # The maximum number of extracted buffers for one statement
@@ -175,6 +178,196 @@ def get_per_store_features_from_file(
     return unpack_feature(byte_arr)
 
 
+def iter_per_store_features_from_file(
+    filename: str,
+    chunk_size: int = 4096,
+    max_lines: Optional[int] = None,
+    max_n_bufs: Optional[int] = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Generator: get per-store features from a log file in chunks of records.
+
+    Unlike :code:`get_per_store_features_from_file`, which extracts the features of all
+    records at once, this only holds one chunk of records and features in memory.
+    The concatenation of all chunks is the same as the result of
+    :code:`get_per_store_features_from_file`: the throughputs are normalized by the best
+    cost of the task in the whole file and the task ids are numbered across chunks.
+    To this end, the file is read twice.
+
+    Parameters
+    ----------
+    filename: str
+        The input filename
+    chunk_size: int = 4096
+        The maximum number of records in a chunk
+    max_lines: Optional[int]
+        Only extract the first n lines of the file
+    max_n_bufs: Optional[int]
+        The maximum number of extracted buffers for one statement
+
+    Yields
+    ------
+    features: np.ndarray
+        Feature vectors of the records in a chunk
+    normalized_throughputs: np.ndarray
+        Normalized throughputs of the records in a chunk
+    task_ids: np.ndarray
+        Task ids of the records in a chunk
+    """
+
+    def record_costs(inputs, results):
+        keys = [(inp.task.workload_key, str(inp.task.target)) for inp in inputs]
+        costs = np.array([array_mean(res.costs) for res in results], dtype=np.float32)
+        return keys, costs
+
+    # the first pass assigns the task ids and finds the best cost of every task
+    task_id_map = {}
+    min_costs = []
+    for inputs, results in RecordReader(filename).read_chunks(chunk_size, max_lines):
+        for key, cost in zip(*record_costs(inputs, results)):
+            task_id = task_id_map.setdefault(key, len(task_id_map))
+            if task_id == len(min_costs):
+                min_costs.append(cost)
+            else:
+                min_costs[task_id] = min(min_costs[task_id], cost)
+    min_costs = np.array(min_costs, dtype=np.float32)
+
+    # the second pass extracts the features chunk by chunk
+    for inputs, results in RecordReader(filename).read_chunks(chunk_size, max_lines):
+        features, _, _ = get_per_store_features_from_measure_pairs(
+            inputs, results, max_n_bufs=max_n_bufs
+        )
+        keys, costs = record_costs(inputs, results)
+        task_ids = np.array([task_id_map[key] for key in keys], dtype=np.int64)
+        normalized_throughputs = (min_costs[task_ids] / costs).astype(np.float64)
+        yield features, normalized_throughputs, task_ids
+
+
+def save_per_store_features_from_file(
+    filename: str,
+    prefix: str,
+    chunk_size: int = 4096,
+    max_lines: Optional[int] = None,
+    max_n_bufs: Optional[int] = None,
+) -> int:
+    """Extract per-store features from a log file into numpy files that can be memory-mapped.
+
+    The features are extracted in chunks with :code:`iter_per_store_features_from_file`
+    and written to the following files, so the memory usage is bounded by the chunk size.
+    The records are sorted by task id, keeping the order of the records of one task, so
+    that the rows can be trained on without reordering them.
+
+    - prefix + ".features.npy": float32 feature vectors of all records, one row for one
+      statement, concatenated in the sorted order of records.
+    - prefix + ".pack_sizes.npy": the number of rows of every record.
+    - prefix + ".throughputs.npy": the normalized throughputs of all records.
+    - prefix + ".task_ids.npy": the task ids of all records, in ascending order.
+
+    Use :code:`load_per_store_features` to load them.
+
+    Parameters
+    ----------
+    filename: str
+        The input filename
+    prefix: str
+        The prefix of output filenames
+    chunk_size: int = 4096
+        The maximum number of records in a chunk
+    max_lines: Optional[int]
+        Only extract the first n lines of the file
+    max_n_bufs: Optional[int]
+        The maximum number of extracted buffers for one statement
+
+    Returns
+    -------
+    n_records: int
+        The number of records whose features are saved
+    """
+    pack_sizes, throughputs, task_ids = [], [], []
+    vec_len = None
+
+    # the total number of rows is unknown in advance, so write the rows to a raw file first
+    raw_filename = prefix + ".features.raw"
+    with open(raw_filename, "wb") as fout:
+        for features, chunk_throughputs, chunk_task_ids in iter_per_store_features_from_file(
+            filename, chunk_size, max_lines, max_n_bufs
+        ):
+            rows = np.concatenate([np.asarray(x, dtype=np.float32) for x in features])
+            vec_len = rows.shape[1]
+            rows.tofile(fout)
+            pack_sizes.append(np.array([len(x) for x in features], dtype=np.int64))
+            throughputs.append(chunk_throughputs)
+            task_ids.append(chunk_task_ids)
+
+    pack_sizes = np.concatenate(pack_sizes) if pack_sizes else np.empty((0,), np.int64)
+    throughputs = np.concatenate(throughputs) if throughputs else np.empty((0,))
+    task_ids = np.concatenate(task_ids) if task_ids else np.empty((0,), np.int64)
+    order = np.argsort(task_ids, kind="stable")
+
+    try:
+        n_rows = int(np.sum(pack_sizes))
+        out = np.lib.format.open_memmap(
+            prefix + ".features.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(n_rows, vec_len or DEFAULT_FEATURE_VEC_LEN),
+        )
+        if n_rows:
+            raw = np.memmap(raw_filename, dtype=np.float32, mode="r", shape=out.shape)
+            # copy the rows of a chunk of records at a time in the sorted order
+            offsets = np.cumsum(pack_sizes) - pack_sizes
+            pos = 0
+            for begin in range(0, len(order), max(chunk_size, 1)):
+                records = order[begin : begin + max(chunk_size, 1)]
+                sizes = pack_sizes[records]
+                starts = np.cumsum(sizes) - sizes
+                rows = np.repeat(offsets[records] - starts, sizes) + np.arange(np.sum(sizes))
+                out[pos : pos + len(rows)] = raw[rows]
+                pos += len(rows)
+            del raw
+        out.flush()
+        del out
+    finally:
+        os.remove(raw_filename)
+
+    np.save(prefix + ".pack_sizes.npy", pack_sizes[order])
+    np.save(prefix + ".throughputs.npy", throughputs[order])
+    np.save(prefix + ".task_ids.npy", task_ids[order])
+    return len(pack_sizes)
+
+
+def load_per_store_features(
+    prefix: str, mmap_mode: Optional[str] = "r"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Load the features saved by :code:`save_per_store_features_from_file`.
+
+    Parameters
+    ----------
+    prefix: str
+        The prefix of the saved files
+    mmap_mode: Optional[str] = "r"
+        The memory-map mode of the feature vectors, see :code:`numpy.load`.
+        None to load them into memory.
+
+    Returns
+    -------
+    features: np.ndarray
+        Feature vectors of all statements of all records, concatenated in the order of records,
+        which are sorted by task id
+    pack_sizes: np.ndarray
+        The number of feature vectors of every record
+    normalized_throughputs: np.ndarray
+        Normalized throughputs
+    task_ids: np.ndarray
+        Task ids, in ascending order
+    """
+    return (
+        np.load(prefix + ".features.npy", mmap_mode=mmap_mode),
+        np.load(prefix + ".pack_sizes.npy"),
+        np.load(prefix + ".throughputs.npy"),
+        np.load(prefix + ".task_ids.npy"),
+    )
+
+
 def get_per_store_features_from_measure_pairs(
     inputs: List[MeasureInput],
     results: List[MeasureResult],
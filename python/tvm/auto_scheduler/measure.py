@@ -31,18 +31,24 @@ get the measurement results. The flow of data structures is
 We implement these in python to utilize python's multiprocessing and error handling.
 """
 
+import functools
 import os
 import time
 import shutil
 import tempfile
 import multiprocessing
 
+import numpy as np
+
 import tvm._ffi
 from tvm.runtime import Object, module, ndarray
 from tvm.driver import build_module
 from tvm.ir import transform
-from tvm.autotvm.measure.measure_methods import set_cuda_target_arch
+from tvm.autotvm.env import AutotvmGlobalScope
+from tvm.autotvm.measure.measure_methods import adaptive_measure, set_cuda_target_arch
 from tvm.contrib import tar, ndk
+from tvm.contrib.worker_pool import WorkerPool, as_completed
+from tvm.rpc import session_cache
 
 from . import _ffi_api
 from .loop_state import StateObject
@@ -149,13 +155,16 @@ class MeasureResult(Object):
         The time cost of build and run.
     timestamp : float
         The time stamps of this measurement.
+    variance : float = -1
+        The sample variance of the measured costs, -1 if unknown.
+        It is not saved in the tuning logs.
     """
 
-    def __init__(self, costs, error_no, error_msg, all_cost, timestamp):
+    def __init__(self, costs, error_no, error_msg, all_cost, timestamp, variance=-1.0):
         error_msg = error_msg if error_msg else ""
 
         self.__init_handle_by_constructor__(
-            _ffi_api.MeasureResult, costs, error_no, error_msg, all_cost, timestamp
+            _ffi_api.MeasureResult, costs, error_no, error_msg, all_cost, timestamp, variance
         )
 
 
@@ -239,6 +248,10 @@ class ProgramRunner(Object):
         """
         return _ffi_api.ProgramRunnerRun(self, measure_inputs, build_results, verbose)
 
+    def close(self):
+        """Release the resources kept across measurements, e.g. persistent workers and
+        their RPC sessions. The runner can still be used afterwards."""
+
 
 @tvm._ffi.register_object("auto_scheduler.ProgramMeasurer")
 class ProgramMeasurer(Object):
@@ -266,6 +279,23 @@ class ProgramMeasurer(Object):
             _ffi_api.ProgramMeasurer, builder, runner, callbacks, verbose, max_continuous_error
         )
 
+    def update_with_results(self, task, policy, inputs, results):
+        """Update the best states with a batch that was measured with the builder and the
+        runner directly, and call the callbacks on it.
+
+        Parameters
+        ----------
+        task : SearchTask
+            The task of the measured programs
+        policy : SearchPolicy
+            The search policy that picked the programs
+        inputs : List[MeasureInput]
+            The measured programs
+        results : List[MeasureResult]
+            The measurement results
+        """
+        _ffi_api.ProgramMeasurerUpdateWithResults(self, task, policy, inputs, results)
+
 
 @tvm._ffi.register_object("auto_scheduler.LocalBuilder")
 class LocalBuilder(ProgramBuilder):
@@ -280,10 +310,22 @@ class LocalBuilder(ProgramBuilder):
         Number of threads used to build in parallel.
     build_func : str = 'default'
         The name of registered build function.
+    reuse_workers : bool = False
+        Whether to build in a pool of long-lived worker processes instead of starting a
+        new process for every program. The workers are started by a fork server where
+        the platform supports it, and a timeout only kills the worker of the program.
     """
 
-    def __init__(self, timeout=15, n_parallel=multiprocessing.cpu_count(), build_func="default"):
-        self.__init_handle_by_constructor__(_ffi_api.LocalBuilder, timeout, n_parallel, build_func)
+    def __init__(
+        self,
+        timeout=15,
+        n_parallel=multiprocessing.cpu_count(),
+        build_func="default",
+        reuse_workers=False,
+    ):
+        self.__init_handle_by_constructor__(
+            _ffi_api.LocalBuilder, timeout, n_parallel, build_func, reuse_workers
+        )
 
 
 @tvm._ffi.register_object("auto_scheduler.LocalRunner")
@@ -319,6 +361,20 @@ class LocalRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    adaptive: bool = False
+        Whether to choose the number of repeats of every program adaptively, see
+        :code:`tvm.autotvm.measure.measure_methods.adaptive_measure`. A program that is
+        confidently slower than `early_stop_ratio` times the best program of its task so far
+        is stopped after two repeats, the others are repeated until the mean cost is known
+        within `target_ci` or `max_repeat` repeats are taken. The variance of the costs is
+        recorded in the MeasureResult.
+    max_repeat: Optional[int]
+        The maximum number of repeats in the adaptive mode. By default 4 * repeat.
+    early_stop_ratio: float = 2.0
+        The ratio to the best cost above which a program is stopped in the adaptive mode.
+    target_ci: float = 0.05
+        The target half width of the 95% confidence interval of the mean cost relative to
+        the mean in the adaptive mode.
     """
 
     def __init__(
@@ -329,6 +385,10 @@ class LocalRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        adaptive=False,
+        max_repeat=None,
+        early_stop_ratio=2.0,
+        target_ci=0.05,
     ):
         if enable_cpu_cache_flush:
             number = 1
@@ -342,6 +402,10 @@ class LocalRunner(ProgramRunner):
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            adaptive,
+            max_repeat or 4 * repeat,
+            early_stop_ratio,
+            target_ci,
         )
 
 
@@ -390,6 +454,34 @@ class RPCRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool = False
+        Whether to keep long-lived RPC sessions and reuse them across measurements.
+        By default, a new session is requested from the tracker for every measurement.
+        With this option, the measurements run in a pool of persistent worker processes,
+        each of which keeps one session to the device and only uploads and loads the
+        module for a new measurement. The sessions hold their devices until :code:`close`
+        is called.
+    batch_size: int = 1
+        The maximum number of programs measured with one RPC call.
+        If larger than 1, the built modules are sent to the device in one archive and
+        benchmarked by a single remote call, which saves the round-trips of uploading,
+        loading and cleaning up every module. This requires a python RPC server.
+        A timeout or a crash of the device fails the whole batch.
+    adaptive: bool = False
+        Whether to choose the number of repeats of every program adaptively, see
+        :code:`tvm.autotvm.measure.measure_methods.adaptive_measure`. A program that is
+        confidently slower than `early_stop_ratio` times the best program of its task so far
+        is stopped after two repeats, the others are repeated until the mean cost is known
+        within `target_ci` or `max_repeat` repeats are taken. The variance of the costs is
+        recorded in the MeasureResult.
+        This disables batching.
+    max_repeat: Optional[int]
+        The maximum number of repeats in the adaptive mode. By default 4 * repeat.
+    early_stop_ratio: float = 2.0
+        The ratio to the best cost above which a program is stopped in the adaptive mode.
+    target_ci: float = 0.05
+        The target half width of the 95% confidence interval of the mean cost relative to
+        the mean in the adaptive mode.
     """
 
     def __init__(
@@ -405,6 +497,12 @@ class RPCRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
+        batch_size=1,
+        adaptive=False,
+        max_repeat=None,
+        early_stop_ratio=2.0,
+        target_ci=0.05,
     ):
         self.__init_handle_by_constructor__(
             _ffi_api.RPCRunner,
@@ -419,6 +517,12 @@ class RPCRunner(ProgramRunner):
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            reuse_session,
+            batch_size,
+            adaptive,
+            max_repeat or 4 * repeat,
+            early_stop_ratio,
+            target_ci,
         )
 
         if check_remote(key, host, port, priority, timeout):
@@ -431,6 +535,11 @@ class RPCRunner(ProgramRunner):
                 "and make sure you have free devices on the queue status."
             )
 
+    def close(self):
+        """Stop the persistent workers of reuse_session. This also closes the RPC sessions
+        kept in them, so that the devices are free for other clients of the tracker."""
+        _close_rpc_worker_pools(self.key, self.host, self.port)
+
 
 class LocalRPCMeasureContext:
     """A context wrapper for running RPCRunner locally.
@@ -469,6 +578,14 @@ class LocalRPCMeasureContext:
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool = False
+        Whether to reuse the RPC session to the local device across measurements.
+    batch_size: int = 1
+        The maximum number of programs measured with one RPC call.
+    adaptive: bool = False
+        Whether to choose the number of repeats of every program adaptively.
+    max_repeat, early_stop_ratio, target_ci:
+        The options of the adaptive mode, see :code:`RPCRunner`.
     """
 
     def __init__(
@@ -481,6 +598,12 @@ class LocalRPCMeasureContext:
         min_repeat_ms=0,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
+        batch_size=1,
+        adaptive=False,
+        max_repeat=None,
+        early_stop_ratio=2.0,
+        target_ci=0.05,
     ):
         # pylint: disable=import-outside-toplevel
         from tvm.rpc.tracker import Tracker
@@ -514,12 +637,19 @@ class LocalRPCMeasureContext:
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            reuse_session,
+            batch_size,
+            adaptive,
+            max_repeat,
+            early_stop_ratio,
+            target_ci,
         )
         # Wait for the processes to start
         time.sleep(0.5)
 
     def __del__(self):
-        # Close the tracker and server before exit
+        # Close the sessions, the tracker and the server before exit
+        self.runner.close()
         self.tracker.terminate()
         self.server.terminate()
         time.sleep(0.5)
@@ -584,6 +714,28 @@ def _timed_func(inp_serialized, build_func, verbose):
     return filename, args, error_no, error_msg, time.time() - tic
 
 
+def _get_build_func(build_func):
+    """Get the function that exports a built module by its name"""
+    if build_func == "default":
+        return tar.tar
+    if build_func == "ndk":
+        return ndk.create_shared
+    raise ValueError("Invalid build_func" + build_func)
+
+
+def _check_build_result(res, timeout, verbose):
+    """Turn the timeout or the exception of a build job into the fields of a BuildResult"""
+    if isinstance(res, TimeoutError):
+        if verbose >= 1:
+            print(".T", end="")  # Build timeout
+        res = None, [], MeasureErrorNo.BUILD_TIMEOUT, None, timeout
+    elif isinstance(res, Exception):
+        if verbose >= 1:
+            print(".E", end="")  # Build error
+        res = None, [], MeasureErrorNo.COMPILE_HOST, str(res), timeout
+    return res
+
+
 def local_build_worker(args):
     """
     Build function of LocalBuilder to be ran in the Builder thread pool.
@@ -599,28 +751,85 @@ def local_build_worker(args):
         The build result of this Builder thread.
     """
     inp, build_func, timeout, verbose = args
-    if build_func == "default":
-        build_func = tar.tar
-    elif build_func == "ndk":
-        build_func = ndk.create_shared
-    else:
-        raise ValueError("Invalid build_func" + build_func)
+    build_func = _get_build_func(build_func)
 
     res = call_func_with_timeout(timeout, _timed_func, args=(inp, build_func, verbose))
-    if isinstance(res, TimeoutError):
-        if verbose >= 1:
-            print(".T", end="")  # Build timeout
-        res = None, [], MeasureErrorNo.BUILD_TIMEOUT, None, timeout
-    elif isinstance(res, Exception):
-        if verbose >= 1:
-            print(".E", end="")  # Build error
-        res = None, [], MeasureErrorNo.COMPILE_HOST, str(res), timeout
+    return _check_build_result(res, timeout, verbose)
 
-    return res
+
+# n_parallel -> WorkerPool, for LocalBuilders with reuse_workers
+_BUILD_WORKER_POOLS = {}
+
+
+def _get_build_worker_pool(n_parallel):
+    """Get the persistent build workers. They are started by a fork server if the platform
+    supports it, so they do not inherit the threads and runtime state of this process."""
+    if n_parallel not in _BUILD_WORKER_POOLS:
+        start_method = None
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            start_method = "forkserver"
+        _BUILD_WORKER_POOLS[n_parallel] = WorkerPool(n_parallel, start_method=start_method)
+    return _BUILD_WORKER_POOLS[n_parallel]
+
+
+def _build_job(inp_serialized, build_func, cuda_arch):
+    """Build a program in a worker of the build pool"""
+    # the worker does not inherit the global state of the tuning process
+    AutotvmGlobalScope.current.cuda_target_arch = cuda_arch
+    try:
+        return _timed_func(inp_serialized, build_func, 0)
+    # pylint: disable=broad-except
+    except Exception:
+        return Exception(make_traceback_info())
+
+
+def iter_local_builder_build(inputs, timeout, n_parallel, build_func="default", verbose=1):
+    """
+    Build the MeasureInputs in a pool of long-lived worker processes, and yield the
+    BuildResults as soon as they are finished.
+
+    The workers are reused across calls, so a build does not pay for the start of a
+    process. A build that exceeds the timeout kills and replaces only its own worker.
+
+    Parameters
+    ----------
+    inputs : List[MeasureInput]
+        The MeasureInputs to be built.
+    timeout : int
+        The timeout limit (in second) for each build.
+    n_parallel : int
+        Number of worker processes used to build in parallel.
+    build_func : str = 'default'
+        The name of build function to process the built module.
+    verbose: int = 1
+        Verbosity level. 0 for silent, 1 to output information during program building.
+
+    Returns
+    -------
+    iterator : Iterator[Tuple[int, BuildResult]]
+        Yields the index of a MeasureInput in inputs and its BuildResult, in the order
+        the builds finish.
+    """
+    build_func = _get_build_func(build_func)
+    cuda_arch = AutotvmGlobalScope.current.cuda_target_arch
+    pool = _get_build_worker_pool(n_parallel)
+    indices = {}
+    for i, inp in enumerate(inputs):
+        future = pool.submit(_build_job, (inp.serialize(), build_func, cuda_arch), timeout=timeout)
+        indices[future] = i
+
+    for future in as_completed(list(indices)):
+        res = future.get()
+        if verbose >= 1 and not isinstance(res, Exception):
+            print("." if res[2] == MeasureErrorNo.NO_ERROR else ".E", end="", flush=True)
+        res = _check_build_result(res, timeout, verbose)
+        yield indices[future], BuildResult(*res)
 
 
 @tvm._ffi.register_func("auto_scheduler.local_builder.build")
-def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbose=1):
+def local_builder_build(
+    inputs, timeout, n_parallel, build_func="default", verbose=1, reuse_workers=False
+):
     """
     Build function of LocalBuilder to build the MeasureInputs to runnable modules.
 
@@ -637,12 +846,21 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
         The name of build function to process the built module.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program building.
+    reuse_workers: bool = False
+        Whether to build in a pool of long-lived worker processes,
+        see :code:`iter_local_builder_build`.
 
     Returns
     -------
     res : List[BuildResult]
         The build results of these MeasureInputs.
     """
+    if reuse_workers:
+        results = [None] * len(inputs)
+        for i, res in iter_local_builder_build(inputs, timeout, n_parallel, build_func, verbose):
+            results[i] = res
+        return results
+
     # This pool is not doing computationally intensive work, so we can use threads
     pool = multiprocessing.pool.ThreadPool(n_parallel)
     tuple_res = pool.map(
@@ -668,6 +886,44 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
     return results
 
 
+# (device key, workload key, target) -> the best mean cost of the task so far,
+# for the early stop of the adaptive measurement
+_ADAPTIVE_BEST_COSTS = {}
+
+
+def _adaptive_options(device_key, inp, max_repeat, early_stop_ratio, target_ci):
+    """Get the keyword arguments of adaptive_measure for a MeasureInput."""
+    return {
+        "max_repeat": max_repeat,
+        "best_cost": _ADAPTIVE_BEST_COSTS.get(
+            (device_key, inp.task.workload_key, str(inp.task.target))
+        ),
+        "early_stop_ratio": early_stop_ratio,
+        "target_ci": target_ci,
+    }
+
+
+def _update_adaptive_best_costs(device_key, inputs, tuple_res):
+    """Record the best mean costs of the tasks after a measurement."""
+    for inp, res in zip(inputs, tuple_res):
+        if res[1] == MeasureErrorNo.NO_ERROR:
+            key = (device_key, inp.task.workload_key, str(inp.task.target))
+            cost = float(np.mean(res[0]))
+            if key not in _ADAPTIVE_BEST_COSTS or cost < _ADAPTIVE_BEST_COSTS[key]:
+                _ADAPTIVE_BEST_COSTS[key] = cost
+
+
+def _measure_costs(time_f, args, repeat, adaptive):
+    """Measure a program `repeat` times, or adaptively with the keyword arguments of
+    adaptive_measure. Returns the costs and their sample variance."""
+    if adaptive:
+        costs = tuple(adaptive_measure(lambda n: time_f(n)(*args).results, repeat, **adaptive))
+    else:
+        costs = time_f(repeat)(*args).results
+    variance = float(np.var(costs, ddof=1)) if len(costs) > 1 else 0.0
+    return costs, variance
+
+
 def _timed_eval_func(
     inp_serialized,
     build_res,
@@ -677,11 +933,13 @@ def _timed_eval_func(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    adaptive=None,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
     tic = time.time()
     error_no = 0
     error_msg = None
+    variance = -1.0
     try:
         func = module.load_module(build_res.filename)
         ctx = ndarray.context(str(inp.task.target), 0)
@@ -691,14 +949,17 @@ def _timed_eval_func(
         # the PackedFunc as an object. Currently, we pass function name to work
         # around it.
         f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
-        time_f = func.time_evaluator(
-            func.entry_name,
-            ctx,
-            number=number,
-            repeat=repeat,
-            min_repeat_ms=min_repeat_ms,
-            f_preproc=f_prepare,
-        )
+
+        def time_f(n_repeat):
+            return func.time_evaluator(
+                func.entry_name,
+                ctx,
+                number=number,
+                repeat=n_repeat,
+                min_repeat_ms=min_repeat_ms,
+                f_preproc=f_prepare,
+            )
+
     # pylint: disable=broad-except
     except Exception:
         costs = (MAX_FLOAT,)
@@ -713,12 +974,19 @@ def _timed_eval_func(
             for arg in args:
                 random_fill(arg)
             ctx.sync()
-            costs = time_f(*args).results
+            costs, variance = _measure_costs(time_f, args, repeat, adaptive)
         # pylint: disable=broad-except
         except Exception:
             costs = (MAX_FLOAT,)
             error_no = MeasureErrorNo.RUNTIME_DEVICE
             error_msg = make_traceback_info()
+            variance = -1.0
+
+    if reuse_session and remote is not None:
+        if error_no != MeasureErrorNo.NO_ERROR:
+            # the error may have left the session or its device in a bad state
+            session_cache.drop_session(key, host, port)
+        session_cache.remove_uploaded_module(remote, build_res.filename)
 
     shutil.rmtree(os.path.dirname(build_res.filename))
     toc = time.time()
@@ -729,7 +997,7 @@ def _timed_eval_func(
             print("*", end="")
         else:
             print("*E", end="")  # Run error
-    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
+    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc, variance
 
 
 @tvm._ffi.register_func("auto_scheduler.local_runner.run")
@@ -743,6 +1011,10 @@ def local_run(
     cooldown_interval=0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    adaptive=False,
+    max_repeat=0,
+    early_stop_ratio=2.0,
+    target_ci=0.05,
 ):
     """
     Run function of LocalRunner to test the performance of the input BuildResults.
@@ -782,6 +1054,10 @@ def local_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    adaptive: bool = False
+        Whether to choose the number of repeats of every program adaptively.
+    max_repeat, early_stop_ratio, target_ci:
+        The options of the adaptive mode, see :code:`LocalRunner`.
 
     Returns
     -------
@@ -789,7 +1065,10 @@ def local_run(
         The measure results of these MeasureInputs.
     """
 
-    measure_results = []
+    if adaptive:
+        # the adaptive mode repeats a program up to max_repeat times
+        timeout = timeout * max_repeat / max(repeat, 1)
+    tuple_res = []
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
     for inp, build_res in zip(inputs, build_results):
         if build_res.error_no != 0:
@@ -813,6 +1092,9 @@ def local_run(
                     cooldown_interval,
                     enable_cpu_cache_flush,
                     verbose,
+                    _adaptive_options(None, inp, max_repeat, early_stop_ratio, target_ci)
+                    if adaptive
+                    else None,
                 ),
             )
             if isinstance(res, TimeoutError):
@@ -836,12 +1118,14 @@ def local_run(
                     time.time(),
                 )
 
-        measure_results.append(MeasureResult(*res))
+        tuple_res.append(res)
+        if adaptive:
+            _update_adaptive_best_costs(None, [inp], [res])
 
     if verbose >= 1:
         print("")
 
-    return measure_results
+    return [MeasureResult(*res) for res in tuple_res]
 
 
 def _timed_rpc_run(
@@ -858,14 +1142,21 @@ def _timed_rpc_run(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    reuse_session=False,
+    adaptive=None,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
     tic = time.time()
     error_no = 0
     error_msg = None
+    variance = -1.0
+    remote = None
     try:
         # upload built module
-        remote = request_remote(key, host, port, priority, timeout)
+        if reuse_session:
+            remote = session_cache.get_session(key, host, port, priority)
+        else:
+            remote = request_remote(key, host, port, priority, timeout)
         remote.upload(build_res.filename)
         func = remote.load_module(os.path.split(build_res.filename)[1])
         ctx = remote.context(str(inp.task.target), 0)
@@ -875,14 +1166,17 @@ def _timed_rpc_run(
         # the PackedFunc as an object. Currently, we pass function name to work
         # around it.
         f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
-        time_f = func.time_evaluator(
-            func.entry_name,
-            ctx,
-            number=number,
-            repeat=repeat,
-            min_repeat_ms=min_repeat_ms,
-            f_preproc=f_prepare,
-        )
+
+        def time_f(n_repeat):
+            return func.time_evaluator(
+                func.entry_name,
+                ctx,
+                number=number,
+                repeat=n_repeat,
+                min_repeat_ms=min_repeat_ms,
+                f_preproc=f_prepare,
+            )
+
     # pylint: disable=broad-except
     except Exception:
         costs = (MAX_FLOAT,)
@@ -902,16 +1196,24 @@ def _timed_rpc_run(
                 random_fill(arg)
             ctx.sync()
 
-            costs = time_f(*args).results
-            # clean up remote files
-            remote.remove(build_res.filename)
-            remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
-            remote.remove("")
+            costs, variance = _measure_costs(time_f, args, repeat, adaptive)
+            # clean up remote files, the files of a reused session are removed below
+            if not reuse_session:
+                remote.remove(build_res.filename)
+                remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
+                remote.remove("")
         # pylint: disable=broad-except
         except Exception:
             costs = (MAX_FLOAT,)
             error_no = MeasureErrorNo.RUNTIME_DEVICE
             error_msg = make_traceback_info()
+            variance = -1.0
+
+    if reuse_session and remote is not None:
+        if error_no != MeasureErrorNo.NO_ERROR:
+            # the error may have left the session or its device in a bad state
+            session_cache.drop_session(key, host, port)
+        session_cache.remove_uploaded_module(remote, build_res.filename)
 
     shutil.rmtree(os.path.dirname(build_res.filename))
     toc = time.time()
@@ -923,23 +1225,187 @@ def _timed_rpc_run(
         else:
             print("*E", end="")  # Run error
 
-    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
+    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc, variance
 
 
-def _rpc_run_worker(args):
+def _time_evaluate_batch(
+    remote,
+    inp_serialized_list,
+    build_res_list,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    enable_cpu_cache_flush,
+):
+    """Measure a batch of programs with one call of RPCSession.time_evaluate_batch."""
+    return remote.time_evaluate_batch(
+        [build_res.filename for build_res in build_res_list],
+        [
+            [(get_const_tuple(x.shape), x.dtype) for x in build_res.args]
+            for build_res in build_res_list
+        ],
+        str(MeasureInput.deserialize(inp_serialized_list[0]).task.target),
+        number=number,
+        repeat=repeat,
+        min_repeat_ms=min_repeat_ms,
+        f_preproc="cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else "",
+        cooldown_interval=cooldown_interval,
+    )
+
+
+def _timed_rpc_run_batch(
+    inp_serialized_list,
+    build_res_list,
+    key,
+    host,
+    port,
+    priority,
+    timeout,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    enable_cpu_cache_flush,
+    verbose,
+    reuse_session=False,
+):
+    tic = time.time()
+    outs = None
+    try:
+        if reuse_session:
+            remote = session_cache.get_session(key, host, port, priority)
+        else:
+            remote = request_remote(key, host, port, priority, timeout)
+        if remote.supports_time_evaluate_batch():
+            outs = _time_evaluate_batch(
+                remote,
+                inp_serialized_list,
+                build_res_list,
+                number,
+                repeat,
+                min_repeat_ms,
+                cooldown_interval,
+                enable_cpu_cache_flush,
+            )
+    # pylint: disable=broad-except
+    except Exception:
+        outs = [{"error": make_traceback_info(), "stage": "run"}] * len(build_res_list)
+        if reuse_session:
+            session_cache.drop_session(key, host, port)
+
+    if outs is None:
+        # The remote does not support batched measurement. Release the session first,
+        # as the measurements request it again and a server may only have one slot.
+        del remote
+        return [
+            _timed_rpc_run(
+                inp_serialized,
+                build_res,
+                key,
+                host,
+                port,
+                priority,
+                timeout,
+                number,
+                repeat,
+                min_repeat_ms,
+                cooldown_interval,
+                enable_cpu_cache_flush,
+                verbose,
+                reuse_session,
+            )
+            for inp_serialized, build_res in zip(inp_serialized_list, build_res_list)
+        ]
+
+    for build_res in build_res_list:
+        shutil.rmtree(os.path.dirname(build_res.filename))
+    toc = time.time()
+    cost_per_input = (toc - tic) / len(build_res_list)
+
+    results = []
+    for build_res, out in zip(build_res_list, outs):
+        if "error" in out:
+            costs = (MAX_FLOAT,)
+            if out["stage"] == "load":
+                error_no = MeasureErrorNo.COMPILE_DEVICE
+            else:
+                error_no = MeasureErrorNo.RUNTIME_DEVICE
+            error_msg = out["error"]
+        else:
+            costs = tuple(out["costs"])
+            error_no = MeasureErrorNo.NO_ERROR
+            error_msg = None
+        variance = float(np.var(costs, ddof=1)) if error_msg is None and len(costs) > 1 else -1.0
+        if verbose >= 1:
+            if error_no == MeasureErrorNo.NO_ERROR:
+                print("*", end="")
+            else:
+                print("*E", end="")  # Run error
+        results.append(
+            (costs, error_no, error_msg, cost_per_input + build_res.time_cost, toc, variance)
+        )
+    return results
+
+
+def _rpc_run_batch_worker(args, worker_pool=None):
+    """Function to be ran in the RPCRunner thread pool to measure a batch of programs.
+
+    Parameters
+    ----------
+    args : Tuple[List[MeasureInput], List[BuildResult], ...]
+        The inputs and their successful build results plus the rest of the arguments to
+        `rpc_runner_run`.
+    worker_pool : Optional[WorkerPool]
+        If not None, run the measurement in this pool of persistent workers instead of
+        a new process.
+
+    Returns
+    -------
+    res : List[MeasureResult]
+        The measure results of the batch.
+    """
+    _, build_res_list, _, _, _, _, timeout, _, _, _, _, _, verbose, _ = args
+    timeout = timeout * len(build_res_list)
+    if worker_pool is not None:
+        res = worker_pool.submit(_timed_rpc_run_batch, args, timeout=timeout).get()
+    else:
+        res = call_func_with_timeout(timeout, _timed_rpc_run_batch, args=args)
+
+    if isinstance(res, TimeoutError):
+        if verbose >= 1:
+            print("*T", end="")  # Run timeout
+        error_no, error_msg = MeasureErrorNo.RUN_TIMEOUT, None
+    elif isinstance(res, Exception):
+        if verbose >= 1:
+            print("*E", end="")  # Run error
+        error_no, error_msg = MeasureErrorNo.RUNTIME_DEVICE, str(res)
+    else:
+        return res
+    return [
+        ((MAX_FLOAT,), error_no, error_msg, build_res.time_cost + timeout, time.time())
+        for build_res in build_res_list
+    ]
+
+
+def _rpc_run_worker(args, worker_pool=None):
     """Function to be ran in the RPCRunner thread pool.
 
     Parameters
     ----------
     args : Tuple[MeasureInput, BuildResult, ...]
-        Single input and build result plus the rest of the arguments to `rpc_runner_run`.
+        Single input and build result plus the rest of the arguments to `rpc_runner_run`,
+        and the keyword arguments of the adaptive measurement or None.
+    worker_pool : Optional[WorkerPool]
+        If not None, run the measurement in this pool of persistent workers instead of
+        a new process.
 
     Returns
     -------
     res : MeasureResult
         The measure result of this Runner thread.
     """
-    _, build_res, _, _, _, _, timeout, _, _, _, _, _, verbose = args
+    _, build_res, _, _, _, _, timeout, _, _, _, _, _, verbose, _, _ = args
     if build_res.error_no != MeasureErrorNo.NO_ERROR:
         return (
             (MAX_FLOAT,),
@@ -949,7 +1415,10 @@ def _rpc_run_worker(args):
             time.time(),
         )
 
-    res = call_func_with_timeout(timeout, _timed_rpc_run, args=args)
+    if worker_pool is not None:
+        res = worker_pool.submit(_timed_rpc_run, args, timeout=timeout).get()
+    else:
+        res = call_func_with_timeout(timeout, _timed_rpc_run, args=args)
     if isinstance(res, TimeoutError):
         if verbose >= 1:
             print("*T", end="")  # Run timeout
@@ -974,6 +1443,24 @@ def _rpc_run_worker(args):
     return res
 
 
+# (key, host, port, n_parallel) -> WorkerPool, for RPCRunners with reuse_session
+_RPC_WORKER_POOLS = {}
+
+
+def _get_rpc_worker_pool(key, host, port, n_parallel):
+    """Get the persistent workers of a device. The RPC sessions are kept in the workers."""
+    pool_key = (key, host, port, n_parallel)
+    if pool_key not in _RPC_WORKER_POOLS:
+        _RPC_WORKER_POOLS[pool_key] = WorkerPool(n_parallel)
+    return _RPC_WORKER_POOLS[pool_key]
+
+
+def _close_rpc_worker_pools(key, host, port):
+    """Stop the persistent workers of a device, which closes their RPC sessions."""
+    for pool_key in [x for x in _RPC_WORKER_POOLS if x[:3] == (key, host, port)]:
+        _RPC_WORKER_POOLS.pop(pool_key).close()
+
+
 @tvm._ffi.register_func("auto_scheduler.rpc_runner.run")
 def rpc_runner_run(
     inputs,
@@ -990,6 +1477,12 @@ def rpc_runner_run(
     cooldown_interval=0.0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    reuse_session=False,
+    batch_size=1,
+    adaptive=False,
+    max_repeat=0,
+    early_stop_ratio=2.0,
+    target_ci=0.05,
 ):
     """Run function of RPCRunner to test the performance of the input BuildResults.
 
@@ -1038,6 +1531,15 @@ def rpc_runner_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    reuse_session: bool = False
+        Whether to run the measurements in persistent workers that reuse their RPC sessions.
+    batch_size: int = 1
+        The maximum number of programs measured with one RPC call.
+    adaptive: bool = False
+        Whether to choose the number of repeats of every program adaptively.
+        This disables batching.
+    max_repeat, early_stop_ratio, target_ci:
+        The options of the adaptive mode, see :code:`RPCRunner`.
 
     Returns
     -------
@@ -1045,33 +1547,75 @@ def rpc_runner_run(
         The measure results of these MeasureInputs.
     """
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
+    if adaptive:
+        # the adaptive mode repeats a program up to max_repeat times
+        timeout = timeout * max_repeat / max(repeat, 1)
+    worker_pool = None
+    if reuse_session:
+        worker_pool = _get_rpc_worker_pool(key, host, port, n_parallel)
     # This pool is not doing computationally intensive work, so we can use threads
     pool = multiprocessing.pool.ThreadPool(n_parallel)
-    tuple_res = pool.map(
-        _rpc_run_worker,
-        [
-            (
-                inp.serialize(),
-                build_res,
-                key,
-                host,
-                port,
-                priority,
-                timeout,
-                number,
-                repeat,
-                min_repeat_ms,
-                cooldown_interval,
-                enable_cpu_cache_flush,
-                verbose,
-            )
-            for inp, build_res in zip(inputs, build_results)
-        ],
+    run_args = (
+        key,
+        host,
+        port,
+        priority,
+        timeout,
+        number,
+        repeat,
+        min_repeat_ms,
+        cooldown_interval,
+        enable_cpu_cache_flush,
+        verbose,
+        reuse_session,
     )
+    if batch_size > 1 and not adaptive:
+        tuple_res = [None] * len(inputs)
+        todo = []
+        for i, build_res in enumerate(build_results):
+            if build_res.error_no != MeasureErrorNo.NO_ERROR:
+                tuple_res[i] = (
+                    (MAX_FLOAT,),
+                    build_res.error_no,
+                    build_res.error_msg,
+                    build_res.time_cost,
+                    time.time(),
+                )
+            else:
+                todo.append(i)
+        batches = [todo[i : i + batch_size] for i in range(0, len(todo), batch_size)]
+        batch_res = pool.map(
+            functools.partial(_rpc_run_batch_worker, worker_pool=worker_pool),
+            [
+                ([inputs[k].serialize() for k in batch], [build_results[k] for k in batch])
+                + run_args
+                for batch in batches
+            ],
+        )
+        for batch, res in zip(batches, batch_res):
+            for k, measure_res in zip(batch, res):
+                tuple_res[k] = measure_res
+    else:
+        tuple_res = pool.map(
+            functools.partial(_rpc_run_worker, worker_pool=worker_pool),
+            [
+                (inp.serialize(), build_res)
+                + run_args
+                + (
+                    _adaptive_options(key, inp, max_repeat, early_stop_ratio, target_ci)
+                    if adaptive
+                    else None,
+                )
+                for inp, build_res in zip(inputs, build_results)
+            ],
+        )
     pool.terminate()
     pool.join()
     del pool
 
+    if adaptive:
+        _update_adaptive_best_costs(key, inputs, tuple_res)
+
     results = []
     for res in tuple_res:
         results.append(MeasureResult(*res))
@@ -18,6 +18,7 @@
 
 """ Serialization and other I/O support for measurement records (tuning logs). """
 import argparse
+import json
 import logging
 import os
 import itertools
@@ -31,6 +32,12 @@ from . import _ffi_api
 
 logger = logging.getLogger("auto_scheduler")
 
+# The first line of a best record index file
+RECORD_INDEX_HEADER = "# auto_scheduler best record index "
+RECORD_INDEX_VERSION = 1
+# The suffix of the index file built for a log file by `make_record_index`
+RECORD_INDEX_SUFFIX = ".index"
+
 
 @tvm._ffi.register_object("auto_scheduler.RecordToFile")
 class RecordToFile(MeasureCallback):
@@ -90,6 +97,33 @@ class RecordReader(Object):
         )
         return inputs, results
 
+    def read_chunks(self, chunk_size, max_lines=None):
+        """Generator: read the log file in chunks of multiple lines.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of lines in a chunk.
+        max_lines : Optional[int]
+            The maximum number of lines to read in total. None to read all lines.
+
+        Yields
+        ------
+        inputs : List[auto_scheduler.measure.MeasureInput]
+            The MeasureInputs of a chunk.
+        results : List[auto_scheduler.measure.MeasureResult]
+            The MeasureResults of a chunk.
+        """
+        assert chunk_size > 0, "chunk_size must be positive"
+        n_read = 0
+        while max_lines is None or n_read < max_lines:
+            size = chunk_size if max_lines is None else min(chunk_size, max_lines - n_read)
+            inputs, results = self.read_lines(size)
+            if len(inputs) == 0:
+                break
+            n_read += len(inputs)
+            yield inputs, results
+
     def __iter__(self):
         while True:
             ret = _ffi_api.RecordReaderReadNext(self)
@@ -152,6 +186,12 @@ def load_best_record(filename, workload_key=None, target=None):
         The target device.
         With `None`, this returns the best measure pair of all target devices.
 
+    Notes
+    -----
+    If `filename` is a best record index or an up-to-date index has been built for it by
+    :code:`make_record_index`, the best record is looked up in the index without scanning
+    the log file.
+
     Returns
     -------
     input : auto_scheduler.measure.MeasureInput
@@ -159,6 +199,21 @@ def load_best_record(filename, workload_key=None, target=None):
     result : auto_scheduler.measure.MeasureResult
         The best State's MeasureResult from this log fine.
     """
+    index_file = find_record_index(filename)
+    if index_file is not None:
+        index, inputs, results = load_record_index(index_file)
+        best = None
+        for kind, key, idx, cost in index["best_by_kind"]:
+            if workload_key and key != workload_key:
+                continue
+            if target and kind != target.kind.name:
+                continue
+            if best is None or cost < best[1]:
+                best = (idx, cost)
+        if best is None:
+            return None, None
+        return inputs[best[0]], results[best[0]]
+
     log_reader = RecordReader(filename)
     best_cost = 1e30
     best_inp = None
@@ -182,7 +237,7 @@ def load_best_record(filename, workload_key=None, target=None):
     return best_inp, best_res
 
 
-def distill_record_file(in_file, out_file):
+def distill_record_file(in_file, out_file, index=False):
     """
     Pick the best entries from a record file and store them to another file.
     This function distills the useful log entries from a large log file.
@@ -195,6 +250,9 @@ def distill_record_file(in_file, out_file):
         The filename of input
     out_file: str or file
         The filename of output
+    index: bool = False
+        Whether to write the output as a best record index (see :code:`make_record_index`),
+        which can be loaded by ApplyHistoryBest and load_best_record without scanning.
     """
     # pylint: disable=import-outside-toplevel
     from .dispatcher import ApplyHistoryBest
@@ -203,6 +261,12 @@ def distill_record_file(in_file, out_file):
     if os.path.isfile(out_file):
         out_context = load_records(out_file)
         context = itertools.chain(context, out_context)
+
+    if index:
+        n_records = _write_record_index(context, out_file)
+        logger.info("Extract %d best records from %s to %s", n_records, in_file, out_file)
+        return
+
     context, context_clone = itertools.tee(context)
     best_context = ApplyHistoryBest(context)
     best_set = set()
@@ -230,14 +294,166 @@ def distill_record_file(in_file, out_file):
     logger.info("Extract %d best records from %s to %s", len(inputs), in_file, out_file)
 
 
+def make_record_index(log_file, index_file=None):
+    """
+    Build a best record index for a log file.
+
+    The index file is a record file that holds the best records of every workload, so
+    it is still readable by :code:`load_records`. Its first line is a comment that maps
+    (target key, workload key), (target model, workload key) and (target kind, workload key)
+    to the best records and their costs. ApplyHistoryBest and load_best_record load an
+    index without scanning the log file. An index at the default location is used by them
+    whenever they are given the log file, as long as the log file is not modified afterwards.
+
+    Parameters
+    ----------
+    log_file: str
+        The filename of the log file
+    index_file: Optional[str]
+        The filename of the index. Defaults to `log_file` + ".index".
+
+    Returns
+    -------
+    index_file: str
+        The filename of the index
+    """
+    index_file = index_file or log_file + RECORD_INDEX_SUFFIX
+    n_records = _write_record_index(load_records(log_file), index_file, source=log_file)
+    logger.info("Index %d best records of %s in %s", n_records, log_file, index_file)
+    return index_file
+
+
+def is_record_index(filename):
+    """Check whether a file is a best record index.
+
+    Parameters
+    ----------
+    filename: str
+        The filename
+
+    Returns
+    -------
+    ret: bool
+        Whether the file starts with the header of a best record index
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename) as fin:
+        return fin.readline(len(RECORD_INDEX_HEADER)) == RECORD_INDEX_HEADER
+
+
+def find_record_index(filename):
+    """Find the best record index to use for a record file.
+
+    Parameters
+    ----------
+    filename: str
+        The filename of a log file or a best record index
+
+    Returns
+    -------
+    index_file: Optional[str]
+        `filename` itself if it is an index, the index built for it by
+        :code:`make_record_index` if that one is up to date, or None otherwise.
+    """
+    if is_record_index(filename):
+        return filename
+    index_file = filename + RECORD_INDEX_SUFFIX
+    if not os.path.isfile(filename) or not is_record_index(index_file):
+        return None
+    source = _read_record_index_header(index_file).get("source")
+    stat = os.stat(filename)
+    if source != [stat.st_size, stat.st_mtime_ns]:
+        logger.debug("Ignore the outdated record index %s", index_file)
+        return None
+    return index_file
+
+
+def load_record_index(index_file):
+    """Load a best record index.
+
+    Parameters
+    ----------
+    index_file: str
+        The filename of the index
+
+    Returns
+    -------
+    index: Dict[str, List]
+        The index. `index["best_by_targetkey"]`, `index["best_by_model"]` and
+        `index["best_by_kind"]` are lists of [key, workload_key, record_id, cost].
+    inputs: List[MeasureInput]
+        The MeasureInputs of the records in the index, referred by record_id.
+    results: List[MeasureResult]
+        The MeasureResults of the records in the index, referred by record_id.
+    """
+    index = _read_record_index_header(index_file)
+    if index.get("version") != RECORD_INDEX_VERSION:
+        raise ValueError("Unsupported record index version in %s" % index_file)
+    inputs, results = RecordReader(index_file).read_lines()
+    return index, inputs, results
+
+
+def _read_record_index_header(index_file):
+    with open(index_file) as fin:
+        line = fin.readline()
+    return json.loads(line[len(RECORD_INDEX_HEADER) :])
+
+
+def _write_record_index(records, index_file, source=None):
+    """Pick the best records and write them with their index. Returns the number of records."""
+    maps = {"best_by_targetkey": {}, "best_by_model": {}, "best_by_kind": {}}
+
+    def update(best, key, inp, res, cost):
+        if key not in best or best[key][2] > cost:
+            best[key] = (inp, res, cost)
+
+    if source is not None:
+        stat = os.stat(source)
+    for inp, res in records:
+        if res.error_no != MeasureErrorNo.NO_ERROR:
+            continue
+        cost = np.mean([v.value for v in res.costs])
+        target = inp.task.target
+        workload_key = inp.task.workload_key
+        for k in target.keys:
+            update(maps["best_by_targetkey"], (k, workload_key), inp, res, cost)
+        if target.model != "unknown":
+            update(maps["best_by_model"], (target.model, workload_key), inp, res, cost)
+        update(maps["best_by_kind"], (target.kind.name, workload_key), inp, res, cost)
+
+    # save every picked record once
+    record_ids = {}
+    inputs, results = [], []
+    index = {"version": RECORD_INDEX_VERSION}
+    if source is not None:
+        index["source"] = [stat.st_size, stat.st_mtime_ns]
+    for name, best in maps.items():
+        entries = []
+        for (key, workload_key), (inp, res, cost) in best.items():
+            if id(inp) not in record_ids:
+                record_ids[id(inp)] = len(inputs)
+                inputs.append(inp)
+                results.append(res)
+            entries.append([key, workload_key, record_ids[id(inp)], float(cost)])
+        index[name] = entries
+
+    with open(index_file, "w") as fout:
+        fout.write(RECORD_INDEX_HEADER + json.dumps(index) + "\n")
+    save_records(index_file, inputs, results)
+    return len(inputs)
+
+
 """
 Usage:
 * Distill the best entries from a large log file
 e.g. python -m tvm.auto_scheduler.measure_record --mode distill --i input.json
+* Build a best record index for a log file
+e.g. python -m tvm.auto_scheduler.measure_record --mode index --i input.json
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["distill"], required=True)
+    parser.add_argument("--mode", choices=["distill", "index"], required=True)
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
 
@@ -248,3 +464,5 @@ if __name__ == "__main__":
     if args.mode == "distill":
         args.o = args.o or args.i + ".best.json"
         distill_record_file(args.i, args.o)
+    elif args.mode == "index":
+        make_record_index(args.i, args.o)
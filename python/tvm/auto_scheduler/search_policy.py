@@ -85,6 +85,37 @@ class SearchPolicy(Object):
         """
         return _ffi_api.SearchPolicyContinueSearchOneRound(self, num_measure, measurer)
 
+    def pick_measure_inputs(self, num_measure):
+        """
+        Do the search part of a search round and pick the programs to measure.
+        `continue_search_one_round` is this, the measurement and `update_with_measure_results`.
+
+        Parameters
+        ----------
+        num_measure: int
+            The number of programs to measure in this round
+
+        Returns
+        -------
+        inputs: List[MeasureInput]
+            The programs to measure in this search round
+        """
+        return _ffi_api.SearchPolicyPickMeasureInputs(self, num_measure)
+
+    def update_with_measure_results(self, inputs, results):
+        """
+        Update the search policy (e.g. its cost model) with the measurements of the programs
+        returned by the last `pick_measure_inputs`.
+
+        Parameters
+        ----------
+        inputs: List[MeasureInput]
+            The measured programs
+        results: List[MeasureResult]
+            The measurement results
+        """
+        _ffi_api.SearchPolicyUpdateWithMeasureResults(self, inputs, results)
+
     def set_verbose(self, verbose):
         """
         Set the verbosity level of the search policy.
@@ -26,6 +26,8 @@ import os
 import time
 import math
 import logging
+import queue
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -151,6 +153,12 @@ def derive_similarity_tag(dag, log_base=1.618):
     return ret
 
 
+def _measure(builder, runner, inputs, verbose):
+    """Build and run a round of programs, used by the threads of the task scheduler"""
+    build_results = builder.build(inputs, verbose)
+    return runner.run(inputs, build_results, verbose)
+
+
 class TaskScheduler:
     """
     Allocate the time resources when tuning multiple tasks together.
@@ -193,6 +201,11 @@ class TaskScheduler:
     callbacks: Optional[List[TaskSchedulerCallback]]
         The task scheduler callbacks that will be called before and after tuning a task.
         If None, PrintTableInfo and LogEstimatedLatency callback will be used.
+    num_concurrent_tasks: int = 1
+        The maximum number of tasks tuned at the same time.
+        If it is larger than 1, the measurements (build + run) of the rounds of several tasks
+        are in flight at once (e.g. to keep all devices of a RPC tracker busy). The search,
+        the measure callbacks and the cost model updates still run in the calling thread.
     """
 
     def __init__(
@@ -208,6 +221,7 @@ class TaskScheduler:
         gamma: float = 0.5,
         backward_window_size: int = 3,
         callbacks=None,
+        num_concurrent_tasks: int = 1,
     ):
         self.tasks = tasks
         if objective_func:  # use custom objective function
@@ -225,6 +239,7 @@ class TaskScheduler:
         self.beta = beta
         self.gamma = gamma
         self.backward_window_size = backward_window_size
+        self.num_concurrent_tasks = num_concurrent_tasks
         self.callbacks = (
             callbacks
             if callbacks is not None
@@ -233,6 +248,7 @@ class TaskScheduler:
 
         assert len(self.tasks) != 0, "No tasks"
         assert self.strategy in ["round-robin", "gradient"]
+        assert self.num_concurrent_tasks >= 1, "num_concurrent_tasks must be positive"
 
         # task_cts[i] saves how many times task i is tuned
         self.task_cts = [0 for _ in range(len(self.tasks))]
@@ -317,6 +333,10 @@ class TaskScheduler:
             self.load_log_file,
         )
 
+        if self.num_concurrent_tasks > 1:
+            self._tune_concurrently(early_stopping)
+            return
+
         # do a round robin first to warm up
         for idx in range(len(self.tasks)):
             # skip warming up this task if it has been tuned before (restored from the log file)
@@ -328,86 +348,192 @@ class TaskScheduler:
         # use the specific strategy to choose workload to tune
         task_idx = -1
         while self.ct < tune_option.num_measure_trials and len(self.dead_tasks) < len(self.tasks):
-            if self.strategy == "round-robin":
-                task_idx = (task_idx + 1) % len(self.tasks)
-                while task_idx in self.dead_tasks:
-                    task_idx = (task_idx + 1) % len(self.tasks)
-            elif self.strategy == "gradient":
-                gradients = []
-                for i in range(len(self.tasks)):
-                    if i in self.dead_tasks:
-                        gradients.append(0)
-                        continue
-
-                    # compute gradient from chain rule : (delta f / delta g_i)
-                    delta = 1e-4
-                    new_costs = list(self.best_costs)
-                    new_costs[i] -= delta
-                    chain_grad = (
-                        self._compute_score(self.best_costs) - self._compute_score(new_costs)
-                    ) / delta
-
-                    # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
-                    if (
-                        self.task_cts[i] - 1 < len(self.task_costs_history[i])
-                        and self.task_cts[i] - 1 - self.backward_window_size >= 0
-                    ):
-                        backward_grad = (
-                            self.task_costs_history[i][self.task_cts[i] - 1]
-                            - self.task_costs_history[i][
-                                self.task_cts[i] - 1 - self.backward_window_size
-                            ]
-                        ) / self.backward_window_size
-                    else:
-                        backward_grad = 0
-
-                    # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
-                    g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
-
-                    g_next_2 = self.beta * 1e30
-                    group_id = self.tag_to_group_id.get(self.task_tags[i], None)
-                    if group_id is not None and len(self.group_task_ids[group_id]) > 1:
-                        best_flops = max(
-                            [
-                                self.flop_cts[j] / self.best_costs[j]
-                                for j in self.group_task_ids[group_id]
-                            ]
-                        )
-                        g_next_2 = self.beta * self.flop_cts[i] / best_flops
-
-                    g_next = min(g_next_1, g_next_2)
-                    forward_grad = g_next - self.best_costs[i]
-
-                    # combine all grads
-                    grad = chain_grad * (
-                        self.alpha * backward_grad + (1 - self.alpha) * forward_grad
-                    )
-                    assert grad <= 0
-                    gradients.append(grad)
-
-                if max(gradients) == min(gradients):
-                    task_idx = np.random.choice(len(gradients))
-                else:
-                    task_idx = np.argmin(gradients)
-            else:
-                raise ValueError("Invalid strategy: " + self.strategy)
-
+            task_idx = self._select_task(task_idx)
             self._tune_task(task_idx)
             self._adjust_similarity_group(task_idx)
+            if self._check_early_stopping(early_stopping):
+                break
+
+    def _tune_concurrently(self, early_stopping):
+        """Tune several tasks at the same time.
+
+        Only the measurements run in a thread pool, so that the measurements of up to
+        `num_concurrent_tasks` search rounds are outstanding at once. The builder and the
+        runner do the work in worker processes and on the devices, so the measuring threads
+        mostly wait with the GIL released. The search of the next round, the measure
+        callbacks, the cost model updates and the bookkeeping run in the calling thread, and
+        a new task is selected for a freed slot with the up-to-date status of all finished
+        rounds.
+        """
+        tune_option = self.tune_option
+        pool = ThreadPool(self.num_concurrent_tasks)
+        finished = queue.Queue()
+        in_flight = set()
+
+        def launch(task_idx):
+            for callback in self.callbacks:
+                callback.pre_tune(self, task_idx)
+            inputs = self.search_policies[task_idx].pick_measure_inputs(
+                self.num_measures_per_round
+            )
+            in_flight.add(task_idx)
+            if len(inputs) == 0:
+                finished.put((task_idx, inputs, [], None))
+                return
+            pool.apply_async(
+                _measure,
+                (tune_option.builder, tune_option.runner, inputs, tune_option.verbose),
+                callback=lambda results: finished.put((task_idx, inputs, results, None)),
+                error_callback=lambda err: finished.put((task_idx, inputs, None, err)),
+            )
+
+        def wait_one():
+            task_idx, inputs, results, err = finished.get()
+            in_flight.remove(task_idx)
+            if err is not None:
+                raise err
+            policy = self.search_policies[task_idx]
+            self.measurer.update_with_results(self.tasks[task_idx], policy, inputs, results)
+            policy.update_with_measure_results(inputs, results)
+            self._finish_round(task_idx, inputs, results)
+            return task_idx
+
+        def slot_free():
+            return len(in_flight) < self.num_concurrent_tasks
+
+        def budget_left():
+            num_pending = len(in_flight) * self.num_measures_per_round
+            return self.ct + num_pending < tune_option.num_measure_trials
+
+        try:
+            # warm up: every task that has not been tuned before runs one round.
+            # The gradients are only defined after all tasks have been tuned once.
+            warm_up = [idx for idx in range(len(self.tasks)) if not self.task_cts[idx]]
+            while warm_up or in_flight:
+                while warm_up and slot_free():
+                    launch(warm_up.pop(0))
+                wait_one()
+            self.best_ct = self.ct
+            self.best_score = self.cur_score
+
+            # use the specific strategy to choose workloads to tune
+            task_idx = -1
+            stop = False
+            while True:
+                while not stop and slot_free() and budget_left():
+                    next_idx = self._select_task(task_idx, busy=in_flight)
+                    if next_idx is None:
+                        break
+                    task_idx = next_idx
+                    launch(task_idx)
+                if not in_flight:
+                    break
+                done_idx = wait_one()
+                self._adjust_similarity_group(done_idx)
+                stop = stop or self._check_early_stopping(early_stopping)
+        finally:
+            # let the measurements in flight finish before returning
+            pool.close()
+            pool.join()
+
+    def _select_task(self, last_task_idx, busy=()):
+        """Select the next task to tune with the scheduling strategy.
 
-            if self.cur_score < self.best_score:
-                self.best_score = self.cur_score
-                self.best_ct = self.ct
-            elif self.ct - self.best_ct >= early_stopping and all(
-                cost < 1e9 for cost in self.best_costs
+        Parameters
+        ----------
+        last_task_idx: int
+            The task selected last time, used by the "round-robin" strategy
+        busy: Collection[int]
+            The tasks that are being tuned and cannot be selected
+
+        Returns
+        -------
+        task_idx: Optional[int]
+            The selected task, or None if no task can be selected
+        """
+        candidates = [
+            i for i in range(len(self.tasks)) if i not in self.dead_tasks and i not in busy
+        ]
+        if not candidates:
+            return None
+
+        if self.strategy == "round-robin":
+            task_idx = (last_task_idx + 1) % len(self.tasks)
+            while task_idx in self.dead_tasks or task_idx in busy:
+                task_idx = (task_idx + 1) % len(self.tasks)
+            return task_idx
+        if self.strategy == "gradient":
+            gradients = self._compute_gradients()
+            gradients = [gradients[i] for i in candidates]
+            if max(gradients) == min(gradients):
+                return candidates[np.random.choice(len(candidates))]
+            return candidates[int(np.argmin(gradients))]
+        raise ValueError("Invalid strategy: " + self.strategy)
+
+    def _compute_gradients(self):
+        """Compute the gradients of the objective function w.r.t. the time spent on every task"""
+        gradients = []
+        for i in range(len(self.tasks)):
+            if i in self.dead_tasks:
+                gradients.append(0)
+                continue
+
+            # compute gradient from chain rule : (delta f / delta g_i)
+            delta = 1e-4
+            new_costs = list(self.best_costs)
+            new_costs[i] -= delta
+            chain_grad = (
+                self._compute_score(self.best_costs) - self._compute_score(new_costs)
+            ) / delta
+
+            # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+            if (
+                self.task_cts[i] - 1 < len(self.task_costs_history[i])
+                and self.task_cts[i] - 1 - self.backward_window_size >= 0
             ):
-                if self.tune_option.verbose >= 1:
-                    print(
-                        "Stop early since no performance improvement in the last "
-                        + str(early_stopping)
-                        + " measurement trials."
-                    )
-                break
+                backward_grad = (
+                    self.task_costs_history[i][self.task_cts[i] - 1]
+                    - self.task_costs_history[i][self.task_cts[i] - 1 - self.backward_window_size]
+                ) / self.backward_window_size
+            else:
+                backward_grad = 0
+
+            # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
+            g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
+
+            g_next_2 = self.beta * 1e30
+            group_id = self.tag_to_group_id.get(self.task_tags[i], None)
+            if group_id is not None and len(self.group_task_ids[group_id]) > 1:
+                best_flops = max(
+                    [self.flop_cts[j] / self.best_costs[j] for j in self.group_task_ids[group_id]]
+                )
+                g_next_2 = self.beta * self.flop_cts[i] / best_flops
+
+            g_next = min(g_next_1, g_next_2)
+            forward_grad = g_next - self.best_costs[i]
+
+            # combine all grads
+            grad = chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+            assert grad <= 0
+            gradients.append(grad)
+        return gradients
+
+    def _check_early_stopping(self, early_stopping):
+        """Update the best score and check whether to stop early"""
+        if self.cur_score < self.best_score:
+            self.best_score = self.cur_score
+            self.best_ct = self.ct
+        elif self.ct - self.best_ct >= early_stopping and all(
+            cost < 1e9 for cost in self.best_costs
+        ):
+            if self.tune_option.verbose >= 1:
+                print(
+                    "Stop early since no performance improvement in the last "
+                    + str(early_stopping)
+                    + " measurement trials."
+                )
+            return True
+        return False
 
     def _tune_task(self, task_idx):
         """Tune the select task for one round"""
@@ -419,7 +545,10 @@ class TaskScheduler:
         measure_inputs, measure_results = self.search_policies[task_idx].continue_search_one_round(
             self.num_measures_per_round, self.measurer
         )
+        self._finish_round(task_idx, measure_inputs, measure_results)
 
+    def _finish_round(self, task_idx, measure_inputs, measure_results):
+        """Update the status with the measurements of a finished round and run the callbacks"""
         for res in measure_results:
             cost = array_mean(res.costs)
             if cost < self.best_costs[task_idx]:
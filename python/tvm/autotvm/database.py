@@ -20,6 +20,7 @@ Database of MeasureInput/MeasureResult pair.
 This can be used for replaying measurement.
 """
 import os
+import sqlite3
 
 from .record import encode, decode, measure_str_key
 
@@ -188,6 +189,116 @@ class RedisDatabase(Database):
         self.db.flushdb()
 
 
+class SQLiteDatabase(Database):
+    """
+    Record database stored in a local SQLite file.
+
+    Several tuning processes on one host can read and write the same file concurrently.
+    Records are indexed by their :any:`measure_str_key`, so :any:`filter_inputs`
+    does not need a database server.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the database file. It is created if it does not exist.
+    timeout: float, optional
+        How many seconds to wait for a lock held by another process.
+    """
+
+    def __init__(self, filename, timeout=60):
+        self.filename = filename
+        self.timeout = timeout
+        self._conn = None
+        self._conn_pid = None
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS records "
+                "(key TEXT NOT NULL, record TEXT NOT NULL, timestamp REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS records_key ON records (key)")
+
+    @property
+    def conn(self):
+        """The connection of the current process.
+        A sqlite connection must not be shared with forked processes."""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.filename, timeout=self.timeout)
+            # write-ahead logging lets readers proceed while another process writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_conn_pid"] = None
+        return state
+
+    def load(self, inp, get_all=False):
+        rows = self.conn.execute(
+            "SELECT record FROM records WHERE key = ? ORDER BY rowid", (measure_str_key(inp),)
+        ).fetchall()
+        records = [decode(row[0]) for row in rows]
+        results = [rec[1] for rec in records if rec is not None]
+        if not results:
+            return None
+        if get_all:
+            return results
+        return max(results, key=lambda result: result.timestamp)
+
+    def save(self, inp, res, extend=False):
+        key = measure_str_key(inp)
+        with self.conn:
+            if not extend:
+                self.conn.execute("DELETE FROM records WHERE key = ?", (key,))
+            self.conn.execute(
+                "INSERT INTO records (key, record, timestamp) VALUES (?, ?, ?)",
+                (key, encode(inp, res), res.timestamp),
+            )
+
+    def filter(self, func):
+        """
+        Dump all of the records that match the given rule
+
+        Parameters
+        ----------
+        func: callable
+            The signature of the function is (MeasureInput, [MeasureResult]) -> bool
+
+        Returns
+        -------
+        list of records in tuple (MeasureInput, MeasureResult) matching the rule
+        """
+        matched_records = list()
+        rows = self.conn.execute("SELECT key, record FROM records ORDER BY key, rowid")
+        current_key, records = None, []
+
+        def _match(records):
+            records = [rec for rec in records if rec is not None]
+            if not records:
+                return
+            inps, results = zip(*records)
+            if func(inps[0], results):
+                result = max(results, key=lambda res: res.timestamp)
+                matched_records.append((inps[0], result))
+
+        for key, record in rows:
+            if key != current_key:
+                _match(records)
+                current_key, records = key, []
+            try:
+                records.append(decode(record))
+            except TypeError:  # got a badly formatted/old format record
+                continue
+        _match(records)
+        return matched_records
+
+    def flush(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM records")
+
+
 class DummyDatabase(RedisDatabase):
     """
     A database based on python dictionary for testing.
@@ -25,4 +25,4 @@ from .measure import (
 )
 from .measure_methods import LocalBuilder, LocalRunner, RPCRunner, request_remote
 from .executor import Executor
-from .local_executor import LocalExecutor
+from .local_executor import LocalExecutor, PoolExecutor
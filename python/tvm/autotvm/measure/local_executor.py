@@ -14,8 +14,9 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-"""Local based implementation of the executor using multiprocessing"""
+"""Local based implementations of the executor using multiprocessing"""
 
+import multiprocessing
 import signal
 
 from multiprocessing import Process, Queue
@@ -30,6 +31,8 @@ try:
 except ImportError:
     psutil = None
 
+from tvm.contrib.worker_pool import WorkerPool
+
 from . import executor
 
 
@@ -155,3 +158,72 @@ class LocalExecutor(executor.Executor):
         process = Process(target=call_with_timeout, args=(queue, self.timeout, func, args, kwargs))
         process.start()
         return LocalFuture(process, queue)
+
+
+class PoolFuture(executor.Future):
+    """Future of a job submitted to a PoolExecutor
+
+    Parameters
+    ----------
+    future: tvm.contrib.worker_pool.WorkerFuture
+        The future returned by the worker pool
+    """
+
+    def __init__(self, future):
+        self._future = future
+
+    def done(self):
+        return self._future.done()
+
+    def get(self, timeout=None):
+        try:
+            res = self._future.get(timeout)
+        except TimeoutError:
+            raise executor.TimeoutError()
+        if isinstance(res, TimeoutError):
+            # the job itself timed out
+            return executor.TimeoutError()
+        return res
+
+
+class PoolExecutor(executor.Executor):
+    """Local executor that runs jobs in a pool of long-lived worker processes.
+
+    Unlike LocalExecutor, which forks a new process for every job, the workers are
+    reused, so the cost of process creation and imports is paid once per worker instead
+    of once per job. A worker whose job times out or crashes is killed and replaced, as
+    is a worker that uses more than `max_memory` after a job.
+
+    The jobs and their arguments are sent to the workers with pickle, so they must be
+    picklable, e.g. module-level functions.
+
+    Parameters
+    ----------
+    timeout: float, optional
+        timeout of a job, counted from the time a worker starts to run it.
+        If time is out. A TimeoutError will be returned (not raised)
+    n_parallel: int, optional
+        The number of worker processes. "None" will use all cpu cores
+    max_memory: int, optional
+        The memory cap of a worker process in bytes
+    start_method: str, optional
+        The multiprocessing start method of the workers. "None" uses "forkserver" if the
+        platform supports it, so the workers are not forked from the threads of this
+        process, which may hold locks
+    """
+
+    def __init__(self, timeout=None, n_parallel=None, max_memory=None, start_method=None):
+        self.timeout = timeout or executor.Executor.DEFAULT_TIMEOUT
+        self.n_parallel = n_parallel or multiprocessing.cpu_count()
+        self.max_memory = max_memory
+        if start_method is None and "forkserver" in multiprocessing.get_all_start_methods():
+            start_method = "forkserver"
+        self.start_method = start_method
+        self._pool = WorkerPool(self.n_parallel, max_memory=max_memory, start_method=start_method)
+
+    def submit(self, func, *args, **kwargs):
+        return PoolFuture(self._pool.submit(func, args, kwargs, timeout=self.timeout))
+
+    def close(self):
+        """Stop the worker processes after the submitted jobs are finished"""
+        self._pool.close()
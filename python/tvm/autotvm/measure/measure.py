@@ -35,7 +35,9 @@ class MeasureInput(namedtuple("MeasureInput", ["target", "task", "config"])):
     """
 
 
-class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp"])):
+class MeasureResult(
+    namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp", "variance"])
+):
     """
     Stores all the results of a measurement
 
@@ -50,8 +52,17 @@ class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost"
         All cost of this measure, including rpc, compilation, test runs
     timestamp: float
         The absolute time stamp when we finish measurement.
+    variance: float, optional
+        The sample variance of all the measured running times, including the ones
+        dropped from costs as outliers. None if unknown, e.g. for an error or a result
+        loaded from a log file.
     """
 
+    def __new__(cls, costs, error_no, all_cost, timestamp, variance=None):
+        return super(MeasureResult, cls).__new__(
+            cls, costs, error_no, all_cost, timestamp, variance
+        )
+
 
 class MeasureErrorNo(object):
     """Error type for MeasureResult"""
@@ -99,6 +110,10 @@ class Builder(object):
         self.task = task
         self.build_kwargs = build_kwargs
 
+    def close(self):
+        """Release the resources kept across tasks, e.g. persistent worker processes.
+        The builder can still be used afterwards."""
+
     def build(self, measure_inputs):
         """Build programs
 
@@ -154,6 +169,10 @@ class Runner(object):
         """
         raise NotImplementedError()
 
+    def close(self):
+        """Release the resources kept across tasks, e.g. persistent workers and their
+        RPC sessions. The runner can still be used afterwards."""
+
     def run(self, measure_inputs, build_results):
         """Run amd measure built programs
 
@@ -266,6 +285,15 @@ def create_measure_batch(task, option):
         results = runner.run(measure_inputs, build_results)
         return results
 
+    # expose the two stages separately so that tuners can overlap them
+    measure_batch.build = builder.build
+    measure_batch.run = runner.run
     measure_batch.n_parallel = builder.n_parallel
     measure_batch.attach_objects = attach_objects
+
+    def close():
+        builder.close()
+        runner.close()
+
+    measure_batch.close = close
     return measure_batch
@@ -40,13 +40,15 @@ from tvm.target import Target
 from tvm.error import TVMError
 from tvm.driver import build
 from tvm.contrib import nvcc, ndk, tar
+from tvm.contrib.worker_pool import WorkerPool
+from tvm.rpc import session_cache
 
 from ..utils import get_const_tuple
 from ..env import AutotvmGlobalScope
 from ..task.space import InstantiationError
 
 from .measure import MeasureResult, MeasureErrorNo, Builder, Runner
-from .local_executor import LocalExecutor
+from .local_executor import LocalExecutor, PoolExecutor
 
 logger = logging.getLogger("autotvm")
 
@@ -81,9 +83,23 @@ class LocalBuilder(Builder):
         If is 'default', use default build function
         If is 'ndk', use function for android ndk
         If is callable, use it as custom build function, expect lib_format field.
+    reuse_workers: bool
+        Whether to build in a pool of long-lived worker processes instead of forking a
+        new process for every build. This saves the process creation and imports of
+        every build, but requires build_func and the build arguments to be picklable.
+        The workers are started by a fork server if the platform supports it.
+    max_worker_memory: int, optional
+        If reuse_workers is set, replace a worker whose memory exceeds this number of bytes.
     """
 
-    def __init__(self, timeout=10, n_parallel=None, build_func="default"):
+    def __init__(
+        self,
+        timeout=10,
+        n_parallel=None,
+        build_func="default",
+        reuse_workers=False,
+        max_worker_memory=None,
+    ):
         super(LocalBuilder, self).__init__(timeout, n_parallel)
 
         if isinstance(build_func, str):
@@ -94,18 +110,35 @@ class LocalBuilder(Builder):
             else:
                 raise ValueError("Invalid build_func" + build_func)
         self.build_func = _WrappedBuildFunc(build_func)
-        self.executor = LocalExecutor(timeout=timeout)
+        self.reuse_workers = reuse_workers
+        self.max_worker_memory = max_worker_memory
+        self.executor = None if reuse_workers else LocalExecutor(timeout=timeout)
         self.tmp_dir = tempfile.mkdtemp()
+        self.prev_tmp_dir = None
 
     def build(self, measure_inputs):
         results = []
 
-        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        # Keep the libraries of the previous batch alive. In pipelined tuning they
+        # can still be running on the device while the next batch is being built.
+        if self.prev_tmp_dir is not None:
+            shutil.rmtree(self.prev_tmp_dir, ignore_errors=True)
+        self.prev_tmp_dir = self.tmp_dir
         self.tmp_dir = tempfile.mkdtemp()
 
-        for i in range(0, len(measure_inputs), self.n_parallel):
+        if self.executor is None:
+            self.executor = PoolExecutor(
+                timeout=self.timeout,
+                n_parallel=self.n_parallel,
+                max_memory=self.max_worker_memory,
+            )
+
+        # the worker pool bounds the number of parallel builds by itself, so all
+        # builds can be submitted at once without waiting for the slowest of a group
+        step = max(len(measure_inputs), 1) if self.reuse_workers else self.n_parallel
+        for i in range(0, len(measure_inputs), step):
             futures = []
-            for inp in measure_inputs[i : i + self.n_parallel]:
+            for inp in measure_inputs[i : i + step]:
                 ret = self.executor.submit(self.build_func, inp, self.tmp_dir, **self.build_kwargs)
                 futures.append(ret)
 
@@ -160,6 +193,16 @@ class LocalBuilder(Builder):
 
         return results
 
+    def close(self):
+        """Stop the worker processes of reuse_workers. They are started again by the
+        next build."""
+        if self.reuse_workers and getattr(self, "executor", None) is not None:
+            self.executor.close()
+            self.executor = None
+
+    def __del__(self):
+        self.close()
+
 
 class RPCRunner(Runner):
     """Run generated code on remove devices.
@@ -205,6 +248,35 @@ class RPCRunner(Runner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool
+        Whether to keep long-lived RPC sessions and reuse them across measurements.
+        By default, a new session is requested from the tracker for every measurement.
+        With this option, the measurements run in a pool of persistent worker processes,
+        each of which keeps one session to the device and only uploads and loads the
+        module for a new measurement. With check_correctness, the reference data also
+        stays on the device of the session, and a python RPC server compares the outputs
+        on the remote side. The sessions hold their devices until :code:`close` is called,
+        which the tuners do at the end of every task.
+    batch_size: int
+        The maximum number of programs measured with one RPC call.
+        If larger than 1, the built modules are sent to the device in one archive and
+        benchmarked by a single remote call, which saves the round-trips of uploading,
+        loading and cleaning up every module. This requires a python RPC server.
+        A timeout or a crash of the device fails the whole batch.
+    adaptive: bool
+        Whether to choose the number of repeats of every program adaptively, see
+        :code:`adaptive_measure`. A program that is confidently slower than
+        `early_stop_ratio` times the best program of the task so far is stopped after two
+        repeats, the others are repeated until the mean cost is known within `target_ci`
+        or `max_repeat` repeats are taken. The variance of the costs is recorded in the
+        MeasureResult. This disables batching.
+    max_repeat: int, optional
+        The maximum number of repeats in the adaptive mode. By default 4 * repeat.
+    early_stop_ratio: float
+        The ratio to the best cost above which a program is stopped in the adaptive mode.
+    target_ci: float
+        The target half width of the 95% confidence interval of the mean cost relative to
+        the mean in the adaptive mode.
     """
 
     def __init__(
@@ -221,6 +293,12 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         check_correctness=False,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
+        batch_size=1,
+        adaptive=False,
+        max_repeat=None,
+        early_stop_ratio=2.0,
+        target_ci=0.05,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -236,14 +314,29 @@ class RPCRunner(Runner):
 
         self.ref_input = None
         self.ref_output = None
+        self.ref_key = None
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.check_correctness = check_correctness
         self.cooldown_interval = cooldown_interval
-
-        self.executor = LocalExecutor(timeout=timeout * (self.n_parallel + 1))
+        self.reuse_session = reuse_session
+        self.batch_size = batch_size
+        self.adaptive = adaptive
+        self.max_repeat = max_repeat or 4 * repeat
+        self.early_stop_ratio = early_stop_ratio
+        self.target_ci = target_ci
+        # the best mean cost of the task so far, for the early stop of the adaptive mode
+        self.best_cost = None
+
+        self._run_timeout = timeout * (self.n_parallel + 1)
+        if adaptive:
+            # the adaptive mode repeats a program up to max_repeat times
+            self._run_timeout *= self.max_repeat / max(repeat, 1)
+        self.executor = LocalExecutor(timeout=self._run_timeout)
+        self._worker_pool = None
 
     def set_task(self, task):
         self.task = task
+        self.best_cost = None
 
         if check_remote(task.target, self.key, self.host, self.port):
             logger.info("Get devices for measurement successfully!")
@@ -267,6 +360,8 @@ class RPCRunner(Runner):
             tvm_buf = [nd.array(x) for x in self.ref_input]
             func(*tvm_buf)
             self.ref_output = [x.asnumpy() for x in tvm_buf]
+            # identifies the reference data resident in the reused sessions
+            self.ref_key = "%s-%x" % (task.name, getrandbits(64))
 
     def get_build_kwargs(self):
         kwargs = {}
@@ -295,6 +390,15 @@ class RPCRunner(Runner):
         return kwargs
 
     def run(self, measure_inputs, build_results):
+        # checking correctness and programming the VTA FPGA work on single programs only
+        if (
+            self.batch_size > 1
+            and not self.adaptive
+            and not self.ref_input
+            and self.task.target.device_name != "vta"
+        ):
+            return self._run_batches(measure_inputs, build_results)
+
         results = []
         remote_args = (self.key, self.host, self.port, self.priority, self.timeout)
 
@@ -303,8 +407,7 @@ class RPCRunner(Runner):
             for measure_inp, build_res in zip(
                 measure_inputs[i : i + self.n_parallel], build_results[i : i + self.n_parallel]
             ):
-                ret = self.executor.submit(
-                    run_through_rpc,
+                args = (
                     measure_inp,
                     build_res,
                     self.number,
@@ -316,6 +419,22 @@ class RPCRunner(Runner):
                     self.ref_output,
                     self.enable_cpu_cache_flush,
                 )
+                kwargs = {}
+                if self.adaptive:
+                    kwargs["adaptive"] = {
+                        "max_repeat": self.max_repeat,
+                        "best_cost": self.best_cost,
+                        "early_stop_ratio": self.early_stop_ratio,
+                        "target_ci": self.target_ci,
+                    }
+                if self.reuse_session:
+                    kwargs["reuse_session"] = True
+                    kwargs["ref_key"] = self.ref_key
+                    ret = self._get_worker_pool().submit(
+                        run_through_rpc, args, kwargs, timeout=self._run_timeout
+                    )
+                else:
+                    ret = self.executor.submit(run_through_rpc, *args, **kwargs)
                 futures.append(ret)
 
             for future in futures:
@@ -328,9 +447,68 @@ class RPCRunner(Runner):
                     )
                 else:
                     results.append(res)
+                    if res.error_no == MeasureErrorNo.NO_ERROR:
+                        cost = np.mean(res.costs)
+                        if self.best_cost is None or cost < self.best_cost:
+                            self.best_cost = cost
+
+        return results
+
+    def _run_batches(self, measure_inputs, build_results):
+        """Measure the programs in batches, each of which is measured by one RPC call"""
+        results = list(build_results)
+        todo = [i for i, res in enumerate(build_results) if not isinstance(res, MeasureResult)]
+        remote_args = (self.key, self.host, self.port, self.priority, self.timeout)
+
+        batches = []
+        for i in range(0, len(todo), self.batch_size):
+            indices = todo[i : i + self.batch_size]
+            future = self._get_worker_pool().submit(
+                run_batch_through_rpc,
+                (
+                    [measure_inputs[k] for k in indices],
+                    [build_results[k] for k in indices],
+                    self.number,
+                    self.repeat,
+                    self.min_repeat_ms,
+                    self.cooldown_interval,
+                    remote_args,
+                    self.enable_cpu_cache_flush,
+                    self.reuse_session,
+                ),
+                timeout=self.timeout * len(indices) * (self.n_parallel + 1),
+            )
+            batches.append((indices, future))
+
+        for indices, future in batches:
+            res = future.get()
+            if isinstance(res, Exception):  # executor error or timeout
+                res = [
+                    MeasureResult(
+                        (str(res),), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time()
+                    )
+                ] * len(indices)
+            for k, measure_result in zip(indices, res):
+                results[k] = measure_result
 
         return results
 
+    def _get_worker_pool(self):
+        """Get the pool of persistent workers that keep the RPC sessions"""
+        if self._worker_pool is None:
+            self._worker_pool = WorkerPool(self.n_parallel)
+        return self._worker_pool
+
+    def close(self):
+        """Stop the persistent workers of reuse_session. This also closes the RPC sessions
+        kept in them, so that the devices are free for other clients of the tracker."""
+        if getattr(self, "_worker_pool", None) is not None:
+            self._worker_pool.close()
+            self._worker_pool = None
+
+    def __del__(self):
+        self.close()
+
 
 class LocalRunner(RPCRunner):
     """Run generated code on local devices.
@@ -367,6 +545,14 @@ class LocalRunner(RPCRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool
+        Whether to reuse the RPC session to the local device across measurements.
+    batch_size: int
+        The maximum number of programs measured with one RPC call.
+    adaptive: bool
+        Whether to choose the number of repeats of every program adaptively.
+    max_repeat, early_stop_ratio, target_ci:
+        The options of the adaptive mode, see :code:`RPCRunner`.
     Note
     ----
     This is a "fake" local mode. We start a silent rpc tracker and rpc server
@@ -382,6 +568,12 @@ class LocalRunner(RPCRunner):
         cooldown_interval=0.1,
         check_correctness=False,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
+        batch_size=1,
+        adaptive=False,
+        max_repeat=None,
+        early_stop_ratio=2.0,
+        target_ci=0.05,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -396,6 +588,12 @@ class LocalRunner(RPCRunner):
             cooldown_interval=cooldown_interval,
             check_correctness=check_correctness,
             enable_cpu_cache_flush=enable_cpu_cache_flush,
+            reuse_session=reuse_session,
+            batch_size=batch_size,
+            adaptive=adaptive,
+            max_repeat=max_repeat,
+            early_stop_ratio=early_stop_ratio,
+            target_ci=target_ci,
         )
         self.tracker = None
         self.server = None
@@ -406,6 +604,8 @@ class LocalRunner(RPCRunner):
         from ...rpc.server import Server
 
         self.task = task
+        # the sessions of the workers belong to the server of the previous task
+        self.close()
         tracker = Tracker("0.0.0.0", port=9000, port_end=10000, silent=True)
         device_key = "$local$device$%d" % tracker.port
         server = Server(
@@ -515,6 +715,9 @@ def run_through_rpc(
     ref_input=None,
     ref_output=None,
     enable_cpu_cache_flush=False,
+    reuse_session=False,
+    adaptive=None,
+    ref_key=None,
 ):
     """Run a generated library through rpc
 
@@ -554,15 +757,30 @@ def run_through_rpc(
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool
+        Whether to reuse the cached session of this process instead of requesting a new one.
+        The uploaded files are removed after the measurement to keep the session clean.
+    adaptive: Optional[dict]
+        If set, measure adaptively with :code:`adaptive_measure` instead of a fixed number of
+        repeats. It holds the keyword arguments "max_repeat", "best_cost",
+        "early_stop_ratio" and "target_ci" of :code:`adaptive_measure`.
+    ref_key: Optional[str]
+        A key that identifies ref_input and ref_output. If set with reuse_session, the
+        reference data stays resident on the device for the lifetime of the session and
+        the outputs are compared on the remote, so only the outcome is sent back.
     """
     if isinstance(build_result, MeasureResult):
         return build_result
 
     tic = time.time()
     errno = MeasureErrorNo.NO_ERROR
+    remote = None
     try:
         # upload built module
-        remote = request_remote(*remote_args)
+        if reuse_session:
+            remote = session_cache.get_session(*remote_args[:4])
+        else:
+            remote = request_remote(*remote_args)
         # Program the FPGA every single time when targeting VTA
         if (
             hasattr(measure_input.target, "device_name")
@@ -583,17 +801,24 @@ def run_through_rpc(
         # the PackedFunc as an object. Currently, we pass function name to work
         # around it.
         f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
-        time_f = func.time_evaluator(
-            func.entry_name,
-            ctx,
-            number=number,
-            repeat=repeat,
-            min_repeat_ms=min_repeat_ms,
-            f_preproc=f_prepare,
-        )
+
+        def time_f(n_repeat):
+            return func.time_evaluator(
+                func.entry_name,
+                ctx,
+                number=number,
+                repeat=n_repeat,
+                min_repeat_ms=min_repeat_ms,
+                f_preproc=f_prepare,
+            )
 
         # set input
-        if ref_input:
+        remote_ref_output = None
+        if ref_input and ref_key is not None:
+            args, remote_ref_output = _resident_reference(
+                remote, ctx, ref_key, ref_input, ref_output
+            )
+        elif ref_input:
             args = [nd.array(x, ctx=ctx) for x in ref_input]
         else:
             try:
@@ -607,35 +832,248 @@ def run_through_rpc(
                 random_fill(arg)
             ctx.sync()
 
-        costs = time_f(*args).results
-
-        # clean up remote files
-        remote.remove(build_result.filename)
-        remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
-        remote.remove("")
-
-        if len(costs) > 2:  # remove largest and smallest value to reduce variance
+        if adaptive:
+            costs = tuple(adaptive_measure(lambda n: time_f(n)(*args).results, repeat, **adaptive))
+        else:
+            costs = time_f(repeat)(*args).results
+        variance = float(np.var(costs, ddof=1)) if len(costs) > 1 else 0.0
+
+        # clean up remote files, the files of a reused session are removed below
+        if not reuse_session:
+            remote.remove(build_result.filename)
+            remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
+            remote.remove("")
+
+        # remove largest and smallest value to reduce variance, the adaptive mode
+        # already takes the variance into account
+        if len(costs) > 2 and not adaptive:
             costs = list(costs)
             costs.sort()
             costs = tuple(costs[1:-1])
 
         # check correctness of output
         if ref_output:
-            for expected, real in zip(ref_output, args):
-                if not np.allclose(expected, real.asnumpy(), rtol=1e-4):
-                    logger.warning("Wrong Answer!")
-                    errno = MeasureErrorNo.WRONG_ANSWER
+            allclose = None
+            if remote_ref_output is not None:
+                try:
+                    allclose = remote.get_function("tvm.rpc.server.allclose")
+                except AttributeError:
+                    # the remote cannot compare arrays, pull the outputs back
+                    pass
+            if allclose is not None:
+                correct = all(
+                    allclose(expected, real, 1e-4, 1e-8)
+                    for expected, real in zip(remote_ref_output, args)
+                )
+            else:
+                correct = all(
+                    np.allclose(expected, real.asnumpy(), rtol=1e-4)
+                    for expected, real in zip(ref_output, args)
+                )
+            if not correct:
+                logger.warning("Wrong Answer!")
+                errno = MeasureErrorNo.WRONG_ANSWER
     except TVMError as exc:
-        msg = str(exc)
-        if "Stack trace returned" in msg:
-            msg = msg[: msg.index("Stack trace returned")]
-        if "CUDA Source" in msg:
-            msg = msg[: msg.index("CUDA Source")]
-        costs = (RuntimeError(msg[:1024]),)
+        costs = (_device_error(str(exc)),)
         errno = MeasureErrorNo.RUNTIME_DEVICE
+        variance = None
+        if reuse_session:
+            # the error may have left the session or its device in a bad state
+            session_cache.drop_session(*remote_args[:3])
+    finally:
+        if reuse_session and remote is not None:
+            session_cache.remove_uploaded_module(remote, build_result.filename)
     tstamp = time.time()
     time.sleep(cooldown_interval)
-    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
+    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp, variance)
+
+
+
+# two-sided 95% quantiles of the Student's t-distribution, indexed by degrees of freedom
+# fmt: off
+_T_95 = [
+    None, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+# fmt: on
+
+
+def _confidence_interval(costs):
+    """Get the mean of costs and the half width of its 95% confidence interval"""
+    mean = float(np.mean(costs))
+    if len(costs) < 2:
+        return mean, float("inf")
+    t = _T_95[len(costs) - 1] if len(costs) <= 30 else 1.96
+    return mean, t * float(np.std(costs, ddof=1)) / np.sqrt(len(costs))
+
+
+def adaptive_measure(
+    measure, repeat, max_repeat, best_cost=None, early_stop_ratio=2.0, target_ci=0.05
+):
+    """Measure a program in rounds until its mean cost is known well enough.
+
+    The first round takes 2 samples. A candidate whose 95% confidence interval lies
+    entirely above `early_stop_ratio` times the best cost is stopped right away. The
+    other candidates are sampled up to `repeat` samples, and then in rounds that double
+    the number of samples until the half width of the confidence interval is below
+    `target_ci` of the mean, or until `max_repeat` samples are taken.
+
+    Parameters
+    ----------
+    measure: Callable[[int], List[float]]
+        Measure the program the given number of times, return the costs.
+    repeat: int
+        The number of samples of a candidate that is not stopped early.
+    max_repeat: int
+        The maximum number of samples.
+    best_cost: Optional[float]
+        The best mean cost so far. None disables early stopping.
+    early_stop_ratio: float
+        Stop a candidate that is confidently slower than this times the best cost.
+    target_ci: float
+        The target half width of the 95% confidence interval, relative to the mean.
+
+    Returns
+    -------
+    costs: List[float]
+        All the measured costs.
+    """
+    max_repeat = max(max_repeat, repeat, 2)
+    costs = list(measure(2))
+    while True:
+        mean, half_width = _confidence_interval(costs)
+        if best_cost is not None and mean - half_width > early_stop_ratio * best_cost:
+            break
+        if len(costs) >= repeat and half_width <= target_ci * mean:
+            break
+        if len(costs) >= max_repeat:
+            break
+        n_more = repeat - len(costs) if len(costs) < repeat else len(costs)
+        costs.extend(measure(min(n_more, max_repeat - len(costs))))
+    return costs
+
+
+def _resident_reference(remote, ctx, ref_key, ref_input, ref_output):
+    """Get the arguments of a run and the reference outputs, both on the device of a
+    cached session. The reference data is sent to the device once per session."""
+
+    def upload(arrays):
+        return [nd.array(x, ctx=ctx) for x in arrays]
+
+    inputs = session_cache.get_resident(remote, ref_key, "input", lambda: upload(ref_input))
+    args = session_cache.get_resident(
+        remote, ref_key, "args", lambda: [nd.empty(x.shape, x.dtype, ctx) for x in inputs]
+    )
+    # restore the arguments on the device, as the previous run has written the outputs
+    for src, dst in zip(inputs, args):
+        src.copyto(dst)
+    outputs = None
+    if ref_output:
+        outputs = session_cache.get_resident(remote, ref_key, "output", lambda: upload(ref_output))
+    return args, outputs
+
+
+def run_batch_through_rpc(
+    measure_inputs,
+    build_results,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    remote_args,
+    enable_cpu_cache_flush=False,
+    reuse_session=False,
+):
+    """Run a batch of generated libraries of the same target through one RPC call.
+
+    Falls back to :code:`run_through_rpc` for every library if the remote does not
+    support batched measurement.
+
+    Parameters
+    ----------
+    measure_inputs: List[MeasureInput]
+        The raw measure inputs
+    build_results: List[BuildResult]
+        The successful build results of the inputs
+    number, repeat, min_repeat_ms, cooldown_interval, remote_args, enable_cpu_cache_flush,
+    reuse_session:
+        See :code:`run_through_rpc`
+
+    Returns
+    -------
+    results: List[MeasureResult]
+        The measure results of the inputs
+    """
+    tic = time.time()
+    if reuse_session:
+        remote = session_cache.get_session(*remote_args[:4])
+    else:
+        remote = request_remote(*remote_args)
+    if not remote.supports_time_evaluate_batch():
+        logger.debug("The remote does not support batched measurement")
+        # Release the session first, as run_through_rpc requests it again and a server
+        # may only have one slot.
+        del remote
+        return [
+            run_through_rpc(
+                inp,
+                res,
+                number,
+                repeat,
+                min_repeat_ms,
+                cooldown_interval,
+                remote_args,
+                enable_cpu_cache_flush=enable_cpu_cache_flush,
+                reuse_session=reuse_session,
+            )
+            for inp, res in zip(measure_inputs, build_results)
+        ]
+
+    try:
+        outs = remote.time_evaluate_batch(
+            [res.filename for res in build_results],
+            [res.arg_info for res in build_results],
+            str(measure_inputs[0].target),
+            number=number,
+            repeat=repeat,
+            min_repeat_ms=min_repeat_ms,
+            f_preproc="cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else "",
+            cooldown_interval=cooldown_interval,
+        )
+    except TVMError as exc:
+        outs = [{"error": str(exc)}] * len(build_results)
+        if reuse_session:
+            session_cache.drop_session(*remote_args[:3])
+    tstamp = time.time()
+    cost_per_input = (tstamp - tic) / len(build_results)
+
+    results = []
+    for build_result, out in zip(build_results, outs):
+        if "error" in out:
+            costs = (_device_error(out["error"]),)
+            errno = MeasureErrorNo.RUNTIME_DEVICE
+            variance = None
+        else:
+            costs = out["costs"]
+            variance = float(np.var(costs, ddof=1)) if len(costs) > 1 else 0.0
+            if len(costs) > 2:  # remove largest and smallest value to reduce variance
+                costs = sorted(costs)[1:-1]
+            costs = tuple(costs)
+            errno = MeasureErrorNo.NO_ERROR
+        results.append(
+            MeasureResult(costs, errno, cost_per_input + build_result.time_cost, tstamp, variance)
+        )
+    return results
+
+
+def _device_error(msg):
+    """Make a short error from the message of an error on the device"""
+    if "Stack trace returned" in msg:
+        msg = msg[: msg.index("Stack trace returned")]
+    if "CUDA Source" in msg:
+        msg = msg[: msg.index("CUDA Source")]
+    return RuntimeError(msg[:1024])
 
 
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
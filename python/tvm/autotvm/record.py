@@ -122,6 +122,42 @@ def encode(inp, result, protocol="json"):
     raise RuntimeError("Invalid log protocol: " + protocol)
 
 
+def decode_input(json_input):
+    """Decode the "input" field of a json record to target and task
+
+    Parameters
+    ----------
+    json_input : list
+        The json form of (target, task name, task args, task kwargs)
+
+    Returns
+    -------
+    ret : tuple(tvm.target.Target, autotvm.task.Task)
+        The target and the task of the record.
+    """
+    tgt, task_name, task_args, _ = json_input
+    tgt = str(tgt)
+    if "-target" in tgt:
+        logger.warning('"-target" is deprecated, use "-mtriple" instead.')
+        tgt = tgt.replace("-target", "-mtriple")
+    tgt = Target(str(tgt))
+
+    def clean_json_to_python(x):
+        """1. Convert all list in x to tuple (hashable)
+        2. Convert unicode to str for python2
+        """
+        if isinstance(x, list):
+            return tuple([clean_json_to_python(a) for a in x])
+        if isinstance(x, _unicode):
+            return str(x)
+        if isinstance(x, (_long, int)):
+            return int(x)
+        return x
+
+    tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
+    return tgt, tsk
+
+
 def decode(row, protocol="json"):
     """Decode encoded record string to python object
 
@@ -149,26 +185,7 @@ def decode(row, protocol="json"):
                 _old_version_warning = False
             return None
 
-        tgt, task_name, task_args, task_kwargs = row["input"]
-        tgt = str(tgt)
-        if "-target" in tgt:
-            logger.warning('"-target" is deprecated, use "-mtriple" instead.')
-            tgt = tgt.replace("-target", "-mtriple")
-        tgt = Target(str(tgt))
-
-        def clean_json_to_python(x):
-            """1. Convert all list in x to tuple (hashable)
-            2. Convert unicode to str for python2
-            """
-            if isinstance(x, list):
-                return tuple([clean_json_to_python(a) for a in x])
-            if isinstance(x, _unicode):
-                return str(x)
-            if isinstance(x, (_long, int)):
-                return int(x)
-            return x
-
-        tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
+        tgt, tsk = decode_input(row["input"])
         config = ConfigEntity.from_json_dict(row["config"])
         inp = MeasureInput(tgt, tsk, config)
         result = MeasureResult(*[tuple(x) if isinstance(x, list) else x for x in row["result"]])
@@ -201,12 +218,22 @@ def load_from_file(filename):
     Parameters
     ----------
     filename: str
+        A json log file, or a binary record store (see :any:`autotvm.record_store`)
 
     Yields
     ------
     input: autotvm.measure.MeasureInput
     result: autotvm.measure.MeasureResult
     """
+    # pylint: disable=import-outside-toplevel
+    from .record_store import RecordStore, is_record_store
+
+    if is_record_store(filename):
+        with RecordStore(filename, readonly=True) as store:
+            for ret in store:
+                yield ret
+        return
+
     for row in open(filename):
         if row and not row.startswith("#"):
             ret = decode(row)
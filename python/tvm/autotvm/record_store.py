@@ -0,0 +1,412 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Indexed, append-only binary storage of tuning records
+
+The store consists of two files.
+
+* ``filename`` holds the records. It starts with a magic header and is followed by
+  length-prefixed entries. An entry either defines a new input (target, task name,
+  task args, task kwargs) or holds one measurement, which refers to its input by id.
+  Measurements are packed with :code:`struct`, so the target and the task arguments
+  are only stored once per workload.
+
+* ``filename + ".idx"`` is a json index. It remembers the input table and, for every
+  (target key, workload) and (target model, workload) pair, the offset of the best
+  record. The index also records how many bytes of the data file it covers, so that
+  records appended after the last flush (e.g. by another process) are picked up by
+  scanning only the tail of the data file.
+"""
+
+import json
+import logging
+import os
+import struct
+
+import numpy as np
+
+from ..contrib.utils import filelock
+from .measure import MeasureInput, MeasureResult
+from .record import decode_input, encode, load_from_file
+from .task import ConfigEntity
+
+logger = logging.getLogger("autotvm")
+
+STORE_MAGIC = b"TVMREC\x00\x01"
+STORE_INDEX_VERSION = 1
+
+_ENTRY_INPUT = 0
+_ENTRY_MEASURE = 1
+
+# entry kind, payload length
+_ENTRY_HEADER = struct.Struct("<BI")
+# input id, error number, number of costs, all cost, timestamp
+_MEASURE_HEADER = struct.Struct("<IbHdd")
+
+
+def is_record_store(filename):
+    """Check whether a file is a binary record store
+
+    Parameters
+    ----------
+    filename: str
+        The file to check
+
+    Returns
+    -------
+    ret: bool
+        True if the file starts with the magic header of a record store
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename, "rb") as fin:
+        return fin.read(len(STORE_MAGIC)) == STORE_MAGIC
+
+
+def _index_key(key, workload):
+    return json.dumps([key, workload])
+
+
+class RecordStore(object):
+    """An indexed, append-only binary store of tuning records.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the data file. The index is stored next to it with suffix ".idx".
+        The files are created if they do not exist.
+    readonly: bool, optional
+        Whether to open the store for reading only.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with RecordStore("conv2d.rec") as store:
+            store.append(inp, res)
+            inp, res = store.query_best("cpu", inp.task.workload)
+    """
+
+    def __init__(self, filename, readonly=False):
+        self.filename = filename
+        self.index_filename = filename + ".idx"
+        self.readonly = readonly
+
+        # input table: id -> json list, and the reverse map
+        self._inputs = []
+        self._input_ids = {}
+        # index key -> [offset, mean cost]
+        self._best_by_targetkey = {}
+        self._best_by_model = {}
+        # number of bytes of the data file covered by the in-memory index
+        self._size = len(STORE_MAGIC)
+        self._dirty = False
+        # decoded (target, task) of inputs, only lives in memory
+        self._decoded_inputs = {}
+
+        if not os.path.isfile(filename):
+            if readonly:
+                raise FileNotFoundError("Record store %s does not exist" % filename)
+            with open(filename, "ab") as fout:
+                if fout.tell() == 0:
+                    fout.write(STORE_MAGIC)
+        elif not is_record_store(filename):
+            raise ValueError("%s is not a binary record store" % filename)
+
+        self._load_index()
+        self._fin = open(filename, "rb")
+        self._catch_up()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
+
+    def __len__(self):
+        return sum(1 for _ in self._entries(_ENTRY_MEASURE))
+
+    def __iter__(self):
+        for offset, _, _ in self._entries(_ENTRY_MEASURE):
+            yield self.read(offset)
+
+    def append(self, inp, result):
+        """Append a measurement record to the store
+
+        Parameters
+        ----------
+        inp: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+            pair of input/result
+        """
+        assert not self.readonly, "Cannot append to a read-only record store"
+        row = json.loads(encode(inp, result))
+        input_key = json.dumps(row["input"])
+
+        lock = filelock(self.filename + ".lock")
+        try:
+            # other processes may have appended since we last looked
+            self._catch_up()
+            with open(self.filename, "ab") as fout:
+                if input_key not in self._input_ids:
+                    payload = input_key.encode("utf-8")
+                    fout.write(_ENTRY_HEADER.pack(_ENTRY_INPUT, len(payload)) + payload)
+                    self._add_input(input_key)
+
+                costs, error_no, all_cost, timestamp = row["result"]
+                payload = (
+                    _MEASURE_HEADER.pack(
+                        self._input_ids[input_key], error_no, len(costs), all_cost, timestamp
+                    )
+                    + struct.pack("<%dd" % len(costs), *costs)
+                    + json.dumps(row["config"]).encode("utf-8")
+                )
+                offset = fout.tell()
+                fout.write(_ENTRY_HEADER.pack(_ENTRY_MEASURE, len(payload)) + payload)
+                self._size = fout.tell()
+        finally:
+            lock.release()
+
+        if result.error_no == 0:
+            self._update_best(offset, inp.target, inp.task.workload, np.mean(result.costs))
+        self._dirty = True
+
+    def read(self, offset):
+        """Read the record at an offset of the data file
+
+        Parameters
+        ----------
+        offset: int
+            The offset of the record, as returned by the index
+
+        Returns
+        -------
+        inp: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+        """
+        kind, payload = self._read_entry(offset)
+        assert kind == _ENTRY_MEASURE, "No measure record at offset %d" % offset
+        input_id, error_no, n_cost, all_cost, timestamp = _MEASURE_HEADER.unpack_from(payload)
+        pos = _MEASURE_HEADER.size
+        costs = struct.unpack_from("<%dd" % n_cost, payload, pos)
+        pos += 8 * n_cost
+        config = ConfigEntity.from_json_dict(json.loads(payload[pos:].decode("utf-8")))
+
+        if input_id not in self._decoded_inputs:
+            self._decoded_inputs[input_id] = decode_input(json.loads(self._inputs[input_id]))
+        tgt, tsk = self._decoded_inputs[input_id]
+
+        result = MeasureResult(costs, error_no, all_cost, timestamp)
+        config.cost = np.mean(result.costs)
+        return MeasureInput(tgt, tsk, config), result
+
+    def query_best(self, key, workload, by_model=False):
+        """Look up the best record of a workload without scanning the store
+
+        Parameters
+        ----------
+        key: str
+            A target key (e.g. "cpu", "cuda"), or a target model if by_model is set
+        workload: tuple
+            The workload of the task
+        by_model: bool, optional
+            Whether key is a target model instead of a target key
+
+        Returns
+        -------
+        ret: tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult) or None
+            The best record, or None if the workload has no valid record
+        """
+        best = self._best_by_model if by_model else self._best_by_targetkey
+        entry = best.get(_index_key(key, workload))
+        if entry is None:
+            return None
+        return self.read(entry[0])
+
+    def best_records(self, by_model=False):
+        """Generator: yield the best record of every indexed (key, workload) pair
+
+        Parameters
+        ----------
+        by_model: bool, optional
+            Whether to yield the records indexed by target model instead of target key
+
+        Yields
+        ------
+        key: str
+            The target key or target model
+        input: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+        """
+        best = self._best_by_model if by_model else self._best_by_targetkey
+        decoded = {}
+        for index_key, (offset, _) in best.items():
+            if offset not in decoded:
+                decoded[offset] = self.read(offset)
+            inp, res = decoded[offset]
+            yield json.loads(index_key)[0], inp, res
+
+    def flush(self):
+        """Write the index to disk"""
+        if self.readonly or not self._dirty:
+            return
+        index = {
+            "version": STORE_INDEX_VERSION,
+            "size": self._size,
+            "inputs": self._inputs,
+            "best_by_targetkey": self._best_by_targetkey,
+            "best_by_model": self._best_by_model,
+        }
+        lock = filelock(self.filename + ".lock")
+        try:
+            # another process may have flushed a more complete index
+            if self._read_index_size() <= self._size:
+                tmp_filename = "%s.%d.tmp" % (self.index_filename, os.getpid())
+                with open(tmp_filename, "w") as fout:
+                    json.dump(index, fout)
+                os.replace(tmp_filename, self.index_filename)
+        finally:
+            lock.release()
+        self._dirty = False
+
+    def close(self):
+        """Flush the index and close the store"""
+        if self._fin is not None:
+            self.flush()
+            self._fin.close()
+            self._fin = None
+
+    def _add_input(self, input_key):
+        self._input_ids[input_key] = len(self._inputs)
+        self._inputs.append(input_key)
+
+    def _update_best(self, offset, target, workload, cost):
+        for k in target.keys:
+            self._update_best_entry(self._best_by_targetkey, _index_key(k, workload), offset, cost)
+        if target.model != "unknown":
+            key = _index_key(target.model, workload)
+            self._update_best_entry(self._best_by_model, key, offset, cost)
+
+    @staticmethod
+    def _update_best_entry(best, key, offset, cost):
+        if key not in best or best[key][1] > cost:
+            best[key] = [offset, float(cost)]
+
+    def _read_index_size(self):
+        if not os.path.isfile(self.index_filename):
+            return 0
+        try:
+            with open(self.index_filename) as fin:
+                return json.load(fin)["size"]
+        except (ValueError, KeyError):
+            return 0
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_filename):
+            return
+        try:
+            with open(self.index_filename) as fin:
+                index = json.load(fin)
+        except ValueError:
+            logger.warning("Corrupted index %s, rebuilding it", self.index_filename)
+            return
+        if index.get("version") != STORE_INDEX_VERSION:
+            return
+        if index["size"] > os.path.getsize(self.filename):
+            logger.warning("Index %s is newer than its data, rebuilding it", self.index_filename)
+            return
+
+        for input_key in index["inputs"]:
+            self._add_input(input_key)
+        self._best_by_targetkey = index["best_by_targetkey"]
+        self._best_by_model = index["best_by_model"]
+        self._size = index["size"]
+
+    def _catch_up(self):
+        """Index the records appended after the in-memory index was built"""
+        if os.path.getsize(self.filename) <= self._size:
+            return
+        for offset, kind, length in self._entries(start=self._size):
+            if kind == _ENTRY_INPUT:
+                _, payload = self._read_entry(offset)
+                self._add_input(payload.decode("utf-8"))
+            else:
+                inp, res = self.read(offset)
+                if res.error_no == 0:
+                    self._update_best(offset, inp.target, inp.task.workload, np.mean(res.costs))
+            self._size = offset + _ENTRY_HEADER.size + length
+            self._dirty = True
+
+    def _read_entry(self, offset):
+        self._fin.seek(offset)
+        kind, length = _ENTRY_HEADER.unpack(self._fin.read(_ENTRY_HEADER.size))
+        return kind, self._fin.read(length)
+
+    def _entries(self, kind=None, start=len(STORE_MAGIC)):
+        """Generator: yield (offset, kind, length) of the complete entries in the data file"""
+        end = os.path.getsize(self.filename)
+        offset = start
+        while offset + _ENTRY_HEADER.size <= end:
+            self._fin.seek(offset)
+            entry_kind, length = _ENTRY_HEADER.unpack(self._fin.read(_ENTRY_HEADER.size))
+            if offset + _ENTRY_HEADER.size + length > end:
+                # a partially written entry
+                break
+            if kind is None or entry_kind == kind:
+                yield offset, entry_kind, length
+            offset += _ENTRY_HEADER.size + length
+
+
+def convert_from_json(in_file, out_file):
+    """Convert a json log file to a binary record store
+
+    Parameters
+    ----------
+    in_file: str
+        The json log file, as written by :any:`autotvm.callback.log_to_file`
+    out_file: str
+        The filename of the record store. Records are appended if it already exists.
+    """
+    with RecordStore(out_file) as store:
+        for inp, res in load_from_file(in_file):
+            store.append(inp, res)
+
+
+def convert_to_json(in_file, out_file, best_only=False):
+    """Convert a binary record store to a json log file
+
+    Parameters
+    ----------
+    in_file: str
+        The filename of the record store
+    out_file: str or file
+        The json log file
+    best_only: bool, optional
+        Whether to only write the best records (like :any:`autotvm.record.pick_best`)
+    """
+    fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+    with RecordStore(in_file, readonly=True) as store:
+        if best_only:
+            offsets = set(entry[0] for entry in store._best_by_targetkey.values())
+            offsets.update(entry[0] for entry in store._best_by_model.values())
+            records = (store.read(offset) for offset in sorted(offsets))
+        else:
+            records = iter(store)
+        for inp, res in records:
+            fout.write(encode(inp, res) + "\n")
+    if isinstance(out_file, str):
+        fout.close()
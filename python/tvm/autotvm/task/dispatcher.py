@@ -209,14 +209,23 @@ class ApplyHistoryBest(DispatchContext):
             Collection of tuning records.
             If is str, then it should be the filename of a records log file.
             Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+            A binary record store (see :any:`autotvm.record_store`) is also accepted,
+            in which case only its indexed best records are read.
         """
         # pylint: disable=import-outside-toplevel
         from pathlib import Path
         from ..record import load_from_file
+        from ..record_store import RecordStore, is_record_store
 
         if isinstance(records, Path):
             records = str(records)
 
+        if isinstance(records, str) and is_record_store(records):
+            # the store indexes its best records, so there is no need to scan it
+            with RecordStore(records, readonly=True) as store:
+                records = [(inp, res) for _, inp, res in store.best_records()]
+                records += [(inp, res) for _, inp, res in store.best_records(by_model=True)]
+
         if isinstance(records, str):
             records = load_from_file(records)
         if not records:
@@ -26,6 +26,7 @@ entity in the space. This entity contains deterministic parameters.
 """
 from __future__ import absolute_import as _abs
 
+import array
 import itertools
 import functools
 import math
@@ -202,7 +203,13 @@ def get_pow2s(n):
 
 
 class SplitSpace(TransformSpace):
-    """Split an axis for several times"""
+    """Split an axis for several times
+
+    Except for the 'candidate' policy, the entities are not materialized.
+    The valid split factors are counted by dynamic programming over the partial
+    products, and the i-th entity is reconstructed on demand from these counts.
+    The order of the entities is the same as a depth-first enumeration of the factors.
+    """
 
     def __init__(self, axes, policy, **kwargs):
         super(SplitSpace, self).__init__()
@@ -212,51 +219,107 @@ class SplitSpace(TransformSpace):
         self.entities = []
 
         max_factor = kwargs.get("max_factor", 1 << 31)
-        fil = kwargs.get("filter", lambda x: True)
+        fil = kwargs.get("filter", None)
         self.product = axis.length
         self.num_output = kwargs.get("num_outputs", 0)
         assert self.num_output > 0
 
+        # number of entities before filtering, None if the entities are materialized
+        self._raw_length = None
+        # raw indexes of the entities that pass the filter, None if there is no filter
+        self._valid = None
+        # (position, partial product) -> number of valid completions
+        self._count_cache = {}
+
         if policy == "candidate":
             for size in kwargs["candidate"]:
                 assert len(size) == self.num_output
                 self.entities.append(SplitEntity(size))
-        else:
-            if policy == "verbose":
-                # Include factors and power-of-twos. May generate tails.
-                divisibles = get_factors(self.product)
-                pow2s = get_pow2s(self.product)
-                factors = [x for x in list(set(divisibles) | set(pow2s)) if x <= max_factor]
-            elif policy == "factors":
-                # Include divisible factors. Guarantee no tails.
-                factors = [x for x in get_factors(self.product) if x <= max_factor]
-            elif policy == "power2":
-                # Include less, equal, and round-up power-of-two numbers. May generate tails.
-                factors = [x for x in get_pow2s(self.product) if x <= max_factor]
-            else:
-                raise RuntimeError("Invalid policy: %s" % policy)
+            if fil is not None:
+                self.entities = list(filter(fil, self.entities))
+            return
 
-            # Enforce the product of all split factors equals to the axis length
-            no_tail = kwargs.get("no_tail", policy == "factors")
+        if policy == "verbose":
+            # Include factors and power-of-twos. May generate tails.
+            divisibles = get_factors(self.product)
+            pow2s = get_pow2s(self.product)
+            factors = [x for x in list(set(divisibles) | set(pow2s)) if x <= max_factor]
+        elif policy == "factors":
+            # Include divisible factors. Guarantee no tails.
+            factors = [x for x in get_factors(self.product) if x <= max_factor]
+        elif policy == "power2":
+            # Include less, equal, and round-up power-of-two numbers. May generate tails.
+            factors = [x for x in get_pow2s(self.product) if x <= max_factor]
+        else:
+            raise RuntimeError("Invalid policy: %s" % policy)
+
+        # Enforce the product of all split factors equals to the axis length
+        self.no_tail = kwargs.get("no_tail", policy == "factors")
+        self.factors = factors
+        self._raw_length = self._count(0, 1)
+
+        if fil is not None:
+            # The filter is an arbitrary python function, so we have to evaluate it on
+            # every entity. Only the indexes of the accepted entities are kept.
+            self._valid = array.array(
+                "q", (i for i in range(self._raw_length) if fil(self._get_raw(i)))
+            )
 
-            # Generate split entity by enumerating candidate factors.
-            self.factors = factors
-            self._generate_space(0, [None] * (self.num_output - 1), enforce_no_tail=no_tail)
+    def __eq__(self, other):
+        if not isinstance(other, SplitSpace):
+            return NotImplemented
 
-        self.entities = list(filter(fil, self.entities))
+        # the count cache depends on the access history, not on the space
+        ignore = ("_count_cache",)
+        return {k: v for k, v in self.__dict__.items() if k not in ignore} == {
+            k: v for k, v in other.__dict__.items() if k not in ignore
+        }
 
-    def _generate_space(self, now, tmp_stack, enforce_no_tail=False):
-        """Generate space by DFS"""
+    def _count(self, now, prod):
+        """Count the valid entities whose first `now` factors multiply to `prod`"""
+        if prod > self.product:
+            return 0
         if now == self.num_output - 1:
-            prod = functools.reduce(lambda x, y: x * y, tmp_stack)
-            if prod > self.product:
-                return
-            if self.product % prod == 0 or (not enforce_no_tail and prod < self.product):
-                self.entities.append(SplitEntity([-1] + tmp_stack[::-1]))
-        else:
+            if self.product % prod == 0 or (not self.no_tail and prod < self.product):
+                return 1
+            return 0
+
+        key = (now, prod)
+        if key not in self._count_cache:
+            self._count_cache[key] = sum(self._count(now + 1, prod * f) for f in self.factors)
+        return self._count_cache[key]
+
+    def _get_raw(self, index):
+        """Get the index-th entity of the unfiltered space"""
+        tmp_stack = []
+        prod = 1
+        for now in range(self.num_output - 1):
             for factor in self.factors:
-                tmp_stack[now] = factor
-                self._generate_space(now + 1, tmp_stack, enforce_no_tail)
+                count = self._count(now + 1, prod * factor)
+                if index < count:
+                    break
+                index -= count
+            tmp_stack.append(factor)
+            prod *= factor
+        return SplitEntity([-1] + tmp_stack[::-1])
+
+    def __len__(self):
+        if self._raw_length is None:
+            return len(self.entities)
+        if self._valid is not None:
+            return len(self._valid)
+        return self._raw_length
+
+    def __getitem__(self, index):
+        if self._raw_length is None:
+            return self.entities[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SplitSpace index out of range")
+        if self._valid is not None:
+            index = int(self._valid[index])
+        return self._get_raw(index)
 
     @staticmethod
     def get_num_output(axes, policy, **kwargs):
@@ -678,6 +741,8 @@ class ConfigSpace(object):
         self._length = None
         self._entity_map = OrderedDict()  # name -> entity
         self._constraints = []
+        self._multi_filters = []  # filters over several knobs
+        self._valid_length = None
         self.errors = []
         self.code_hash = None
         self.flop = 0
@@ -794,6 +859,67 @@ class ConfigSpace(object):
         """
         return self._add_new_transform(OtherOptionSpace, name, [], None, candidate=candidate)
 
+    def multi_filter(self, filter):  # pylint: disable=redefined-builtin
+        """Add a constraint that involves several knobs.
+        The points of the space rejected by the filter are skipped by the tuners instead
+        of being measured and failing with InstantiationError.
+
+        Parameters
+        ----------
+        filter: Callable[[ConfigEntity], bool]
+            Returns whether a config is valid
+
+        Examples
+        --------
+        >>> # the product of the inner tiles should not exceed 1024 threads
+        >>> cfg.multi_filter(filter=lambda e: e["tile_x"].size[-1] * e["tile_y"].size[-1] <= 1024)
+        """
+        if self._collect:
+            self._multi_filters.append(filter)
+            self._valid_length = None
+
+    def has_multi_filters(self):
+        """Whether constraints were added with :any:`multi_filter`, i.e. whether some
+        points of the space may be invalid
+
+        Returns
+        -------
+        has_filters: bool
+        """
+        return bool(self._multi_filters)
+
+    def is_index_valid(self, index):
+        """Check whether the config at an index passes the filters of :any:`multi_filter`
+
+        Parameters
+        ----------
+        index: int
+            index in the space
+
+        Returns
+        -------
+        valid: bool
+        """
+        if not self._multi_filters:
+            return True
+        config = self.get(index)
+        return all(fil(config) for fil in self._multi_filters)
+
+    def valid_length(self):
+        """The number of points of the space that pass the filters of :any:`multi_filter`.
+        The filters are evaluated on the whole index space once, so this is only practical
+        for spaces that can be enumerated.
+
+        Returns
+        -------
+        length: int
+        """
+        if not self._multi_filters:
+            return len(self)
+        if self._valid_length is None:
+            self._valid_length = sum(1 for i in range(len(self)) if self.is_index_valid(i))
+        return self._valid_length
+
     def add_flop(self, flop):
         """Add float operation statistics for this tuning task
 
@@ -847,10 +973,24 @@ class ConfigSpace(object):
         return [Axis(None, i) for i in range(space_class.get_num_output(axes, policy, **kwargs))]
 
     def __len__(self):
+        """The size of the index space, i.e. the product of the lengths of the knobs.
+        Filters of single knobs are already applied, while the points rejected by
+        :any:`multi_filter` are still counted (see :any:`is_index_valid` and
+        :any:`valid_length`)."""
         if self._length is None:
-            self._length = int(np.prod([len(x) for x in self.space_map.values()]))
+            # python integers, the product can exceed int64 for huge spaces
+            self._length = functools.reduce(
+                lambda x, y: x * y, [len(x) for x in self.space_map.values()], 1
+            )
         return self._length
 
+    def __getstate__(self):
+        # multi filters are usually lambdas that cannot be pickled. They are only
+        # needed by the tuner, not by the processes that build the configs.
+        state = self.__dict__.copy()
+        state["_multi_filters"] = []
+        return state
+
     def get(self, index):
         """Get a config entity with detailed parameters from this space
 
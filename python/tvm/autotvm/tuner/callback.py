@@ -64,6 +64,32 @@ def log_to_file(file_out, protocol="json"):
     return _callback
 
 
+def log_to_record_store(filename):
+    """Log the tuning records into a binary record store.
+    See :any:`autotvm.record_store.RecordStore` for the format.
+
+    Parameters
+    ----------
+    filename : str
+        The filename of the record store. It is created if it does not exist.
+
+    Returns
+    -------
+    callback : callable
+        Callback function to do the logging.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..record_store import RecordStore
+
+    def _callback(_, inputs, results):
+        """Callback implementation"""
+        with RecordStore(filename) as store:
+            for inp, result in zip(inputs, results):
+                store.append(inp, result)
+
+    return _callback
+
+
 def log_to_database(db):
     """Save the tuning records to a database object.
 
@@ -68,19 +68,29 @@ class GATuner(Tuner):
 
         # random initialization
         self.pop_size = min(self.pop_size, len(self.space))
+        while len(self.genes) < self.pop_size and len(self.visited) < len(self.space):
+            point = np.random.randint(len(self.space))
+            if self._is_new(point):
+                self.genes.append(point2knob(point, self.dims))
+                self.visited.add(point)
+        # fewer points than the population may pass the multi filters of the space
+        self.pop_size = len(self.genes)
         self.elite_num = min(self.pop_size, self.elite_num)
-        for _ in range(self.pop_size):
-            tmp_gene = point2knob(np.random.randint(len(self.space)), self.dims)
-            while knob2point(tmp_gene, self.dims) in self.visited:
-                tmp_gene = point2knob(np.random.randint(len(self.space)), self.dims)
 
-            self.genes.append(tmp_gene)
-            self.visited.add(knob2point(tmp_gene, self.dims))
+    def _is_new(self, point):
+        """Check whether a point is neither visited nor rejected by the multi filters of the
+        space. Rejected points are marked visited, so that they are never proposed again."""
+        if point in self.visited:
+            return False
+        if not self.space.is_index_valid(point):
+            self.visited.add(point)
+            return False
+        return True
 
     def next_batch(self, batch_size):
         ret = []
         for _ in range(batch_size):
-            gene = self.genes[self.trial_pt % self.pop_size]
+            gene = self.genes[self.trial_pt % len(self.genes)]
             self.trial_pt += 1
             ret.append(self.space.get(knob2point(gene, self.dims)))
 
@@ -125,16 +135,17 @@ class GATuner(Tuner):
                     if np.random.random() < self.mutation_prob:
                         tmp_gene[j] = np.random.randint(dim)
 
-                if len(self.visited) < len(self.space):
-                    while knob2point(tmp_gene, self.dims) in self.visited:
-                        j = np.random.randint(len(self.dims))
-                        tmp_gene[j] = np.random.randint(
-                            self.dims[j]  # pylint: disable=invalid-sequence-index
-                        )
-                    next_genes.append(tmp_gene)
-                    self.visited.add(knob2point(tmp_gene, self.dims))
-                else:
+                point = knob2point(tmp_gene, self.dims)
+                while len(self.visited) < len(self.space) and not self._is_new(point):
+                    j = np.random.randint(len(self.dims))
+                    tmp_gene[j] = np.random.randint(
+                        self.dims[j]  # pylint: disable=invalid-sequence-index
+                    )
+                    point = knob2point(tmp_gene, self.dims)
+                if len(self.visited) >= len(self.space):
                     break
+                next_genes.append(tmp_gene)
+                self.visited.add(point)
 
             self.genes = next_genes
             self.trial_pt = 0
@@ -58,21 +58,25 @@ class IndexBaseTuner(Tuner):
 
 
 class GridSearchTuner(IndexBaseTuner):
-    """Enumerate the search space in a grid search order"""
+    """Enumerate the search space in a grid search order.
+    Points rejected by the filters of `ConfigSpace.multi_filter` are skipped."""
 
     def next_batch(self, batch_size):
         ret = []
-        for _ in range(batch_size):
+        while len(ret) < batch_size:
             if self.counter >= self.range_length:
                 break
             index = self.counter + self.index_offset
-            ret.append(self.task.config_space.get(index))
             self.counter = self.counter + 1
+            if not self.task.config_space.is_index_valid(index):
+                continue
+            ret.append(self.task.config_space.get(index))
         return ret
 
 
 class RandomTuner(IndexBaseTuner):
-    """Enumerate the search space in a random order
+    """Enumerate the search space in a random order.
+    Points rejected by the filters of `ConfigSpace.multi_filter` are skipped.
 
     Parameters
     ----------
@@ -94,7 +98,7 @@ class RandomTuner(IndexBaseTuner):
 
     def next_batch(self, batch_size):
         ret = []
-        for _ in range(batch_size):
+        while len(ret) < batch_size:
             if self.rand_max == 0:
                 break
 
@@ -104,11 +108,14 @@ class RandomTuner(IndexBaseTuner):
 
             # Use the indirect index to get a direct index.
             index = self.rand_state.get(index_, index_) + self.index_offset
-            ret.append(self.task.config_space.get(index))
-            self.visited.append(index)
 
             # Update the direct index map.
             self.rand_state[index_] = self.rand_state.get(self.rand_max, self.rand_max)
             self.rand_state.pop(self.rand_max, None)
             self.counter += 1
+
+            if not self.task.config_space.is_index_valid(index):
+                continue
+            ret.append(self.task.config_space.get(index))
+            self.visited.append(index)
         return ret
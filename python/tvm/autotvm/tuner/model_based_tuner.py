@@ -20,6 +20,9 @@ This type of tuner will fit a cost model and use some optimization methods to
 find optimums points of cost model in space.
 """
 import gc
+import os
+import sqlite3
+import time
 
 import numpy as np
 
@@ -77,6 +80,145 @@ class FeatureCache(object):
         self.feature_cache[key] = {}
         gc.collect()
 
+    def load(self, key, items):
+        """Load features that are stored outside of this process
+
+        Parameters
+        ----------
+        key: str
+            The key of a feature type
+        items: Array of (tuple, int)
+            The (workload, config index) pairs to look up
+
+        Returns
+        -------
+        found: dict of (tuple, int) to (np.ndarray or None, float or None)
+            The feature and the flop of every pair found. A feature of None
+            means that the extraction failed.
+        """
+        return {}
+
+    def save(self, key, items):
+        """Store features so that other processes and sessions can reuse them
+
+        Parameters
+        ----------
+        key: str
+            The key of a feature type
+        items: Array of ((tuple, int), np.ndarray or None, float or None)
+            The (workload, config index) pair, the feature and the flop (if known)
+        """
+
+
+class PersistentFeatureCache(FeatureCache):
+    """Feature cache backed by a SQLite file, so that features survive the process
+    and can be shared by concurrent tuning processes.
+
+    Features are keyed by (task workload, feature type, config index). When the file
+    grows beyond `max_entries` features, the least recently used ones are evicted.
+
+    Parameters
+    ----------
+    filename: str
+        The path of the cache file. It is created if it does not exist.
+    max_entries: int, optional
+        The maximum number of features kept on disk.
+    """
+
+    # how many new features to save between two checks of the size bound
+    EVICT_CHECK_INTERVAL = 10000
+
+    def __init__(self, filename, max_entries=2000000):
+        super(PersistentFeatureCache, self).__init__()
+        self.filename = filename
+        self.max_entries = max_entries
+        self._conn = None
+        self._conn_pid = None
+        self._n_saved = 0
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS features (workload TEXT NOT NULL, "
+                "fea_type TEXT NOT NULL, idx INTEGER NOT NULL, feature BLOB, flop REAL, "
+                "atime REAL NOT NULL, PRIMARY KEY (workload, fea_type, idx))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS features_atime ON features (atime)")
+
+    @property
+    def conn(self):
+        """The connection of the current process"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.filename, timeout=60)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_conn_pid"] = None
+        return state
+
+    def load(self, key, items):
+        found = {}
+        now = time.time()
+        rows = []
+        for workload, index in items:
+            row = self.conn.execute(
+                "SELECT feature, flop FROM features WHERE workload = ? AND fea_type = ? "
+                "AND idx = ?",
+                (str(workload), key, int(index)),
+            ).fetchone()
+            if row is None:
+                continue
+            fea = np.frombuffer(row[0], dtype=np.float32) if row[0] is not None else None
+            found[(workload, index)] = (fea, row[1])
+            rows.append((now, str(workload), key, int(index)))
+
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE features SET atime = ? WHERE workload = ? AND fea_type = ? "
+                    "AND idx = ?",
+                    rows,
+                )
+        return found
+
+    def save(self, key, items):
+        now = time.time()
+        rows = []
+        for (workload, index), fea, flop in items:
+            blob = np.asarray(fea, dtype=np.float32).tobytes() if fea is not None else None
+            rows.append((str(workload), key, int(index), blob, flop, now))
+        if not rows:
+            return
+
+        with self.conn:
+            # keep a known flop if the new item does not have one
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO features (workload, fea_type, idx, feature, flop, atime) "
+                "VALUES (?1, ?2, ?3, ?4, COALESCE(?5, (SELECT flop FROM features WHERE "
+                "workload = ?1 AND fea_type = ?2 AND idx = ?3)), ?6)",
+                rows,
+            )
+
+        self._n_saved += len(rows)
+        if self._n_saved >= self.EVICT_CHECK_INTERVAL:
+            self._n_saved = 0
+            self._evict()
+
+    def _evict(self):
+        """Remove the least recently used features beyond the size bound"""
+        n_entries = self.conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+        if n_entries <= self.max_entries:
+            return
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM features WHERE rowid IN "
+                "(SELECT rowid FROM features ORDER BY atime LIMIT ?)",
+                (n_entries - self.max_entries,),
+            )
+
 
 class CostModel(object):
     """Cost model to predict the speed of a config"""
@@ -247,6 +389,11 @@ class ModelBasedTuner(Tuner):
                 while index in self.visited:
                     index = np.random.randint(len(self.space))
 
+            if not self.space.is_index_valid(index):
+                # rejected by a multi filter, mark it visited without measuring it
+                self.visited.add(index)
+                continue
+
             ret.append(self.space.get(index))
             self.visited.add(index)
 
@@ -19,7 +19,6 @@
 Cost model optimizer based on simulated annealing
 """
 
-import heapq
 import logging
 import time
 
@@ -47,6 +46,9 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         Stop iteration if the optimal set do not change in `early_stop` rounds
     log_interval: int, optional
         Print log every `log_interval` iterations
+    valid_cache_size: int, optional
+        The maximum number of points whose validity under the multi filters
+        of the space is remembered across iterations
     """
 
     def __init__(
@@ -58,6 +60,7 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         parallel_size=128,
         early_stop=50,
         log_interval=50,
+        valid_cache_size=1 << 16,
     ):
         super(SimulatedAnnealingOptimizer, self).__init__()
 
@@ -71,6 +74,10 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         self.early_stop = early_stop or 1e9
         self.log_interval = log_interval
         self.points = None
+        # point -> whether it passes the multi filters of the space,
+        # bounded to the `valid_cache_size` most recently inserted points
+        self._valid = {}
+        self.valid_cache_size = valid_cache_size
 
     def find_maximums(self, model, num, exclusive):
         tic = time.time()
@@ -81,24 +88,26 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             self.log_interval,
         )
 
+        # use python integers if the index space does not fit into int64
+        dtype = np.int64 if len(self.task.config_space) < 2 ** 62 else object
+        dims = np.array(self.dims, dtype=dtype)
+        strides = np.concatenate(([1], np.cumprod(dims)[:-1])).astype(dtype)
+
         if self.persistent and self.points is not None:
             points = self.points
         else:
-            points = np.array(sample_ints(0, len(self.task.config_space), self.parallel_size))
+            points = np.array(
+                sample_ints(0, len(self.task.config_space), self.parallel_size), dtype=dtype
+            )
 
-        scores = model.predict(points)
+        scores = self._mask_invalid(points, model.predict(points))
 
-        # build heap and insert initial points
-        heap_items = [(float("-inf"), -1 - i) for i in range(num)]
-        heapq.heapify(heap_items)
-        in_heap = set(exclusive)
-        in_heap.update([x[1] for x in heap_items])
+        # the top-`num` points found so far, initialized with placeholders
+        top_scores = np.full(num, float("-inf"))
+        top_points = np.arange(-1, -1 - num, -1).astype(dtype)
+        exclusive = np.array(list(exclusive), dtype=dtype)
 
-        for s, p in zip(scores, points):
-            if s > heap_items[0][0] and p not in in_heap:
-                pop = heapq.heapreplace(heap_items, (s, p))
-                in_heap.remove(pop[1])
-                in_heap.add(p)
+        top_scores, top_points, _ = _update_top(top_scores, top_points, scores, points, exclusive)
 
         k = 0
         k_last_modify = 0
@@ -111,24 +120,22 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             cool = 0
 
         while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = random_walk(p, self.dims)
+            new_points = random_walk_batch(points, dims, strides)
 
-            new_scores = model.predict(new_points)
+            new_scores = self._mask_invalid(new_points, model.predict(new_points))
 
-            ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
+            with np.errstate(invalid="ignore"):
+                ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
             ac_index = np.random.random(len(ac_prob)) < ac_prob
 
             points[ac_index] = new_points[ac_index]
             scores[ac_index] = new_scores[ac_index]
 
-            for s, p in zip(new_scores, new_points):
-                if s > heap_items[0][0] and p not in in_heap:
-                    pop = heapq.heapreplace(heap_items, (s, p))
-                    in_heap.remove(pop[1])
-                    in_heap.add(p)
-                    k_last_modify = k
+            top_scores, top_points, modified = _update_top(
+                top_scores, top_points, new_scores, new_points, exclusive
+            )
+            if modified:
+                k_last_modify = k
 
             k += 1
             t -= cool
@@ -140,23 +147,116 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
                     "elapsed: %.2f",
                     k,
                     k_last_modify,
-                    heap_items[0][0],
-                    np.max([v for v, _ in heap_items]),
+                    np.min(top_scores),
+                    np.max(top_scores),
                     t_str,
                     time.time() - tic,
                 )
 
-        heap_items.sort(key=lambda item: -item[0])
-        heap_items = [x for x in heap_items if x[0] >= 0]
+        order = np.argsort(-top_scores, kind="stable")
+        order = order[top_scores[order] >= 0]
         logger.debug(
             "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
         )
-        logger.debug("SA Maximums: %s", heap_items)
+        logger.debug("SA Maximums: %s", list(zip(top_scores[order], top_points[order])))
 
         if self.persistent:
             self.points = points
 
-        return [x[1] for x in heap_items]
+        return top_points[order].tolist()
+
+    def _mask_invalid(self, points, scores):
+        """Give the points rejected by the multi filters of the space a score of -inf,
+        so that the walks never move to them and they are never returned"""
+        space = self.task.config_space
+        if not space.has_multi_filters():
+            return scores
+
+        uniq, inverse = np.unique(points, return_inverse=True)
+        valid = np.empty(len(uniq), dtype=bool)
+        for i, point in enumerate(uniq):
+            point = int(point)
+            if point not in self._valid:
+                if len(self._valid) >= self.valid_cache_size:
+                    # evict the oldest entry
+                    del self._valid[next(iter(self._valid))]
+                self._valid[point] = space.is_index_valid(point)
+            valid[i] = self._valid[point]
+        scores[~valid[inverse]] = float("-inf")
+        return scores
+
+
+def _update_top(top_scores, top_points, scores, points, exclusive):
+    """Merge new (score, point) pairs into the current top set.
+
+    A new point enters the set if its score is larger than the smallest score in the set
+    and it is neither in the set already nor in `exclusive`.
+
+    Returns
+    -------
+    top_scores: np.ndarray
+    top_points: np.ndarray
+        The updated top set
+    modified: bool
+        Whether any new point entered the set
+    """
+    mask = scores > np.min(top_scores)
+    if not np.any(mask):
+        return top_scores, top_points, False
+    cand_scores, cand_points = scores[mask], points[mask]
+
+    # deduplicate new points and drop the ones we already know
+    cand_points, first = np.unique(cand_points, return_index=True)
+    cand_scores = cand_scores[first]
+    mask = ~np.isin(cand_points, top_points)
+    if len(exclusive):
+        mask &= ~np.isin(cand_points, exclusive)
+    if not np.any(mask):
+        return top_scores, top_points, False
+
+    num = len(top_scores)
+    merged_scores = np.concatenate((top_scores, cand_scores[mask]))
+    merged_points = np.concatenate((top_points, cand_points[mask]))
+    keep = np.argpartition(-merged_scores, num - 1)[:num]
+    return merged_scores[keep], merged_points[keep], bool(np.any(keep >= num))
+
+
+def random_walk_batch(points, dims, strides):
+    """random walk as local transition of a batch of points.
+    Every point mutates one of its knobs to a different value.
+
+    Parameters
+    ----------
+    points: np.ndarray
+        indexes of the ConfigEntity
+    dims: np.ndarray
+        sizes of each dimension
+    strides: np.ndarray
+        the index stride of each dimension, i.e. the product of all previous dims
+
+    Returns
+    -------
+    new_points: np.ndarray
+        new neighborhood indexes
+    """
+    n = len(points)
+    rows = np.arange(n)
+    # transform to knob form
+    knobs = (points[:, None] // strides[None, :]) % dims[None, :]
+    int_dims = dims.astype(np.int64)
+
+    from_i = np.empty(n, dtype=np.int64)
+    to_v = np.empty(n, dtype=np.int64)
+    # mutate, resampling the rows that did not change
+    todo = rows
+    while len(todo):
+        from_i[todo] = np.random.randint(len(dims), size=len(todo))
+        to_v[todo] = np.random.randint(int_dims[from_i[todo]])
+        todo = todo[knobs[todo, from_i[todo]] == to_v[todo]]
+
+    # transform to index form
+    old_v = knobs[rows, from_i]
+    return points + (to_v.astype(points.dtype) - old_v) * strides[from_i]
 
 
 def random_walk(p, dims):
@@ -18,6 +18,7 @@
 """Base class of tuner"""
 import logging
 import tempfile
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -89,7 +90,15 @@ class Tuner(object):
             result for measurement
         """
 
-    def tune(self, n_trial, measure_option, early_stopping=None, callbacks=(), si_prefix="G"):
+    def tune(
+        self,
+        n_trial,
+        measure_option,
+        early_stopping=None,
+        callbacks=(),
+        si_prefix="G",
+        pipeline=False,
+    ):
         """Begin tuning
 
         Parameters
@@ -108,6 +117,13 @@ class Tuner(object):
             every measurement pair. See autotvm/tuner/callback.py for some examples.
         si_prefix: str
             One of tvm.autotvm.utils.SI_PREFIXES. The SI prefix to use when reporting FLOPS.
+        pipeline: bool, optional
+            Whether to overlap building and running. If set, the next batch is proposed and
+            built while the current batch is running on the device, and the tuner is updated
+            in the background while the next batch is being built. The next batch is therefore
+            proposed before the results of the current batch are known.
+            This is intended for remote devices (e.g. RPCRunner), since a LocalRunner would
+            measure on the same cpu cores that are busy compiling.
         """
         measure_batch = create_measure_batch(self.task, measure_option)
         n_parallel = getattr(measure_batch, "n_parallel", 1)
@@ -123,14 +139,41 @@ class Tuner(object):
         GLOBAL_SCOPE.in_tuning = True
         i = error_ct = 0
         errors = []
+
+        # state of the pipelined mode: one build and one update can be in flight
+        pool = ThreadPool(2) if pipeline else None
+        pending_build = pending_update = None
+
+        def _submit_build(n_measured):
+            """Propose the next batch and start building it in the background"""
+            if pending_update is not None:
+                pending_update.get()
+            if n_measured >= n_trial or not self.has_next():
+                return None
+            configs = self.next_batch(min(n_parallel, n_trial - n_measured))
+            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
+            return inputs, pool.apply_async(measure_batch.build, (inputs,))
+
         while i < n_trial:
-            if not self.has_next():
-                break
+            if pipeline:
+                if pending_build is None:
+                    pending_build = _submit_build(i)
+                if pending_build is None:
+                    break
+
+                inputs, build_future = pending_build
+                build_results = build_future.get()
+                # build the next batch while this one is running on the device
+                pending_build = _submit_build(i + len(inputs))
+                results = measure_batch.run(inputs, build_results)
+            else:
+                if not self.has_next():
+                    break
 
-            configs = self.next_batch(min(n_parallel, n_trial - i))
+                configs = self.next_batch(min(n_parallel, n_trial - i))
 
-            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
-            results = measure_batch(inputs)
+                inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
+                results = measure_batch(inputs)
 
             # keep best config
             for k, (inp, res) in enumerate(zip(inputs, results)):
@@ -166,7 +209,10 @@ class Tuner(object):
             i += len(results)
             self.ttl = min(early_stopping + self.best_iter, n_trial) - i
 
-            self.update(inputs, results)
+            if pipeline:
+                pending_update = pool.apply_async(self.update, (inputs, results))
+            else:
+                self.update(inputs, results)
             for callback in callbacks:
                 callback(self, inputs, results)
 
@@ -181,6 +227,15 @@ class Tuner(object):
             else:
                 logger.setLevel(old_level)
 
+        if pipeline:
+            # drain the batch built ahead (it is discarded) and the last model update
+            if pending_build is not None:
+                pending_build[1].wait()
+            if pending_update is not None:
+                pending_update.get()
+            pool.close()
+            pool.join()
+
         if error_ct == i:
             _, f = tempfile.mkstemp(prefix="tvm_tuning_errors_", suffix=".log", text=True)
             with open(f, "w") as file:
@@ -192,6 +247,8 @@ class Tuner(object):
                 f,
             )
         GLOBAL_SCOPE.in_tuning = False
+        # free the devices held by the runner before its tracker and server go away
+        measure_batch.close()
         del measure_batch
 
     def reset(self):
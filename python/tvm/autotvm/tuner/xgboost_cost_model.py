@@ -67,10 +67,20 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_cache: FeatureCache, optional
+        The cache of extracted features. By default features are only cached in memory.
+        Pass a PersistentFeatureCache to reuse them across processes and tuning sessions.
     """
 
     def __init__(
-        self, task, feature_type, loss_type, num_threads=None, log_interval=25, upper_model=None
+        self,
+        task,
+        feature_type,
+        loss_type,
+        num_threads=None,
+        log_interval=25,
+        upper_model=None,
+        feature_cache=None,
     ):
         global xgb
         super(XGBoostCostModel, self).__init__()
@@ -135,7 +145,7 @@ class XGBoostCostModel(CostModel):
         if upper_model:  # share a same feature cache with upper model
             self.feature_cache = upper_model.feature_cache
         else:
-            self.feature_cache = FeatureCache()
+            self.feature_cache = feature_cache or FeatureCache()
         self.upper_model = upper_model
         self.feature_extra_ct = 0
         self.pool = None
@@ -236,6 +246,18 @@ class XGBoostCostModel(CostModel):
 
         logger.debug("XGB load %d entries from history log file", len(data))
 
+        # reuse the features extracted by previous sessions
+        keys = [(inp.task.workload, inp.config.index) for inp, _ in data]
+        stored = self.feature_cache.load(self.fea_type, keys)
+        feas = [None] * len(data)
+        need_extract = []
+        for i, (key, (inp, res)) in enumerate(zip(keys, data)):
+            fea, flop = stored.get(key, (None, None))
+            if fea is not None and (flop is not None or res.error_no != 0):
+                feas[i] = (fea, flop)
+            else:
+                need_extract.append(i)
+
         # extract feature
         self._reset_pool(self.space, self.target, self.task)
         pool = self._get_pool()
@@ -247,19 +269,24 @@ class XGBoostCostModel(CostModel):
             feature_extract_func = _extract_curve_feature_log
         else:
             raise RuntimeError("Invalid feature type: " + self.fea_type)
-        res = pool.map(feature_extract_func, data)
-
-        # filter out None results
-        res = [r for r in res if r]
+        extracted = pool.map(feature_extract_func, [data[i] for i in need_extract])
+        for i, r in zip(need_extract, extracted):
+            feas[i] = r
+        self.feature_cache.save(
+            self.fea_type, [(keys[i], r[0], r[1]) for i, r in zip(need_extract, extracted) if r]
+        )
 
         # filter out feature with different shapes
         fea_len = len(self._get_feature([0])[0])
 
         xs, ys = [], []
-        for x, y in res:
-            if len(x) == fea_len:
-                xs.append(x)
-                ys.append(y)
+        for fea, (inp, res) in zip(feas, data):
+            # filter out None results
+            if not fea or len(fea[0]) != fea_len:
+                continue
+            x, flop = fea
+            xs.append(x)
+            ys.append(flop / np.mean(res.costs) if res.error_no == 0 else 0.0)
 
         if len(xs) < 500:  # no enough samples
             return False
@@ -328,6 +355,14 @@ class XGBoostCostModel(CostModel):
         indexes = np.array(indexes)
         need_extract = [x for x in indexes if x not in fea_cache]
 
+        if need_extract:
+            # reuse the features stored by other processes or previous sessions
+            workload = self.task.workload
+            stored = self.feature_cache.load(self.fea_type, [(workload, x) for x in need_extract])
+            for (_, x), (fea, _) in stored.items():
+                fea_cache[x] = fea
+            need_extract = [x for x in need_extract if x not in fea_cache]
+
         if need_extract:
             pool = self._get_pool()
             # If we are forking, we can pass arguments in globals for better performance
@@ -338,6 +373,9 @@ class XGBoostCostModel(CostModel):
                 feas = pool.map(self.feature_extract_func, args)
             for i, fea in zip(need_extract, feas):
                 fea_cache[i] = fea
+            self.feature_cache.save(
+                self.fea_type, [((workload, x), fea, None) for x, fea in zip(need_extract, feas)]
+            )
 
         feature_len = None
         for idx in indexes:
@@ -380,20 +418,15 @@ def _extract_itervar_feature_index(args):
 
 
 def _extract_itervar_feature_log(arg):
-    """extract iteration var feature for log items"""
+    """extract iteration var feature and flop for log items"""
     try:
-        inp, res = arg
+        inp, _ = arg
         config = inp.config
         with inp.target:
             sch, args = inp.task.instantiate(config)
         fea = feature.get_itervar_feature_flatten(sch, args, take_log=True)
         x = np.concatenate((fea, list(config.get_other_option().values())))
-
-        if res.error_no == 0:
-            y = inp.task.flop / np.mean(res.costs)
-        else:
-            y = 0.0
-        return x, y
+        return x, inp.task.flop
     except Exception:  # pylint: disable=broad-except
         return None
 
@@ -411,19 +444,18 @@ def _extract_knob_feature_index(args):
 
 
 def _extract_knob_feature_log(arg):
-    """extract knob feature for log items"""
+    """extract knob feature and flop (only for valid records) for log items"""
     try:
         inp, res = arg
         config = inp.config
         x = config.get_flatten_feature()
 
+        flop = None
         if res.error_no == 0:
             with inp.target:  # necessary, for calculating flops of this task
                 inp.task.instantiate(config)
-            y = inp.task.flop / np.mean(res.costs)
-        else:
-            y = 0.0
-        return x, y
+            flop = inp.task.flop
+        return x, flop
     except Exception:  # pylint: disable=broad-except
         return None
 
@@ -447,20 +479,15 @@ def _extract_curve_feature_index(args):
 
 
 def _extract_curve_feature_log(arg):
-    """extract sampled curve feature for log items"""
+    """extract sampled curve feature and flop for log items"""
     try:
-        inp, res = arg
+        inp, _ = arg
         config = inp.config
         with inp.target:
             sch, args = inp.task.instantiate(config)
         fea = feature.get_buffer_curve_sample_flatten(sch, args, sample_n=20)
         x = np.concatenate((fea, list(config.get_other_option().values())))
-
-        if res.error_no == 0:
-            y = inp.task.flop / np.mean(res.costs)
-        else:
-            y = 0.0
-        return x, y
+        return x, inp.task.flop
     except Exception:  # pylint: disable=broad-except
         return None
 
@@ -68,6 +68,10 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    feature_cache: FeatureCache, optional
+        The cache of extracted features. Use a PersistentFeatureCache to reuse the
+        features across tuning sessions and concurrent tuning processes.
     """
 
     def __init__(
@@ -80,6 +84,7 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        feature_cache=None,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -87,6 +92,7 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            feature_cache=feature_cache,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
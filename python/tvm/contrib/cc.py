@@ -52,6 +52,82 @@ def create_shared(output, objects, options=None, cc="g++"):
         raise ValueError("Unsupported platform")
 
 
+def compile_objects(sources, options=None, cc="g++", workers=None, cache_dir=None, output_dir=None):
+    """Compile C/C++ sources into position independent objects in parallel.
+
+    Linking the objects instead of the sources lets create_shared skip the
+    compilation, e.g. when a module with many C source modules is exported.
+
+    Parameters
+    ----------
+    sources : List[str]
+        List of source files.
+
+    options : List[str]
+        The list of additional options string.
+
+    cc : Optional[str]
+        The compiler command.
+
+    workers : Optional[int]
+        The number of sources compiled at the same time, the number of CPUs by default.
+
+    cache_dir : Optional[str]
+        A directory to cache the objects in, keyed by the preprocessed source, the
+        compiler and the options, so that unchanged sources are not compiled again.
+
+    output_dir : Optional[str]
+        The directory of the objects, the directory of each source by default.
+
+    Returns
+    -------
+    objects : List[str]
+        The objects, in the order of the sources.
+    """
+    # pylint: disable=import-outside-toplevel
+    import hashlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    options = ["-c", "-fPIC"] + (list(options) if options else [])
+    cache = None
+    if cache_dir:
+        from tvm.contrib.file_cache import ModuleCache
+
+        cache = ModuleCache(cache_dir)
+        proc = subprocess.run([cc, "--version"], stdout=subprocess.PIPE, check=True)
+        cc_key = "%s\0%s\0%s\0" % (cc, py_str(proc.stdout), " ".join(options))
+
+    def _compile(index):
+        source = sources[index]
+        if output_dir:
+            name = "%d-%s.o" % (index, os.path.basename(source))
+            output = os.path.join(output_dir, name)
+        else:
+            output = source + ".o"
+        digest = None
+        if cache is not None:
+            # -P leaves out the line markers, which contain the path of the source
+            proc = subprocess.run(
+                [cc, "-E", "-P", source] + options[2:],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                check=False,
+            )
+            if proc.returncode == 0:
+                sha = hashlib.sha256(cc_key.encode("utf-8"))
+                sha.update(proc.stdout)
+                digest = sha.hexdigest()
+                if cache.fetch(digest, ".o", output):
+                    return output
+        _linux_compile(output, source, options, cc)
+        if digest is not None:
+            cache.put(digest, output, ".o")
+        return output
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(_compile, range(len(sources))))
+
+
 def create_executable(output, objects, options=None, cc="g++"):
     """Create executable binary.
 
@@ -0,0 +1,178 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Content-addressed cache of module files shared by processes.
+
+A cache directory keeps files keyed by the sha256 of the content they are derived from,
+e.g. the modules uploaded to an RPC server (see the module_cache_dir option of
+tvm.rpc.Server), the shared libraries linked by tvm.runtime.load_module and the objects
+compiled by tvm.contrib.cc.compile_objects.
+
+The cache is bounded by size and evicts the least recently used files. The modification
+time of a file records when it was last used, so the cache needs no index and is safe to
+use from concurrent processes and threads.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+logger = logging.getLogger("FileCache")
+
+
+def file_digest(data, chunk_size=1 << 22):
+    """Get the hex sha256 digest of a file or a buffer, as used for the cache keys.
+
+    Parameters
+    ----------
+    data : str or bytes-like
+        The path of the file, or the content.
+
+    chunk_size : int, optional
+        The size of the chunks a file is read in.
+
+    Returns
+    -------
+    digest : str
+    """
+    sha = hashlib.sha256()
+    if isinstance(data, str):
+        with open(data, "rb") as in_file:
+            for chunk in iter(lambda: in_file.read(chunk_size), b""):
+                sha.update(chunk)
+    else:
+        sha.update(data)
+    return sha.hexdigest()
+
+
+class ModuleCache(object):
+    """A size-bounded directory of files keyed by content hash, with LRU eviction.
+
+    Parameters
+    ----------
+    path : str
+        The cache directory. It is created if it does not exist.
+
+    max_size : int, optional
+        The maximum total size of the cached files in bytes.
+    """
+
+    def __init__(self, path, max_size=1 << 30):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry(self, digest, suffix):
+        if not digest or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError("Invalid digest %r" % digest)
+        return os.path.join(self.path, digest + suffix)
+
+    def get(self, digest, suffix=""):
+        """Get the path of a cached file and mark it as recently used.
+
+        Parameters
+        ----------
+        digest : str
+            The hex sha256 digest of the content.
+
+        suffix : str, optional
+            Distinguishes the files derived from the same content, e.g. ".tar" for an
+            uploaded archive and ".tar.so" for the library linked from it.
+
+        Returns
+        -------
+        path : Optional[str]
+            The path of the cached file, or None on a miss.
+        """
+        path = self._entry(digest, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, digest, src, suffix=""):
+        """Copy a file into the cache and evict old files if the cache is full.
+
+        Parameters
+        ----------
+        digest : str
+            The hex sha256 digest of the content.
+
+        src : str
+            The file to cache.
+
+        suffix : str, optional
+            See :code:`get`.
+
+        Returns
+        -------
+        path : str
+            The path of the cached file.
+        """
+        path = self._entry(digest, suffix)
+        # copy to a name private to this thread first, so other processes and threads
+        # never see a partial file
+        tmp_path = os.path.join(
+            self.path,
+            ".%s%s.%d.%d.tmp" % (digest, suffix, os.getpid(), threading.get_ident()),
+        )
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """Remove the least recently used files until the cache fits in max_size"""
+        entries = []
+        for name in os.listdir(self.path):
+            if name.startswith("."):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.path, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+                logger.info("Evict %s from module cache", name)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def fetch(self, digest, suffix, target):
+        """Place a copy of a cached file at target, e.g. in the work directory of a session.
+
+        Returns
+        -------
+        hit : bool
+            Whether the file is in the cache.
+        """
+        path = self.get(digest, suffix)
+        if path is None:
+            return False
+        try:
+            # copy instead of linking, as the file may be overwritten in place
+            shutil.copyfile(path, target)
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            return False
+        return True
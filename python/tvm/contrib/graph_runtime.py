@@ -22,6 +22,7 @@ from tvm.rpc import _ffi_api as _rpc_ffi_api
 from tvm.rpc import base as rpc_base
 from tvm._ffi.base import string_types
 from tvm._ffi.runtime_ctypes import TVMContext
+from . import indexed_params
 
 
 def create(graph_json_str, libmod, ctx):
@@ -160,6 +161,7 @@ class GraphModule(object):
         self._get_num_inputs = module["get_num_inputs"]
         self._load_params = module["load_params"]
         self._share_params = module["share_params"]
+        self._indexed_params = None
 
     def set_input(self, key=None, value=None, **params):
         """Set inputs to the module via kwargs
@@ -282,6 +284,42 @@ class GraphModule(object):
         """
         self._load_params(bytearray(params_bytes))
 
+    def load_params_file(self, params, zero_copy=True):
+        """Load parameters from an indexed parameter file without reading it as a whole.
+
+        Only the parameters used by the graph are read. Parameters on the local CPU are
+        bound to the mapped file without a copy, others are copied one at a time.
+
+        Parameters
+        ----------
+        params : str or indexed_params.IndexedParams
+            The path of the file, see :any:`tvm.contrib.indexed_params`.
+
+        zero_copy : bool, optional
+            Whether to bind the parameters on the local CPU to the mapped file. The
+            file then stays mapped as long as this GraphModule, and set_input no longer
+            changes these parameters.
+
+        Returns
+        -------
+        params : indexed_params.IndexedParams
+            The mapped file.
+        """
+        if not isinstance(params, indexed_params.IndexedParams):
+            params = indexed_params.IndexedParams(params)
+        for name in params:
+            val = self._get_input(name)
+            if val is None:
+                # not used by the graph
+                continue
+            if zero_copy and val.ctx.device_type == tvm.cpu().device_type:
+                self.module["set_input_zero_copy"](name, params.ndarray_view(name))
+            else:
+                val.copyfrom(params[name])
+        if zero_copy:
+            self._indexed_params = params
+        return params
+
     def share_params(self, other, params_bytes):
         """Share parameters from pre-existing GraphRuntime instance.
 
@@ -0,0 +1,241 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Indexed parameter files that can be memory mapped.
+
+The blob of relay.save_param_dict has to be read into memory as a whole and is then
+copied into the graph runtime tensor by tensor. An indexed parameter file starts with
+an index of the tensors, followed by their data at aligned offsets, so that it can be
+memory mapped. Each tensor is a view into the mapping: CPU tensors are bound to the
+graph runtime without a copy, tensors on other devices are copied one at a time, and
+tensors not used by the graph are never read.
+
+The layout of the file is
+
+- the magic bytes :code:`b"TVMIPAR\\0"`,
+- the format version and the length of the index, as little endian uint64,
+- the index in json, a list of the name, dtype, shape, offset and size of the tensors,
+- the data of the tensors, at offsets relative to the first aligned offset after the
+  index.
+
+.. code-block:: python
+
+    indexed_params.save_params(lib.get_params(), "deploy.params")
+    gmod = graph_runtime.GraphModule(lib["default"](ctx))
+    gmod.load_params_file("deploy.params")
+"""
+import ctypes
+import json
+import mmap
+import struct
+
+import numpy as np
+
+import tvm._ffi
+from tvm.runtime import ndarray as _nd
+
+MAGIC = b"TVMIPAR\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sQQ")
+
+
+def _align_up(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _as_numpy(value):
+    if isinstance(value, _nd.NDArray):
+        return value.asnumpy()
+    return np.ascontiguousarray(value)
+
+
+def is_indexed_params(data):
+    """Check whether a file or a buffer holds indexed parameters.
+
+    Parameters
+    ----------
+    data : str or bytes-like
+        The path of the file, or its content.
+
+    Returns
+    -------
+    result : bool
+    """
+    if isinstance(data, str):
+        with open(data, "rb") as in_file:
+            data = in_file.read(len(MAGIC))
+    return bytes(data[: len(MAGIC)]) == MAGIC
+
+
+def save_params(params, path, alignment=64):
+    """Save parameters to an indexed parameter file.
+
+    Parameters
+    ----------
+    params : dict of str to NDArray or numpy.ndarray
+        The parameters.
+
+    path : str
+        The path of the file.
+
+    alignment : int, optional
+        The alignment of the tensor data in bytes. The graph runtime requires 64 to
+        bind tensors without a copy.
+    """
+    index = []
+    offset = 0
+    for name in sorted(params):
+        value = params[name]
+        dtype = value.dtype if isinstance(value, _nd.NDArray) else np.asarray(value).dtype
+        shape = [int(x) for x in value.shape]
+        nbytes = int(np.prod(shape, dtype="int64")) * np.dtype(dtype).itemsize
+        index.append(
+            {"name": name, "dtype": str(dtype), "shape": shape, "offset": offset, "nbytes": nbytes}
+        )
+        offset = _align_up(offset + nbytes, alignment)
+
+    index_bytes = json.dumps({"alignment": alignment, "tensors": index}).encode("utf-8")
+    data_start = _align_up(_HEADER.size + len(index_bytes), alignment)
+    with open(path, "wb") as out_file:
+        out_file.write(_HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        out_file.write(index_bytes)
+        for entry in index:
+            out_file.seek(data_start + entry["offset"])
+            # write one tensor at a time to keep the peak memory low
+            out_file.write(_as_numpy(params[entry["name"]]).tobytes())
+        out_file.truncate(data_start + offset)
+
+
+def convert_param_dict(param_bytes, path, alignment=64):
+    """Convert the output of relay.save_param_dict to an indexed parameter file.
+
+    Parameters
+    ----------
+    param_bytes : bytearray or str
+        The serialized parameters, or the path of a file with them.
+
+    path : str
+        The path of the indexed parameter file.
+
+    alignment : int, optional
+        See :code:`save_params`.
+    """
+    if isinstance(param_bytes, str):
+        with open(param_bytes, "rb") as in_file:
+            param_bytes = in_file.read()
+    load_arr = tvm._ffi.get_global_func("tvm.relay._load_param_dict")(bytearray(param_bytes))
+    save_params({v.name: v.array for v in load_arr}, path, alignment)
+
+
+def to_param_dict(path):
+    """Convert an indexed parameter file to the format of relay.save_param_dict.
+
+    Parameters
+    ----------
+    path : str
+        The path of the indexed parameter file.
+
+    Returns
+    -------
+    param_bytes : bytearray
+        The serialized parameters, as accepted by GraphModule.load_params.
+    """
+    args = []
+    with IndexedParams(path) as params:
+        for name in params:
+            args.append(name)
+            args.append(_nd.array(params[name]))
+        return tvm._ffi.get_global_func("tvm.relay._save_param_dict")(*args)
+
+
+class IndexedParams(object):
+    """A memory mapped indexed parameter file.
+
+    The tensors are numpy arrays that view the mapping. The mapping is private, so
+    writes to the arrays do not change the file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the indexed parameter file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as in_file:
+            magic, version, index_len = _HEADER.unpack(in_file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("%s is not an indexed parameter file" % path)
+            if version != VERSION:
+                raise ValueError("Unsupported indexed parameter file version %d" % version)
+            index = json.loads(in_file.read(index_len).decode("utf-8"))
+            self._mmap = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._data_start = _align_up(_HEADER.size + index_len, index["alignment"])
+        self._index = {entry["name"]: entry for entry in index["tensors"]}
+        # the DLTensors of the views given to the graph runtime
+        self._views = []
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def keys(self):
+        return self._index.keys()
+
+    def __getitem__(self, name):
+        """Get a tensor as a numpy array that views the mapping."""
+        entry = self._index[name]
+        return np.frombuffer(
+            self._mmap,
+            dtype=entry["dtype"],
+            count=int(np.prod(entry["shape"], dtype="int64")),
+            offset=self._data_start + entry["offset"],
+        ).reshape(entry["shape"])
+
+    def nbytes(self, name):
+        """Get the size of a tensor in bytes."""
+        return self._index[name]["nbytes"]
+
+    def ndarray_view(self, name):
+        """Get a tensor as a CPU NDArray that views the mapping.
+
+        The NDArray does not own its data, and is only valid while this object is open.
+        """
+        arr = self[name]
+        tvm_arr, shape = _nd.numpyasarray(arr)
+        self._views.append((arr, tvm_arr, shape))
+        # pylint: disable=protected-access
+        return _nd._make_array(ctypes.addressof(tvm_arr), True, False)
+
+    def close(self):
+        """Release the mapping. The tensors and views must not be used afterwards."""
+        self._views = []
+        try:
+            self._mmap.close()
+        except BufferError:
+            # numpy arrays still view the mapping, it is released with them
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
@@ -0,0 +1,337 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A pool of long-lived worker processes that run jobs with per-job timeouts.
+
+Unlike forking a new process for every job, the workers of the pool are reused, so
+the state a job leaves in its worker (e.g. an open RPC session or an imported module)
+is visible to the following jobs running in the same worker. A worker whose job times
+out or crashes is killed and transparently replaced by a fresh one.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger("WorkerPool")
+
+
+def _kill_process_tree(process):
+    """Kill a process and all its children"""
+    if psutil is not None:
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.NoSuchProcess:
+            children = []
+        for child in children:
+            try:
+                child.send_signal(signal.SIGKILL)
+            except psutil.NoSuchProcess:
+                pass
+    process.kill()
+    process.join()
+
+
+def _memory_usage(pid):
+    """Get the resident memory of a process in bytes, or None if it cannot be queried"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.NoSuchProcess:
+            return None
+    try:
+        with open("/proc/%d/statm" % pid) as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _worker_loop(conn, initializer, initargs):
+    """The main loop of a worker process"""
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        func, args, kwargs = job
+        try:
+            ret = (True, func(*args, **kwargs))
+        except Exception as exc:  # pylint: disable=broad-except
+            ret = (False, exc)
+        try:
+            conn.send(ret)
+        except Exception as exc:  # pylint: disable=broad-except
+            # the result or the exception cannot be pickled
+            conn.send((False, RuntimeError("Cannot send the result of the job: %s" % exc)))
+
+
+class WorkerFuture(object):
+    """The future of a job submitted to a WorkerPool"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        """Whether the job is finished"""
+        return self._event.is_set()
+
+    def add_done_callback(self, callback):
+        """Call `callback(future)` when the job is finished, or now if it is finished.
+
+        The callback runs in a thread of the pool, so it should return quickly.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def get(self, timeout=None):
+        """Get the result of the job.
+
+        Exceptions raised by the job, and a TimeoutError if the job times out,
+        are returned instead of raised.
+
+        Parameters
+        ----------
+        timeout: Optional[float]
+            The time to wait for the job to finish. Raise a TimeoutError if the job is
+            not finished within it.
+
+        Returns
+        -------
+        result: Any
+            The return value of the job, or an exception
+        """
+        if not self._event.wait(timeout):
+            raise TimeoutError("The job is not finished in %s seconds" % timeout)
+        return self._result
+
+    def _set_result(self, result):
+        with self._lock:
+            self._result = result
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error in the callback of a WorkerFuture")
+
+
+def as_completed(futures):
+    """Iterate over futures in the order they finish.
+
+    Parameters
+    ----------
+    futures: List[WorkerFuture]
+        The futures of the jobs.
+
+    Returns
+    -------
+    iterator: Iterator[WorkerFuture]
+        Yields every future once it is finished.
+    """
+    finished = queue.Queue()
+    for future in futures:
+        future.add_done_callback(finished.put)
+    for _ in futures:
+        yield finished.get()
+
+
+class _Worker(object):
+    """A worker process and the connection to it"""
+
+    def __init__(self, initializer, initargs, start_method=None):
+        ctx = multiprocessing.get_context(start_method)
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_loop, args=(child_conn, initializer, initargs), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, func, args, kwargs, timeout):
+        """Run a job in the worker. Return (alive, result)."""
+        try:
+            self.conn.send((func, args, kwargs))
+            if not self.conn.poll(timeout):
+                return False, TimeoutError("The job is not finished in %s seconds" % timeout)
+            _, result = self.conn.recv()
+        except (EOFError, OSError) as exc:
+            return False, ChildProcessError("The worker process exited unexpectedly: %s" % exc)
+        return True, result
+
+    def kill(self):
+        _kill_process_tree(self.process)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (EOFError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class WorkerPool(object):
+    """A pool of long-lived worker processes that run jobs with per-job timeouts.
+
+    Every worker runs one job at a time. A worker that times out or crashes is killed
+    together with its child processes, and a new worker is started for the next job.
+    A worker whose memory grows beyond `max_memory`, e.g. because of the caches of the
+    compiler, is replaced after its job in the same way.
+
+    Parameters
+    ----------
+    num_workers: int
+        The number of worker processes.
+    initializer: Optional[Callable]
+        If not None, every worker process calls `initializer(*initargs)` when it starts.
+    initargs: Tuple
+        The arguments of `initializer`.
+    max_memory: Optional[int]
+        If not None, a worker whose resident memory exceeds this number of bytes after a
+        job is stopped and replaced.
+    start_method: Optional[str]
+        The multiprocessing start method of the workers, e.g. "forkserver" to start them
+        from a clean process instead of forking the current one, which may hold threads
+        or the state of runtimes that do not support fork. None uses the default method.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with WorkerPool(4) as pool:
+            futures = [pool.submit(func, (x,), timeout=10) for x in inputs]
+            results = [f.get() for f in futures]
+    """
+
+    def __init__(
+        self, num_workers, initializer=None, initargs=(), max_memory=None, start_method=None
+    ):
+        assert num_workers > 0, "num_workers must be positive"
+        self.num_workers = num_workers
+        self.max_memory = max_memory
+        self.start_method = start_method
+        self._initializer = initializer
+        self._initargs = initargs
+        self._jobs = queue.Queue()
+        self._threads = []
+        for _ in range(num_workers):
+            thread = threading.Thread(target=self._manage_worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
+
+    def submit(self, func, args=(), kwargs=None, timeout=None):
+        """Submit a job to the pool.
+
+        Parameters
+        ----------
+        func: Callable
+            The function to run. It must be picklable, e.g. a module-level function.
+        args: Tuple
+            The positional arguments of `func`. They must be picklable.
+        kwargs: Optional[Dict]
+            The keyword arguments of `func`. They must be picklable.
+        timeout: Optional[float]
+            The time limit of the job in seconds, counted from the time a worker starts
+            to run it. None means no limit.
+
+        Returns
+        -------
+        future: WorkerFuture
+            The future of the job
+        """
+        if not self._threads:
+            raise RuntimeError("Cannot submit jobs to a closed WorkerPool")
+        future = WorkerFuture()
+        self._jobs.put((func, args, kwargs or {}, timeout, future))
+        return future
+
+    def map(self, func, iterable, timeout=None):
+        """Run `func` on every element of `iterable` in the pool.
+
+        Returns the list of results, in which the exceptions and timeouts are returned as
+        in :code:`WorkerFuture.get`.
+        """
+        futures = [self.submit(func, (x,), timeout=timeout) for x in iterable]
+        return [future.get() for future in futures]
+
+    def close(self):
+        """Stop all workers after the submitted jobs are finished"""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _manage_worker(self):
+        """The loop of a thread in the parent process that feeds one worker"""
+        worker = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            func, args, kwargs, timeout, future = job
+            if worker is None:
+                try:
+                    worker = _Worker(self._initializer, self._initargs, self.start_method)
+                except Exception as exc:  # pylint: disable=broad-except
+                    future._set_result(exc)
+                    continue
+            try:
+                alive, result = worker.run(func, args, kwargs, timeout)
+            except Exception as exc:  # pylint: disable=broad-except
+                # e.g. the job cannot be pickled
+                alive, result = True, exc
+            if not alive:
+                logger.debug("Restart a worker: %s", result)
+                worker.kill()
+                worker = None
+            elif self.max_memory is not None:
+                memory = _memory_usage(worker.process.pid)
+                if memory is not None and memory > self.max_memory:
+                    logger.debug("Restart a worker using %d bytes of memory", memory)
+                    worker.stop()
+                    worker = None
+            future._set_result(result)
+        if worker is not None:
+            worker.stop()
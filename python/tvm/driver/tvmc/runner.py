@@ -28,6 +28,7 @@ import tvm
 from tvm import rpc
 from tvm.autotvm.measure import request_remote
 from tvm.contrib import graph_runtime as runtime
+from tvm.contrib import indexed_params
 from tvm.contrib.debugger import debug_runtime
 
 from . import common
@@ -150,8 +151,8 @@ def get_input_info(graph_str, params):
     ----------
     graph_str : str
         JSON graph of the module serialized as a string.
-    params : bytearray
-        Params serialized as a bytearray.
+    params : bytearray or indexed_params.IndexedParams
+        Params serialized as a bytearray, or an indexed parameter file.
 
     Returns
     -------
@@ -163,9 +164,12 @@ def get_input_info(graph_str, params):
 
     shape_dict = {}
     dtype_dict = {}
-    # Use a special function to load the binary params back into a dict
-    load_arr = tvm.get_global_func("tvm.relay._load_param_dict")(params)
-    param_names = [v.name for v in load_arr]
+    if isinstance(params, indexed_params.IndexedParams):
+        param_names = list(params.keys())
+    else:
+        # Use a special function to load the binary params back into a dict
+        load_arr = tvm.get_global_func("tvm.relay._load_param_dict")(params)
+        param_names = [v.name for v in load_arr]
     graph = json.loads(graph_str)
     for node_id in graph["arg_nodes"]:
         node = graph["nodes"][node_id]
@@ -341,7 +345,12 @@ def run_module(
         t = tarfile.open(module_file)
         t.extractall(tmp_dir)
         graph = open(os.path.join(tmp_dir, "mod.json")).read()
-        params = bytearray(open(os.path.join(tmp_dir, "mod.params"), "rb").read())
+        params_path = os.path.join(tmp_dir, "mod.params")
+        if indexed_params.is_indexed_params(params_path):
+            # map the parameters instead of reading them as a whole
+            params = indexed_params.IndexedParams(params_path)
+        else:
+            params = bytearray(open(params_path, "rb").read())
 
         if hostname:
             # Remote RPC
@@ -356,7 +365,7 @@ def run_module(
             logger.debug("running a local session")
             session = rpc.LocalSession()
 
-        session.upload(os.path.join(tmp_dir, "mod.so"))
+        session.upload(os.path.join(tmp_dir, "mod.so"), use_cache=True)
         lib = session.load_module("mod.so")
 
         # TODO expand to other supported devices, as listed in tvm.rpc.client (@leandron)
@@ -377,7 +386,10 @@ def run_module(
             module = runtime.create(graph, lib, ctx)
 
         logger.debug("load params into the runtime module")
-        module.load_params(params)
+        if isinstance(params, indexed_params.IndexedParams):
+            module.load_params_file(params)
+        else:
+            module.load_params(params)
 
         shape_dict, dtype_dict = get_input_info(graph, params)
         inputs_dict = make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode)
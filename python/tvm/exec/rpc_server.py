@@ -51,6 +51,10 @@ def main(args):
         load_library=args.load_library,
         custom_addr=args.custom_addr,
         silent=args.silent,
+        num_slots=args.num_slots,
+        slot_cpus=args.slot_cpus,
+        module_cache_dir=args.module_cache_dir,
+        module_cache_size=args.module_cache_size,
     )
     server.proc.join()
 
@@ -81,6 +85,30 @@ if __name__ == "__main__":
     parser.add_argument(
         "--custom-addr", type=str, help="Custom IP Address to Report to RPC Tracker"
     )
+    parser.add_argument(
+        "--num-slots",
+        type=int,
+        default=1,
+        help="The maximum number of sessions served at the same time.",
+    )
+    parser.add_argument(
+        "--slot-cpus",
+        type=str,
+        help="Pin the sessions of every slot to a set of CPUs, "
+        "e.g. 'auto' or '0-15;16-31' for two slots.",
+    )
+    parser.add_argument(
+        "--module-cache-dir",
+        type=str,
+        help="Cache the uploaded modules and the libraries linked from them in this "
+        "directory, shared by all sessions.",
+    )
+    parser.add_argument(
+        "--module-cache-size",
+        type=int,
+        default=1 << 30,
+        help="The maximum size of the module cache in bytes.",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
@@ -27,7 +27,13 @@ from ..rpc.tracker import Tracker
 
 def main(args):
     """Main funciton"""
-    tracker = Tracker(args.host, port=args.port, port_end=args.port_end, silent=args.silent)
+    tracker = Tracker(
+        args.host,
+        port=args.port,
+        port_end=args.port_end,
+        silent=args.silent,
+        scheduler=args.scheduler,
+    )
     tracker.proc.join()
 
 
@@ -45,6 +51,13 @@ if __name__ == "__main__":
                          and ROCM compilers.",
     )
     parser.add_argument("--silent", action="store_true", help="Whether run in silent mode.")
+    parser.add_argument(
+        "--scheduler",
+        type=str,
+        default="priority",
+        choices=["priority", "load_aware"],
+        help="The scheduler that assigns servers to requests.",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
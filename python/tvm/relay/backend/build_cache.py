@@ -0,0 +1,451 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent on-disk cache of the fused functions compiled by relay.build.
+
+Every relay.build lowers and compiles all fused functions of the model again, even if
+the same functions were compiled before, e.g. by a previous CI job or by another variant
+of the same model. Within the scope of a BuildCache, the graph runtime codegen compiles
+every fused function for an llvm target on its own through the cache, and relay.build
+imports the compiled modules into the built library. A hit skips the TOPI compute and
+schedule, the TIR lowering and the LLVM IR generation and optimization of the function.
+
+An entry is found by the structural hash of the function, the target and the
+PassContext. It records the autotvm and auto_scheduler dispatch queries made while
+lowering the function, and keeps one compiled module per answer to these queries. A
+lookup replays the queries on the current dispatch contexts, so a new tuning record
+only invalidates the functions whose workloads it tunes. Two variants of a model that
+differ in one layer share the entries of all other fused functions.
+
+.. code-block:: python
+
+    with BuildCache("~/.cache/tvm/relay_build"):
+        lib = relay.build(mod, target="llvm", params=params)
+"""
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import tvm
+from tvm import autotvm, auto_scheduler
+from tvm.ir.transform import PassContext
+
+logger = logging.getLogger("relay.build_cache")
+
+
+def _autotvm_config(cfg):
+    """A deterministic string of the answer to an autotvm dispatch query"""
+    if cfg.is_fallback:
+        # derived from the workload and the template only
+        return "fallback"
+    return "%s cost=%s" % (cfg, cfg.cost)
+
+
+def _auto_scheduler_config(state):
+    """A deterministic string of the answer to an auto_scheduler dispatch query"""
+    if state is None:
+        return "fallback"
+    return "%d steps\n%s" % (len(state.transform_steps), state)
+
+
+class _AutoTVMQueries(autotvm.task.DispatchContext):
+    """Record the autotvm dispatch queries of lowering a fused function"""
+
+    def __init__(self, queries, configs):
+        super(_AutoTVMQueries, self).__init__()
+        self.queries = queries
+        self.configs = configs
+
+    def query(self, target, workload):
+        cfg = self._old_ctx.query(target, workload)
+        self.queries.append(("autotvm", str(target), workload))
+        self.configs.append(_autotvm_config(cfg))
+        return cfg
+
+    def update(self, target, workload, cfg):
+        self._old_ctx.update(target, workload, cfg)
+
+
+class _AutoSchedulerQueries(auto_scheduler.dispatcher.DispatchContext):
+    """Record the auto_scheduler dispatch queries of lowering a fused function"""
+
+    def __init__(self, queries, configs):
+        super(_AutoSchedulerQueries, self).__init__()
+        self.queries = queries
+        self.configs = configs
+
+    def query(self, target, workload_key, has_complex_op, dag):
+        state = self._old_ctx.query(target, workload_key, has_complex_op, dag)
+        # the dag is only printed by the fallback context
+        args = (workload_key, has_complex_op, str(dag))
+        self.queries.append(("auto_scheduler", str(target), args))
+        self.configs.append(_auto_scheduler_config(state))
+        return state
+
+    def update(self, target, workload_key, state):
+        self._old_ctx.update(target, workload_key, state)
+
+
+def replay_queries(queries):
+    """Answer recorded dispatch queries with the current dispatch contexts.
+
+    Parameters
+    ----------
+    queries : List[Tuple[str, str, tuple]]
+        The recorded queries.
+
+    Returns
+    -------
+    configs : List[str]
+        The deterministic strings of the answers.
+    """
+    configs = []
+    for kind, target, args in queries:
+        target = tvm.target.Target(target)
+        if kind == "autotvm":
+            cfg = autotvm.task.DispatchContext.current.query(target, args)
+            configs.append(_autotvm_config(cfg))
+        else:
+            state = auto_scheduler.DispatchContext.current.query(target, *args)
+            configs.append(_auto_scheduler_config(state))
+    return configs
+
+
+def _pass_context_fingerprint():
+    ctx = PassContext.current()
+    return repr(
+        (
+            int(ctx.opt_level),
+            sorted(str(x) for x in ctx.required_pass),
+            sorted(str(x) for x in ctx.disabled_pass),
+            sorted((str(k), str(v)) for k, v in ctx.config.items()),
+        )
+    )
+
+
+def context_fingerprint():
+    """Get the fingerprint of the current contexts, which is part of every cache key.
+
+    Returns
+    -------
+    fingerprint : str
+        The TVM version and the PassContext.
+    """
+    return "\n".join([tvm.__version__, _pass_context_fingerprint()])
+
+
+def _sha256(texts):
+    sha = hashlib.sha256()
+    for text in texts:
+        sha.update(text.encode("utf-8"))
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def primitive_key(source_func, target, context):
+    """Get the cache key of a fused function.
+
+    Parameters
+    ----------
+    source_func : tvm.relay.Function
+        The primitive function, as in the CCacheKey of the compile engine.
+
+    target : tvm.target.Target
+        The target to compile the function for.
+
+    context : str
+        The fingerprint of the contexts from :code:`context_fingerprint`.
+
+    Returns
+    -------
+    key : str
+        The hex sha256 of the function, the target and the contexts.
+    """
+    return _sha256([context, str(tvm.ir.structural_hash(source_func)), str(target)])
+
+
+class _BuildScope(object):
+    """The fused functions compiled through the cache in one relay.build"""
+
+    def __init__(self, context):
+        self.context = context
+        self.names = {}
+        self.modules = []
+
+
+class BuildCache(object):
+    """An on-disk cache of compiled fused functions, used by relay.build within its scope.
+
+    Every entry is a directory with the source function and the dispatch queries of
+    lowering one fused function, and one subdirectory with the function name and the
+    LLVM IR per answer to the queries. The source function is kept to tell structurally
+    equal functions from hash collisions. The directories are written atomically, so
+    the cache can be shared by concurrent builds.
+
+    Parameters
+    ----------
+    path : str
+        The cache directory. It is created if it does not exist.
+
+    max_size : Optional[int]
+        The maximum total size of the cache in bytes. The least recently used entries
+        are evicted first. None means no limit.
+    """
+
+    current = None
+
+    def __init__(self, path, max_size=None):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._old_cache = None
+        self._local = threading.local()
+        os.makedirs(self.path, exist_ok=True)
+
+    def __enter__(self):
+        self._old_cache = BuildCache.current
+        BuildCache.current = self
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        BuildCache.current = self._old_cache
+
+    def stats(self):
+        """Get the hit and miss statistics of this cache object.
+
+        Every distinct fused function of a build counts once.
+
+        Returns
+        -------
+        stats : Dict[str, Union[int, float]]
+            The numbers of hits, misses and stored functions, and the hit rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    @contextlib.contextmanager
+    def build_scope(self):
+        """Compile the fused functions of the graph runtime codegen through this cache.
+
+        Returns
+        -------
+        modules : List[tvm.runtime.Module]
+            The compiled modules of the cached functions, which the caller imports
+            into the built library.
+        """
+        old_scope = getattr(self._local, "scope", None)
+        scope = _BuildScope(context_fingerprint())
+        self._local.scope = scope
+        try:
+            yield scope.modules
+        finally:
+            self._local.scope = old_scope
+
+    def compile(self, engine, key):
+        """Compile a fused function through the cache.
+
+        Parameters
+        ----------
+        engine : tvm.relay.backend.compile_engine.CompileEngine
+            The compile engine to lower the function with on a miss.
+
+        key : tvm.relay.backend.compile_engine.CCacheKey
+            The function and the target.
+
+        Returns
+        -------
+        func_name : str
+            The name of the compiled function, or an empty string if the function is
+            not cached and is to be lowered as usual.
+        """
+        scope = getattr(self._local, "scope", None)
+        if scope is None or key.target.kind.name != "llvm":
+            return ""
+        if isinstance(autotvm.task.DispatchContext.current, autotvm.task.ApplyGraphBest):
+            # answers the queries by their order, so they cannot be replayed
+            return ""
+        digest = primitive_key(key.source_func, key.target, scope.context)
+        if digest in scope.names:
+            return scope.names[digest]
+
+        cached = self.lookup(digest, key.source_func)
+        if cached is None:
+            queries, configs = [], []
+            with _AutoTVMQueries(queries, configs), _AutoSchedulerQueries(queries, configs):
+                cfunc = engine.lower(key.source_func, key.target)
+            if len(cfunc.funcs.functions) != 1:
+                # e.g. device_copy, which has no function to compile
+                return ""
+            func = list(cfunc.funcs.functions.values())[0]
+            func_name = "%s_%s" % (cfunc.func_name, _sha256([digest] + configs)[:16])
+            func = func.with_attr("global_symbol", func_name)
+            lib = tvm.build(tvm.IRModule({func_name: func}), target=key.target)
+            self.store(digest, key.source_func, queries, configs, func_name, lib)
+        else:
+            func_name, lib = cached
+        scope.names[digest] = func_name
+        scope.modules.append(lib)
+        return func_name
+
+    def lookup(self, key, source_func):
+        """Look up a compiled fused function.
+
+        The dispatch queries of the entry are answered by the current dispatch contexts
+        to find the compiled function.
+
+        Parameters
+        ----------
+        key : str
+            The key from :code:`primitive_key`.
+
+        source_func : tvm.relay.Function
+            The primitive function.
+
+        Returns
+        -------
+        result : Optional[Tuple[str, tvm.runtime.Module]]
+            The function name and the compiled module, or None on a miss.
+        """
+        entry = os.path.join(self.path, key)
+        try:
+            with open(os.path.join(entry, "func.json")) as in_file:
+                cached_func = tvm.ir.load_json(in_file.read())
+            if not tvm.ir.structural_equal(cached_func, source_func):
+                logger.warning("Hash collision of build cache key %s", key)
+                self.misses += 1
+                return None
+            with open(os.path.join(entry, "queries.pkl"), "rb") as in_file:
+                queries = pickle.load(in_file)
+            variant = os.path.join(entry, _sha256(replay_queries(queries)))
+            with open(os.path.join(variant, "name")) as in_file:
+                func_name = in_file.read()
+            lib = tvm.runtime.load_module(os.path.join(variant, "lib.ll"))
+        except (OSError, EOFError, pickle.UnpicklingError, tvm.TVMError):
+            self.misses += 1
+            return None
+        os.utime(entry)
+        self.hits += 1
+        logger.debug("relay.build cache hit %s (%s)", key, func_name)
+        return func_name, lib
+
+    def store(self, key, source_func, queries, configs, func_name, lib):
+        """Store a compiled fused function. Failures to save the module are logged and
+        leave the cache unchanged.
+
+        Parameters
+        ----------
+        key : str
+            The key from :code:`primitive_key`.
+
+        source_func : tvm.relay.Function
+            The primitive function.
+
+        queries : List[Tuple[str, str, tuple]]
+            The dispatch queries of lowering the function.
+
+        configs : List[str]
+            The answers to the queries.
+
+        func_name : str
+            The name of the compiled function.
+
+        lib : tvm.runtime.Module
+            The compiled llvm module.
+        """
+        entry = os.path.join(self.path, key)
+
+        def write_entry(tmp_dir):
+            with open(os.path.join(tmp_dir, "func.json"), "w") as out_file:
+                out_file.write(tvm.ir.save_json(source_func))
+            with open(os.path.join(tmp_dir, "queries.pkl"), "wb") as out_file:
+                pickle.dump(queries, out_file)
+
+        def write_variant(tmp_dir):
+            with open(os.path.join(tmp_dir, "name"), "w") as out_file:
+                out_file.write(func_name)
+            lib.save(os.path.join(tmp_dir, "lib.ll"))
+
+        try:
+            if not os.path.isdir(entry):
+                try:
+                    _write_dir(self.path, key, write_entry)
+                except OSError:
+                    # the entry may have been stored by a concurrent build
+                    if not os.path.isdir(entry):
+                        raise
+            _write_dir(entry, _sha256(configs), write_variant)
+        except (OSError, tvm.TVMError) as err:
+            logger.debug("Cannot store fused function %s: %s", key, err)
+            return
+        self.stores += 1
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_size"""
+        if self.max_size is None:
+            return
+        entries = []
+        for name in os.listdir(self.path):
+            entry = os.path.join(self.path, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(root, x))
+                    for root, _, files in os.walk(entry)
+                    for x in files
+                )
+                entries.append((os.stat(entry).st_mtime, size, entry))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def _write_dir(parent, name, write):
+    """Write a directory with write(tmp_dir) and rename it to parent/name atomically"""
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        write(tmp_dir)
+        os.rename(tmp_dir, os.path.join(parent, name))
+    except (OSError, tvm.TVMError):
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+@tvm._ffi.register_func("relay.backend.build_cache.compile")
+def _compile(engine, key):
+    """Called by the graph runtime codegen for every fused function"""
+    cache = BuildCache.current
+    if cache is None:
+        return ""
+    return cache.compile(engine, key)
@@ -19,6 +19,8 @@
 from __future__ import absolute_import
 
 import logging
+from collections import OrderedDict
+
 import numpy as np
 import tvm
 from tvm import te, autotvm
@@ -149,6 +151,51 @@ def get_valid_implementations(op, attrs, inputs, out_type, target):
     return ret
 
 
+def _select_cache_key(op, attrs, inputs, out_type, target, all_impls):
+    """Get the key of a selection in _SELECT_CACHE, or None if it must not be cached."""
+    env = autotvm.task.TaskExtractEnv.current
+    if env is not None and env.tracing:
+        # task extraction relies on the compute of every implementation
+        return None
+    shapes = []
+    for tensor in inputs:
+        if not all(isinstance(dim, tvm.tir.IntImm) for dim in tensor.shape):
+            return None
+        shapes.append((tuple(int(dim) for dim in tensor.shape), tensor.dtype))
+    attrs_hash = tvm.ir.structural_hash(attrs) if attrs is not None else 0
+    impls = tuple((impl.name, int(impl.plevel)) for impl in all_impls)
+    return (op.name, attrs_hash, tuple(shapes), str(out_type), str(target), impls)
+
+
+# The autotvm workloads of all valid implementations of a selection, so that selecting the
+# same op again only computes the chosen implementation. The dispatch context is queried
+# again on every selection, so a cached entry stays valid when the tuning records change.
+_SELECT_CACHE = OrderedDict()
+_SELECT_CACHE_SIZE = 4096
+_SELECT_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def select_implementation_cache_stats():
+    """Get the hit statistics of the cache of select_implementation.
+
+    Returns
+    -------
+    stats : Dict[str, Union[int, float]]
+        The numbers of hits and misses, and the hit rate.
+    """
+    stats = dict(_SELECT_CACHE_STATS)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / total if total else 0.0
+    return stats
+
+
+def clear_select_implementation_cache():
+    """Clear the cache of select_implementation and its statistics."""
+    _SELECT_CACHE.clear()
+    _SELECT_CACHE_STATS["hits"] = 0
+    _SELECT_CACHE_STATS["misses"] = 0
+
+
 def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True):
     """Select the best implementation from the op strategy.
 
@@ -159,6 +206,10 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
     If use_autotvm is False, it'll directly choose the implementation with
     highest plevel.
 
+    The autotvm workloads of the implementations are cached, so that the same
+    op with the same attributes and input types only computes the chosen
+    implementation the next time. See select_implementation_cache_stats.
+
     Note that this function doesn't support op with symbolic input shapes.
 
     Parameters
@@ -206,18 +257,34 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
         return best_plevel_impl, outs
 
     # Otherwise, try autotvm templates
+    key = _select_cache_key(op, attrs, inputs, out_type, target, all_impls)
+    cached = _SELECT_CACHE.get(key) if key is not None else None
+    if cached is not None and not tvm.ir.structural_equal(cached[0], attrs):
+        cached = None
     outputs = {}
-    workloads = {}
+    old_silent = autotvm.GLOBAL_SCOPE.silent
+    autotvm.GLOBAL_SCOPE.silent = True
+    if cached is not None:
+        _SELECT_CACHE_STATS["hits"] += 1
+        _SELECT_CACHE.move_to_end(key)
+        workloads = dict(zip(all_impls, cached[1]))
+    else:
+        workloads = {}
+        for impl in all_impls:
+            outs = impl.compute(attrs, inputs, out_type)
+            outputs[impl] = outs
+            workloads[impl] = autotvm.task.get_workload(outs)
+        if key is not None:
+            _SELECT_CACHE_STATS["misses"] += 1
+            _SELECT_CACHE[key] = (attrs, [workloads[impl] for impl in all_impls])
+            if len(_SELECT_CACHE) > _SELECT_CACHE_SIZE:
+                _SELECT_CACHE.popitem(last=False)
+
     best_autotvm_impl = None
     best_cfg = None
     dispatch_ctx = autotvm.task.DispatchContext.current
-    old_silent = autotvm.GLOBAL_SCOPE.silent
-    autotvm.GLOBAL_SCOPE.silent = True
     for impl in all_impls:
-        outs = impl.compute(attrs, inputs, out_type)
-        outputs[impl] = outs
-        workload = autotvm.task.get_workload(outs)
-        workloads[impl] = workload
+        workload = workloads[impl]
         if workload is None:
             # Not an AutoTVM tunable implementation
             continue
@@ -229,6 +296,10 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
         if best_cfg is None or best_cfg.cost > cfg.cost:
             best_autotvm_impl = impl
             best_cfg = cfg
+
+    best_impl = best_autotvm_impl if best_autotvm_impl else best_plevel_impl
+    if best_impl not in outputs:
+        outputs[best_impl] = best_impl.compute(attrs, inputs, out_type)
     autotvm.GLOBAL_SCOPE.silent = old_silent
 
     if best_autotvm_impl:
@@ -33,6 +33,7 @@ from . import ty as _ty
 from . import expr as _expr
 from . import function as _function
 from .transform import InferType
+from .backend import build_cache as _build_cache
 from .backend import graph_runtime_factory as _graph_runtime_factory
 from .backend import interpreter as _interpreter
 from .backend.vm import VMExecutor
@@ -307,8 +308,16 @@ def build(mod, target=None, target_host=None, params=None, mod_name="default"):
 
     with tophub_context:
         bld_mod = BuildModule()
-        graph_json, mod, params = bld_mod.build(mod, target, target_host, params)
-        mod = _graph_runtime_factory.GraphRuntimeFactoryModule(graph_json, mod, mod_name, params)
+        # Within the scope of a BuildCache, the fused functions are compiled through it
+        build_cache = _build_cache.BuildCache.current
+        if build_cache is None:
+            graph_json, lib, params = bld_mod.build(mod, target, target_host, params)
+        else:
+            with build_cache.build_scope() as cached_libs:
+                graph_json, lib, params = bld_mod.build(mod, target, target_host, params)
+            for cached_lib in cached_libs:
+                lib.import_module(cached_lib)
+        mod = _graph_runtime_factory.GraphRuntimeFactoryModule(graph_json, lib, mod_name, params)
         return mod
 
 
@@ -15,7 +15,9 @@
 # specific language governing permissions and limitations
 # under the License.
 """RPC client tools"""
+import mmap
 import os
+import shutil
 import stat
 import socket
 import struct
@@ -23,6 +25,7 @@ import time
 
 import tvm._ffi
 from tvm.contrib import utils
+from tvm.contrib.file_cache import file_digest
 from tvm._ffi.base import TVMError
 from tvm.runtime import ndarray as nd
 
@@ -92,7 +95,30 @@ class RPCSession(object):
         ctx._rpc_sess = self
         return ctx
 
-    def upload(self, data, target=None):
+    def _server_func(self, name):
+        """Get a cached function of the RPC server environment. A function that the
+        server does not have is remembered, and raises AttributeError without another
+        round-trip."""
+        if name not in self._remote_funcs:
+            try:
+                self._remote_funcs[name] = self.get_function("tvm.rpc.server." + name)
+            except AttributeError:
+                self._remote_funcs[name] = None
+                raise
+        func = self._remote_funcs[name]
+        if func is None:
+            raise AttributeError("The RPC server has no function tvm.rpc.server." + name)
+        return func
+
+    def upload(
+        self,
+        data,
+        target=None,
+        chunk_size=1 << 22,
+        progress_callback=None,
+        resume=False,
+        use_cache=False,
+    ):
         """Upload file to remote runtime temp folder
 
         Parameters
@@ -102,19 +128,98 @@ class RPCSession(object):
 
         target : str, optional
             The path in remote
+
+        chunk_size : int, optional
+            Data larger than this is sent in chunks of this size, which bounds the memory
+            used on both sides. Local files are memory-mapped instead of read into memory.
+
+        progress_callback : Callable[[int, int], None], optional
+            Called with the number of bytes sent so far and the total after every chunk.
+
+        resume : bool, optional
+            Continue an interrupted upload, e.g. after a dropped connection, from the size
+            of the partial file on the remote. This requires the partial file to be kept,
+            e.g. by a server with a persistent work directory, and to be a prefix of data.
+
+        use_cache : bool, optional
+            Send the content hash first and only upload the data if the server does not
+            have it in its module cache, see the module_cache_dir option of
+            :code:`rpc.Server`. Falls back to a normal upload if the server has no cache.
         """
         if isinstance(data, bytearray):
             if not target:
                 raise ValueError("target must present when file is a bytearray")
-            blob = data
-        else:
-            blob = bytearray(open(data, "rb").read())
-            if not target:
-                target = os.path.basename(data)
+        elif not target:
+            target = os.path.basename(data)
 
-        if "upload" not in self._remote_funcs:
-            self._remote_funcs["upload"] = self.get_function("tvm.rpc.server.upload")
-        self._remote_funcs["upload"](target, blob)
+        digest = None
+        if use_cache:
+            try:
+                cache_fetch = self._server_func("cache_fetch")
+            except AttributeError:
+                # the server has no module cache
+                cache_fetch = None
+            if cache_fetch is not None:
+                digest = file_digest(data)
+                if cache_fetch(digest, target):
+                    if progress_callback:
+                        size = len(data) if isinstance(data, bytearray) else os.path.getsize(data)
+                        progress_callback(size, size)
+                    return
+
+        self._upload_data(data, target, chunk_size, progress_callback, resume)
+        if digest is not None:
+            self._server_func("cache_store")(digest, target)
+
+    def _upload_data(self, data, target, chunk_size, progress_callback, resume):
+        """Upload a bytearray or the content of a local file"""
+        if isinstance(data, bytearray):
+            self._upload_blob(data, target, chunk_size, progress_callback, resume)
+            return
+
+        with open(data, "rb") as local_file:
+            if os.fstat(local_file.fileno()).st_size == 0:
+                # empty files cannot be memory-mapped
+                self._upload_blob(bytearray(), target, chunk_size, progress_callback, resume)
+                return
+            with mmap.mmap(local_file.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+                self._upload_blob(blob, target, chunk_size, progress_callback, resume)
+
+    def _upload_blob(self, blob, target, chunk_size, progress_callback, resume):
+        """Upload a bytearray or a mmap object, in chunks if it is large"""
+        total = len(blob)
+        upload_chunk = None
+        if total > chunk_size or resume:
+            try:
+                upload_chunk = self._server_func("upload_chunk")
+            except AttributeError:
+                # the remote does not support chunked upload
+                pass
+
+        if upload_chunk is None:
+            if not isinstance(blob, bytearray):
+                blob = bytearray(blob)
+            self._server_func("upload")(target, blob)
+            if progress_callback:
+                progress_callback(total, total)
+            return
+
+        offset = 0
+        if resume:
+            offset = self._server_func("file_size")(target)
+            if offset < 0 or offset > total:
+                offset = 0
+        view = memoryview(blob)
+        try:
+            if offset == total == 0:
+                upload_chunk(target, 0, bytearray())
+            while offset < total:
+                end = min(offset + chunk_size, total)
+                offset = upload_chunk(target, offset, bytearray(view[offset:end]))
+                if progress_callback:
+                    progress_callback(offset, total)
+        finally:
+            view.release()
 
     def download(self, path):
         """Download file from remote temp folder.
@@ -133,6 +238,52 @@ class RPCSession(object):
             self._remote_funcs["download"] = self.get_function("tvm.rpc.server.download")
         return self._remote_funcs["download"](path)
 
+    def download_file(
+        self, path, local_path, chunk_size=1 << 22, progress_callback=None, resume=False
+    ):
+        """Download file from remote temp folder to a local file in chunks.
+
+        Unlike :code:`download`, the file is never held in memory as a whole.
+
+        Parameters
+        ----------
+        path : str
+            The relative location to remote temp folder.
+
+        local_path : str
+            The local file to write to.
+
+        chunk_size : int, optional
+            The size of the chunks.
+
+        progress_callback : Callable[[int, int], None], optional
+            Called with the number of bytes received so far and the total after every chunk.
+
+        resume : bool, optional
+            Continue an interrupted download from the size of the existing local file.
+        """
+        total = self._server_func("file_size")(path)
+        if total < 0:
+            raise RuntimeError("%s does not exist on the remote" % path)
+        download_chunk = self._server_func("download_chunk")
+
+        offset = 0
+        if resume and os.path.isfile(local_path):
+            offset = os.path.getsize(local_path)
+            if offset > total:
+                offset = 0
+        with open(local_path, "r+b" if offset else "wb") as out_file:
+            out_file.seek(offset)
+            out_file.truncate()
+            while offset < total:
+                chunk = download_chunk(path, offset, min(chunk_size, total - offset))
+                if not chunk:
+                    raise RuntimeError("%s is truncated on the remote during download" % path)
+                out_file.write(chunk)
+                offset += len(chunk)
+                if progress_callback:
+                    progress_callback(offset, total)
+
     def remove(self, path):
         """Remove file from remote temp folder.
 
@@ -197,6 +348,92 @@ class RPCSession(object):
             )
         return self._remote_funcs["download_linked_module"](path)
 
+    def supports_time_evaluate_batch(self):
+        """Whether the remote supports :code:`time_evaluate_batch`.
+
+        Returns
+        -------
+        supported : bool
+        """
+        try:
+            self._server_func("time_evaluate_batch")
+        except AttributeError:
+            return False
+        return True
+
+    def time_evaluate_batch(
+        self,
+        files,
+        arg_infos,
+        device,
+        number=1,
+        repeat=1,
+        min_repeat_ms=0,
+        f_preproc="",
+        cooldown_interval=0.0,
+    ):
+        """Benchmark a batch of modules with a single remote call.
+
+        The modules are packed into one archive which is sent together with the call,
+        so the whole batch costs one round-trip instead of an upload, a load, a benchmark
+        and a cleanup for every module. Each module is run with random inputs.
+
+        Parameters
+        ----------
+        files : List[str]
+            The local paths of the exported modules.
+        arg_infos : List[List[Tuple[Tuple[int], str]]]
+            The shapes and dtypes of the arguments of the entry function of every module.
+        device : str
+            The device to run on, e.g. the string of the target.
+        number, repeat, min_repeat_ms, f_preproc :
+            The arguments of time_evaluator.
+        cooldown_interval : float, optional
+            The cool down interval between two modules.
+
+        Returns
+        -------
+        results : List[Dict]
+            For every module, either {"costs": [...]} with the results of time_evaluator,
+            or {"error": message, "stage": stage} where stage is "load" or "run".
+
+        Note
+        ----
+        The remote function is registered by the python RPC server. Raise an AttributeError
+        if the remote does not support it.
+        """
+        # pylint: disable=import-outside-toplevel
+        import json
+        from tvm.contrib import tar as _tar
+
+        if not self.supports_time_evaluate_batch():
+            raise AttributeError("The remote does not support time_evaluate_batch")
+        temp = utils.tempdir()
+        # prefix the index, as the modules of a batch often have the same file name
+        names = ["%d-%s" % (i, os.path.basename(name)) for i, name in enumerate(files)]
+        for name, local_path in zip(names, files):
+            shutil.copyfile(local_path, temp.relpath(name))
+        _tar.tar(temp.relpath("batch.tar"), [temp.relpath(name) for name in names])
+        with open(temp.relpath("batch.tar"), "rb") as in_file:
+            blob = bytearray(in_file.read())
+        temp.remove()
+
+        batch = [
+            {"file": name, "args": [[list(shape), dtype] for shape, dtype in args]}
+            for name, args in zip(names, arg_infos)
+        ]
+        results = self._server_func("time_evaluate_batch")(
+            blob,
+            device,
+            number,
+            repeat,
+            min_repeat_ms,
+            f_preproc,
+            cooldown_interval,
+            json.dumps(batch),
+        )
+        return json.loads(results)
+
     def cpu(self, dev_id=0):
         """Construct CPU device."""
         return self.context(1, dev_id)
@@ -332,7 +569,7 @@ class TrackerSession(object):
             key = item["key"].split(":")[1]  # 'server:rasp3b` -> 'rasp3b'
             if key not in total_ct:
                 total_ct[key] = 0
-            total_ct[key] += 1
+            total_ct[key] += item.get("slots", 1)
         res += "----------------------------\n"
         res += "\n"
 
@@ -360,6 +597,28 @@ class TrackerSession(object):
                     pending,
                 )
         res += separate_line
+
+        server_stats = [item for item in data.get("server_stats", []) if item["connected"]]
+        if server_stats:
+            res += "\n"
+            res += "Server Health\n"
+            title = "server-address\tkey\tactive\tsessions\terrors\tmean-time\tlast-ok\tstatus\n"
+            separate_line = "-" * 80 + "\n"
+            res += separate_line + title + separate_line
+            for item in server_stats:
+                last_ok = item["since_last_success"]
+                res += "%s:%d\t%s\t%d\t%d\t%d\t%.2fs\t%s\t%s\n" % (
+                    item["addr"][0],
+                    item["addr"][1],
+                    item["key"],
+                    item["active"],
+                    item["sessions"],
+                    item["errors"],
+                    item["mean_duration"],
+                    "-" if last_ok is None else "%.0fs ago" % last_ok,
+                    "quarantined" if item["quarantined"] else "ok",
+                )
+            res += separate_line
         return res
 
     def request(self, key, priority=1, session_timeout=0, max_retry=5):
@@ -27,11 +27,13 @@ Server is TCP based with the following protocol:
 # pylint: disable=invalid-name
 import os
 import ctypes
+import json
 import socket
 import select
 import struct
 import logging
 import multiprocessing
+import multiprocessing.connection
 import subprocess
 import time
 import sys
@@ -42,7 +44,9 @@ import tvm._ffi
 from tvm._ffi.base import py_str
 from tvm._ffi.libinfo import find_lib_path
 from tvm.runtime.module import load_module as _load_module
-from tvm.contrib import utils
+from tvm.runtime import ndarray as _nd
+from tvm.contrib import utils, tar as _tar
+from tvm.contrib.file_cache import ModuleCache, file_digest as _file_digest
 from . import _ffi_api
 from . import base
 from .base import TrackerCode
@@ -50,12 +54,71 @@ from .base import TrackerCode
 logger = logging.getLogger("RPCServer")
 
 
-def _server_env(load_library, work_path=None):
+def _link_module(path):
+    """Link an uploaded .o or .tar file into path + ".so", return the path of the library"""
+    # c++ compiler/linker
+    cc = os.environ.get("CXX", "g++")
+
+    # pylint: disable=import-outside-toplevel
+    if path.endswith(".o"):
+        # Extra dependencies during runtime.
+        from tvm.contrib import cc as _cc
+
+        _cc.create_shared(path + ".so", path, cc=cc)
+        path += ".so"
+    elif path.endswith(".tar"):
+        # Extra dependencies during runtime.
+        from tvm.contrib import cc as _cc
+
+        tar_temp = utils.tempdir(custom_path=path.replace(".tar", ""))
+        _tar.untar(path, tar_temp.temp_dir)
+        files = [tar_temp.relpath(x) for x in tar_temp.listdir()]
+        _cc.create_shared(path + ".so", files, cc=cc)
+        path += ".so"
+    elif path.endswith(".dylib") or path.endswith(".so"):
+        pass
+    else:
+        raise RuntimeError("Do not know how to link %s" % path)
+    return path
+
+
+def _server_env(load_library, work_path=None, module_cache=None):
     """Server environment function return temp dir"""
     if work_path:
         temp = work_path
     else:
         temp = utils.tempdir()
+    # file name -> (content digest, mtime) of the files placed in the work path through
+    # module_cache, the mtime tells whether a file is overwritten later in the session
+    digests = {}
+
+    def cached_digest(file_name):
+        digest, mtime = digests.get(file_name, (None, None))
+        try:
+            if digest is not None and os.stat(temp.relpath(file_name)).st_mtime_ns == mtime:
+                return digest
+        except FileNotFoundError:
+            pass
+        digests.pop(file_name, None)
+        return None
+
+    def record_digest(file_name, digest):
+        digests[file_name] = (digest, os.stat(temp.relpath(file_name)).st_mtime_ns)
+
+    def linked_module(file_name):
+        """Link an uploaded file, or get the library linked from the same content before"""
+        path = temp.relpath(file_name)
+        digest = cached_digest(file_name) if path.endswith((".o", ".tar")) else None
+        if digest is None:
+            return _link_module(path)
+        suffix = os.path.splitext(file_name)[1] + ".so"
+        cached = module_cache.get(digest, suffix)
+        if cached is not None:
+            logger.info("Use the cached library of %s", path)
+            return cached
+        path = _link_module(path)
+        module_cache.put(digest, path, suffix)
+        return path
 
     # pylint: disable=unused-variable
     @tvm._ffi.register_func("tvm.rpc.server.workpath", override=True)
@@ -66,6 +129,8 @@ def _server_env(load_library, work_path=None):
     def load_module(file_name):
         """Load module from remote side."""
         path = temp.relpath(file_name)
+        if path.endswith((".o", ".tar")) and cached_digest(file_name):
+            path = linked_module(file_name)
         m = _load_module(path)
         logger.info("load_module %s", path)
         return m
@@ -73,33 +138,50 @@ def _server_env(load_library, work_path=None):
     @tvm._ffi.register_func("tvm.rpc.server.download_linked_module", override=True)
     def download_linked_module(file_name):
         """Load module from remote side."""
-        # c++ compiler/linker
-        cc = os.environ.get("CXX", "g++")
+        path = linked_module(file_name)
+        logger.info("Send linked module %s to client", path)
+        return bytearray(open(path, "rb").read())
 
+    if module_cache is not None:
+
+        @tvm._ffi.register_func("tvm.rpc.server.cache_fetch", override=True)
+        def cache_fetch(digest, file_name):
+            """Place a cached file with the content digest in the work path.
+            Return whether it is cached, the client uploads the file otherwise."""
+            suffix = os.path.splitext(file_name)[1]
+            if not module_cache.fetch(digest, suffix, temp.relpath(file_name)):
+                return False
+            record_digest(file_name, digest)
+            logger.info("Use the cached %s as %s", digest, file_name)
+            return True
+
+        @tvm._ffi.register_func("tvm.rpc.server.cache_store", override=True)
+        def cache_store(digest, file_name):
+            """Add an uploaded file to the cache if it matches the digest."""
+            path = temp.relpath(file_name)
+            if _file_digest(path) != digest:
+                logger.warning("The content of %s does not match its digest", file_name)
+                return False
+            module_cache.put(digest, path, os.path.splitext(file_name)[1])
+            record_digest(file_name, digest)
+            return True
+
+    @tvm._ffi.register_func("tvm.rpc.server.allclose", override=True)
+    def allclose(expected, actual, rtol, atol):
+        """Compare two arrays on the server, so that only the outcome is sent back."""
         # pylint: disable=import-outside-toplevel
-        path = temp.relpath(file_name)
+        import numpy as np
 
-        if path.endswith(".o"):
-            # Extra dependencies during runtime.
-            from tvm.contrib import cc as _cc
-
-            _cc.create_shared(path + ".so", path, cc=cc)
-            path += ".so"
-        elif path.endswith(".tar"):
-            # Extra dependencies during runtime.
-            from tvm.contrib import cc as _cc, tar as _tar
-
-            tar_temp = utils.tempdir(custom_path=path.replace(".tar", ""))
-            _tar.untar(path, tar_temp.temp_dir)
-            files = [tar_temp.relpath(x) for x in tar_temp.listdir()]
-            _cc.create_shared(path + ".so", files, cc=cc)
-            path += ".so"
-        elif path.endswith(".dylib") or path.endswith(".so"):
-            pass
-        else:
-            raise RuntimeError("Do not know how to link %s" % file_name)
-        logger.info("Send linked module %s to client", path)
-        return bytearray(open(path, "rb").read())
+        return bool(np.allclose(expected.asnumpy(), actual.asnumpy(), rtol=rtol, atol=atol))
+
+    @tvm._ffi.register_func("tvm.rpc.server.time_evaluate_batch", override=True)
+    def time_evaluate_batch(
+        archive, device, number, repeat, min_repeat_ms, f_preproc, cooldown_interval, batch
+    ):
+        """Benchmark all modules in an archive sent by the client in one call."""
+        return _time_evaluate_batch(
+            archive, device, number, repeat, min_repeat_ms, f_preproc, cooldown_interval, batch
+        )
 
     libs = []
     load_library = load_library.split(":") if load_library else []
@@ -111,10 +193,80 @@ def _server_env(load_library, work_path=None):
     return temp
 
 
-def _serve_loop(sock, addr, load_library, work_path=None):
+def _time_evaluate_batch(
+    archive, device, number, repeat, min_repeat_ms, f_preproc, cooldown_interval, batch
+):
+    """Load and benchmark the modules packed in a tar archive one by one.
+
+    Parameters
+    ----------
+    archive : bytearray
+        The tar archive of the module files.
+    device : str
+        The device to run on, e.g. the string of the target.
+    number, repeat, min_repeat_ms, f_preproc :
+        The arguments of time_evaluator.
+    cooldown_interval : float
+        The cool down interval between two modules.
+    batch : str
+        JSON list of {"file": file name in the archive, "args": [[shape, dtype], ...]}
+
+    Returns
+    -------
+    results : str
+        JSON list with one {"costs": [...]} or {"error": message, "stage": "load" or "run"}
+        for every module of the batch.
+    """
+    batch = json.loads(batch)
+    ctx = _nd.context(device, 0)
+    random_fill = tvm._ffi.get_global_func("tvm.contrib.random.random_fill", allow_missing=True)
+    temp = utils.tempdir()
+    results = []
+    try:
+        with open(temp.relpath("batch.tar"), "wb") as out_file:
+            out_file.write(archive)
+        _tar.untar(temp.relpath("batch.tar"), temp.temp_dir)
+
+        for item in batch:
+            try:
+                mod = _load_module(temp.relpath(item["file"]))
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append({"error": str(exc), "stage": "load"})
+                continue
+            try:
+                if random_fill is None:
+                    raise RuntimeError(
+                        "Please make sure USE_RANDOM is ON in the config.cmake "
+                        "on the remote devices"
+                    )
+                time_f = mod.time_evaluator(
+                    mod.entry_name,
+                    ctx,
+                    number=number,
+                    repeat=repeat,
+                    min_repeat_ms=min_repeat_ms,
+                    f_preproc=f_preproc,
+                )
+                args = [_nd.empty(shape, dtype, ctx) for shape, dtype in item["args"]]
+                for arg in args:
+                    random_fill(arg)
+                ctx.sync()
+                results.append({"costs": list(time_f(*args).results)})
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append({"error": str(exc), "stage": "run"})
+            time.sleep(cooldown_interval)
+    finally:
+        temp.remove()
+    logger.info("time_evaluate_batch of %d modules", len(results))
+    return json.dumps(results)
+
+
+def _serve_loop(sock, addr, load_library, work_path=None, cpus=None, module_cache=None):
     """Server loop"""
+    if cpus:
+        os.sched_setaffinity(0, cpus)
     sockfd = sock.fileno()
-    temp = _server_env(load_library, work_path)
+    temp = _server_env(load_library, work_path, module_cache)
     _ffi_api.ServerLoop(sockfd)
     if not work_path:
         temp.remove()
@@ -130,59 +282,179 @@ def _parse_server_opt(opts):
     return ret
 
 
-def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
-    """Listening loop of the server."""
-
-    def _accept_conn(listen_sock, tracker_conn, ping_period=2):
-        """Accept connection from the other places.
+def _parse_slot_cpus(slot_cpus, num_slots):
+    """Get the list of CPUs of every slot.
 
-        Parameters
-        ----------
-        listen_sock: Socket
-            The socket used by listening process.
+    Parameters
+    ----------
+    slot_cpus : Optional[Union[str, List[List[int]]]]
+        None for no pinning, "auto" to split the CPUs of this process evenly,
+        a list with the CPUs of every slot, or the same list in string form,
+        e.g. "0-15;16-31" where slots are separated by ";".
+    num_slots : int
+        The number of slots
+
+    Returns
+    -------
+    cpus : Optional[List[List[int]]]
+    """
+    if slot_cpus is None:
+        return None
+    if slot_cpus == "auto":
+        if hasattr(os, "sched_getaffinity"):
+            all_cpus = sorted(os.sched_getaffinity(0))
+        else:
+            all_cpus = list(range(multiprocessing.cpu_count()))
+        size = max(len(all_cpus) // num_slots, 1)
+        begins = [(i * size) % len(all_cpus) for i in range(num_slots)]
+        return [all_cpus[begin : begin + size] for begin in begins]
+    if isinstance(slot_cpus, str):
+        groups = []
+        for group in slot_cpus.split(";"):
+            cpus = []
+            for item in group.split(","):
+                if "-" in item:
+                    first, last = item.split("-")
+                    cpus += list(range(int(first), int(last) + 1))
+                else:
+                    cpus.append(int(item))
+            groups.append(cpus)
+        slot_cpus = groups
+    if len(slot_cpus) != num_slots:
+        raise ValueError("Expect the CPUs of %d slots, but got %d" % (num_slots, len(slot_cpus)))
+    return [list(cpus) for cpus in slot_cpus]
+
+
+def _kill_session(server_proc):
+    """Kill the process of a session and its children"""
+    # pylint: disable=import-outside-toplevel
+    import psutil
+
+    parent = psutil.Process(server_proc.pid)
+    # terminate worker childs
+    for child in parent.children(recursive=True):
+        child.terminate()
+    # terminate the worker
+    server_proc.terminate()
+
+
+def _listen_loop(
+    sock,
+    port,
+    rpc_key,
+    tracker_addr,
+    load_library,
+    custom_addr,
+    num_slots=1,
+    slot_cpus=None,
+    module_cache=None,
+):
+    """Listening loop of the server.
+
+    The server serves up to `num_slots` sessions at the same time, each in its own process
+    and work directory. Every free slot is reported to the tracker with its own match key,
+    so the tracker hands out slots instead of whole servers.
+    """
+    ping_period = 2
+    unmatch_timeout = 4
+    tracker_conn = None
+    # slot -> (process, work path, start time, deadline) of the running sessions
+    sessions = {}
+    # outcomes of the finished sessions to report to tracker
+    reports = []
+    # match key reported to tracker -> [slot, number of pings in which it is acquired but not used]
+    matchkeys = {}
+    old_keyset = set()
+    reported_free = None
+    last_ping = time.time()
 
-        tracker_conn : connnection to tracker
-            Tracker connection
+    while True:
+        # step 1: clean up the finished and timed out sessions
+        for slot, (server_proc, work_path, start, deadline) in list(sessions.items()):
+            if server_proc.is_alive():
+                if deadline is None or time.time() < deadline:
+                    continue
+                logger.info("Timeout in RPC session, kill..")
+                _kill_session(server_proc)
+                status = "timeout"
+            else:
+                status = "ok" if server_proc.exitcode == 0 else "error"
+            server_proc.join()
+            work_path.remove()
+            del sessions[slot]
+            if tracker_addr:
+                reports.append({"status": status, "duration": time.time() - start})
 
-        ping_period : float, optional
-            ping tracker every k seconds if no connection is accepted.
-        """
-        old_keyset = set()
-        # Report resource to tracker
-        if tracker_conn:
-            matchkey = base.random_key(rpc_key + ":")
-            base.sendjson(tracker_conn, [TrackerCode.PUT, rpc_key, (port, matchkey), custom_addr])
-            assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
-        else:
-            matchkey = rpc_key
+        try:
+            # step 2: setup tracker and report the free slots to tracker
+            if tracker_addr and tracker_conn is None:
+                tracker_conn = base.connect_with_retry(tracker_addr)
+                tracker_conn.sendall(struct.pack("<i", base.RPC_TRACKER_MAGIC))
+                magic = struct.unpack("<i", base.recvall(tracker_conn, 4))[0]
+                if magic != base.RPC_TRACKER_MAGIC:
+                    raise RuntimeError("%s is not RPC Tracker" % str(tracker_addr))
+                matchkeys = {}
+                reported_free = None
 
-        unmatch_period_count = 0
-        unmatch_timeout = 4
-        # Wait until we get a valid connection
-        while True:
             if tracker_conn:
-                trigger = select.select([listen_sock], [], [], ping_period)
-                if not listen_sock in trigger[0]:
-                    base.sendjson(tracker_conn, [TrackerCode.GET_PENDING_MATCHKEYS])
-                    pending_keys = base.recvjson(tracker_conn)
+                # report the finished sessions before putting their slots back
+                while reports:
+                    base.sendjson(tracker_conn, [TrackerCode.REPORT, reports.pop(0)])
+                    assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
+                num_free = num_slots - len(sessions)
+                if num_free != reported_free:
+                    # report status of current queue
+                    cinfo = {"key": "server:" + rpc_key, "slots": num_slots, "free_slots": num_free}
+                    base.sendjson(tracker_conn, [TrackerCode.UPDATE_INFO, cinfo])
+                    assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
+                    reported_free = num_free
+                reported = set(item[0] for item in matchkeys.values())
+                for slot in range(num_slots):
+                    if slot in sessions or slot in reported:
+                        continue
+                    matchkey = base.random_key(rpc_key + ":", old_keyset)
                     old_keyset.add(matchkey)
+                    base.sendjson(
+                        tracker_conn, [TrackerCode.PUT, rpc_key, (port, matchkey), custom_addr]
+                    )
+                    assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
+                    matchkeys[matchkey] = [slot, 0]
+
+            # step 3: wait for in-coming connections or finished sessions
+            waits = [server_proc.sentinel for server_proc, _, _, _ in sessions.values()]
+            if len(sessions) < num_slots:
+                waits.append(sock)
+            wait_time = ping_period
+            for _, _, _, deadline in sessions.values():
+                if deadline is not None:
+                    wait_time = max(min(wait_time, deadline - time.time()), 0)
+            ready = multiprocessing.connection.wait(waits, wait_time)
+
+            if tracker_conn and time.time() - last_ping >= ping_period:
+                last_ping = time.time()
+                base.sendjson(tracker_conn, [TrackerCode.GET_PENDING_MATCHKEYS])
+                pending_keys = base.recvjson(tracker_conn)
+                for matchkey, item in list(matchkeys.items()):
                     # if match key not in pending key set
                     # it means the key is acquired by a client but not used.
-                    if matchkey not in pending_keys:
-                        unmatch_period_count += 1
-                    else:
-                        unmatch_period_count = 0
+                    item[1] = 0 if matchkey in pending_keys else item[1] + 1
                     # regenerate match key if key is acquired but not used for a while
-                    if unmatch_period_count * ping_period > unmatch_timeout + ping_period:
+                    if item[1] * ping_period > unmatch_timeout + ping_period:
                         logger.info("no incoming connections, regenerate key ...")
-                        matchkey = base.random_key(rpc_key + ":", old_keyset)
-                        base.sendjson(
-                            tracker_conn, [TrackerCode.PUT, rpc_key, (port, matchkey), custom_addr]
-                        )
-                        assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
-                        unmatch_period_count = 0
-                    continue
-            conn, addr = listen_sock.accept()
+                        del matchkeys[matchkey]
+
+            if sock not in ready:
+                continue
+            conn, addr = sock.accept()
+        except (socket.error, IOError):
+            # retry when tracker is dropped
+            if tracker_conn:
+                tracker_conn.close()
+                tracker_conn = None
+            continue
+
+        # step 4: check the key of the client
+        try:
             magic = struct.unpack("<i", base.recvall(conn, 4))[0]
             if magic != base.RPC_MAGIC:
                 conn.close()
@@ -190,73 +462,49 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
             keylen = struct.unpack("<i", base.recvall(conn, 4))[0]
             key = py_str(base.recvall(conn, keylen))
             arr = key.split()
-            expect_header = "client:" + matchkey
-            server_key = "server:" + rpc_key
-            if arr[0] != expect_header:
+            slot = None
+            if tracker_conn and arr[0].startswith("client:"):
+                slot = matchkeys.pop(arr[0][len("client:") :], [None])[0]
+            elif not tracker_conn and arr[0] == "client:" + rpc_key:
+                slot = min(set(range(num_slots)) - set(sessions))
+            if slot is None:
                 conn.sendall(struct.pack("<i", base.RPC_CODE_MISMATCH))
                 conn.close()
                 logger.warning("mismatch key from %s", addr)
                 continue
+            server_key = "server:" + rpc_key
             conn.sendall(struct.pack("<i", base.RPC_CODE_SUCCESS))
             conn.sendall(struct.pack("<i", len(server_key)))
             conn.sendall(server_key.encode("utf-8"))
-            return conn, addr, _parse_server_opt(arr[1:])
-
-    # Server logic
-    tracker_conn = None
-    while True:
-        try:
-            # step 1: setup tracker and report to tracker
-            if tracker_addr and tracker_conn is None:
-                tracker_conn = base.connect_with_retry(tracker_addr)
-                tracker_conn.sendall(struct.pack("<i", base.RPC_TRACKER_MAGIC))
-                magic = struct.unpack("<i", base.recvall(tracker_conn, 4))[0]
-                if magic != base.RPC_TRACKER_MAGIC:
-                    raise RuntimeError("%s is not RPC Tracker" % str(tracker_addr))
-                # report status of current queue
-                cinfo = {"key": "server:" + rpc_key}
-                base.sendjson(tracker_conn, [TrackerCode.UPDATE_INFO, cinfo])
-                assert base.recvjson(tracker_conn) == TrackerCode.SUCCESS
-
-            # step 2: wait for in-coming connections
-            conn, addr, opts = _accept_conn(sock, tracker_conn)
+            opts = _parse_server_opt(arr[1:])
         except (socket.error, IOError):
-            # retry when tracker is dropped
-            if tracker_conn:
-                tracker_conn.close()
-                tracker_conn = None
+            conn.close()
             continue
-        except RuntimeError as exc:
-            raise exc
 
-        # step 3: serving
+        # step 5: serving
         work_path = utils.tempdir()
         logger.info("connection from %s", addr)
         server_proc = multiprocessing.Process(
-            target=_serve_loop, args=(conn, addr, load_library, work_path)
+            target=_serve_loop,
+            args=(
+                conn,
+                addr,
+                load_library,
+                work_path,
+                slot_cpus[slot] if slot_cpus else None,
+                module_cache,
+            ),
         )
 
         server_proc.start()
         # close from our side.
         conn.close()
-        # wait until server process finish or timeout
-        server_proc.join(opts.get("timeout", None))
+        timeout = opts.get("timeout", None)
+        start = time.time()
+        sessions[slot] = (server_proc, work_path, start, start + timeout if timeout else None)
 
-        if server_proc.is_alive():
-            logger.info("Timeout in RPC session, kill..")
-            # pylint: disable=import-outside-toplevel
-            import psutil
 
-            parent = psutil.Process(server_proc.pid)
-            # terminate worker childs
-            for child in parent.children(recursive=True):
-                child.terminate()
-            # terminate the worker
-            server_proc.terminate()
-        work_path.remove()
-
-
-def _connect_proxy_loop(addr, key, load_library):
+def _connect_proxy_loop(addr, key, load_library, module_cache=None):
     key = "server:" + key
     retry_count = 0
     max_retry = 5
@@ -280,7 +528,9 @@ def _connect_proxy_loop(addr, key, load_library):
             remote_key = py_str(base.recvall(sock, keylen))
             opts = _parse_server_opt(remote_key.split()[1:])
             logger.info("connected to %s", str(addr))
-            process = multiprocessing.Process(target=_serve_loop, args=(sock, addr, load_library))
+            process = multiprocessing.Process(
+                target=_serve_loop, args=(sock, addr, load_library, None, None, module_cache)
+            )
             process.start()
             sock.close()
             process.join(opts.get("timeout", None))
@@ -348,6 +598,27 @@ class Server(object):
 
     silent: bool, optional
         Whether run this server in silent mode.
+
+    num_slots: int, optional
+        The maximum number of sessions served at the same time, e.g. to measure several
+        CPU tasks in parallel on a host with many cores. Every session runs in its own
+        process and work directory, and each free slot is reported to the tracker.
+        Not supported in proxy mode.
+
+    slot_cpus: str or List[List[int]], optional
+        Pin the sessions of every slot to a set of CPUs. "auto" splits the CPUs available
+        to the server evenly between the slots. Otherwise it is the list of CPUs of every
+        slot, or the same list in string form, e.g. "0-15;16-31". To keep a slot on one
+        NUMA node, give it the CPUs of the node.
+
+    module_cache_dir: str, optional
+        If set, keep the modules uploaded with :code:`RPCSession.upload(..., use_cache=True)`
+        and the libraries linked from them in this directory, keyed by content hash and
+        shared by all sessions, so a module uploaded again is neither sent nor linked again.
+
+    module_cache_size: int, optional
+        The maximum size of the module cache in bytes. The least recently used files are
+        evicted first.
     """
 
     def __init__(
@@ -362,6 +633,10 @@ class Server(object):
         load_library=None,
         custom_addr=None,
         silent=False,
+        num_slots=1,
+        slot_cpus=None,
+        module_cache_dir=None,
+        module_cache_size=1 << 30,
     ):
         try:
             if _ffi_api.ServerLoop is None:
@@ -377,6 +652,10 @@ class Server(object):
         if silent:
             logger.setLevel(logging.ERROR)
 
+        module_cache = None
+        if module_cache_dir and not use_popen:
+            module_cache = ModuleCache(module_cache_dir, module_cache_size)
+
         if use_popen:
             cmd = [
                 sys.executable,
@@ -395,6 +674,17 @@ class Server(object):
                 cmd += ["--custom-addr", custom_addr]
             if silent:
                 cmd += ["--silent"]
+            if num_slots > 1:
+                cmd += ["--num-slots=%d" % num_slots]
+            if slot_cpus is not None:
+                if not isinstance(slot_cpus, str):
+                    slot_cpus = ";".join(",".join(str(x) for x in cpus) for cpus in slot_cpus)
+                cmd += ["--slot-cpus=%s" % slot_cpus]
+            if module_cache_dir:
+                cmd += [
+                    "--module-cache-dir=%s" % module_cache_dir,
+                    "--module-cache-size=%d" % module_cache_size,
+                ]
 
             # prexec_fn is not thread safe and may result in deadlock.
             # python 3.2 introduced the start_new_session parameter as
@@ -425,16 +715,26 @@ class Server(object):
             if not self.port:
                 raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
             logger.info("bind to %s:%d", host, self.port)
-            sock.listen(1)
+            sock.listen(num_slots)
             self.sock = sock
             self.proc = multiprocessing.Process(
                 target=_listen_loop,
-                args=(self.sock, self.port, key, tracker_addr, load_library, self.custom_addr),
+                args=(
+                    self.sock,
+                    self.port,
+                    key,
+                    tracker_addr,
+                    load_library,
+                    self.custom_addr,
+                    num_slots,
+                    _parse_slot_cpus(slot_cpus, num_slots),
+                    module_cache,
+                ),
             )
             self.proc.start()
         else:
             self.proc = multiprocessing.Process(
-                target=_connect_proxy_loop, args=((host, port), key, load_library)
+                target=_connect_proxy_loop, args=((host, port), key, load_library, module_cache)
             )
             self.proc.start()
 
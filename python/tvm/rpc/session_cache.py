@@ -0,0 +1,170 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Process-local cache of long-lived RPC sessions requested from a tracker.
+
+Requesting a session from the tracker costs a tracker round-trip and a new session
+(a forked process and a fresh work directory) on the server. Long-running clients that
+measure many small programs on the same device, e.g. the workers of a tuning runner,
+can keep one session per device instead and only check that it is still alive before
+reusing it.
+
+A cached session can also keep data resident on the device, e.g. the reference inputs
+and outputs used to check the correctness of every measured program, so that they are
+sent to the device once per session instead of once per measurement.
+"""
+import logging
+import os
+import os.path
+import weakref
+
+from tvm._ffi.base import TVMError
+from .client import connect_tracker
+
+logger = logging.getLogger("RPCServer")
+
+# (device key, tracker host, tracker port) -> RPCSession
+_SESSIONS = {}
+
+# RPCSession -> (namespace, {name: value}) of the data resident in the session
+_RESIDENT = weakref.WeakKeyDictionary()
+
+
+def _is_alive(sess):
+    """Check whether a session is still usable with a cheap round-trip"""
+    try:
+        sess.get_function("tvm.rpc.server.workpath")
+    except (TVMError, OSError, AttributeError):
+        return False
+    return True
+
+
+def get_session(device_key, host=None, port=None, priority=1, session_timeout=0):
+    """Get a cached RPC session of a device, or request a new one from the tracker.
+
+    A cached session is reused if it is still alive. Otherwise it is dropped and a new
+    session is requested. By default the sessions requested here have no session
+    timeout, so they hold their device in the tracker until the process exits, or
+    :code:`drop_session` is called. The runners keep these sessions in worker processes,
+    which are stopped when the runner is closed, and drop a session after an error.
+
+    Parameters
+    ----------
+    device_key: str
+        The device key of registered device in tracker
+    host: Optional[str]
+        The host address of rpc tracker.
+        If is none, will use environment variable "TVM_TRACKER_HOST"
+    port: Optional[int]
+        The port of rpc tracker.
+        If is none, will use environment variable "TVM_TRACKER_PORT"
+    priority: int, optional
+        The priority of the request if a new session is requested
+    session_timeout: float, optional
+        The duration of a new session in seconds, after which the server kills it.
+        0 means no timeout.
+
+    Returns
+    -------
+    session: RPCSession
+    """
+    host = host or os.environ["TVM_TRACKER_HOST"]
+    port = port or int(os.environ["TVM_TRACKER_PORT"])
+    key = (device_key, host, port)
+
+    sess = _SESSIONS.get(key)
+    if sess is not None:
+        if _is_alive(sess):
+            return sess
+        logger.info("RPC session of %s is broken, reconnecting", device_key)
+        del _SESSIONS[key]
+
+    tracker = connect_tracker(host, port)
+    sess = tracker.request(device_key, priority=priority, session_timeout=session_timeout)
+    _SESSIONS[key] = sess
+    return sess
+
+
+def drop_session(device_key, host=None, port=None):
+    """Drop the cached session of a device, e.g. after an error left it in a bad state.
+
+    Parameters
+    ----------
+    device_key: str
+        The device key of registered device in tracker
+    host: Optional[str]
+        The host address of rpc tracker.
+    port: Optional[int]
+        The port of rpc tracker.
+    """
+    host = host or os.environ["TVM_TRACKER_HOST"]
+    port = port or int(os.environ["TVM_TRACKER_PORT"])
+    _SESSIONS.pop((device_key, host, port), None)
+
+
+def remove_uploaded_module(sess, file_name):
+    """Remove an uploaded module, and the library created by loading it, from the remote
+    work directory, so that a long-lived session does not accumulate files.
+
+    This is called whether the measurement of the module failed or not. Errors, e.g. of
+    a broken session, are logged and ignored, as the server removes the work directory
+    of a session when it ends.
+
+    Parameters
+    ----------
+    sess: RPCSession
+        The session the module is uploaded to
+    file_name: str
+        The local path or the remote name of the uploaded module
+    """
+    name = os.path.basename(file_name)
+    try:
+        sess.remove(name)
+        # load_module links .o and .tar files into name + ".so"
+        if not name.endswith(".so"):
+            sess.remove(name + ".so")
+    except (TVMError, OSError) as exc:
+        logger.debug("Cannot remove %s from the remote: %s", name, exc)
+
+
+def get_resident(sess, namespace, name, create):
+    """Get a value kept alive with a session, e.g. arrays resident on its device.
+
+    Only the values of one namespace are kept per session. Asking for a value of another
+    namespace, e.g. the reference data of another tuning task, frees the old values.
+
+    Parameters
+    ----------
+    sess: RPCSession
+        The session the value belongs to
+    namespace: str
+        The namespace of the value
+    name: str
+        The name of the value in the namespace
+    create: Callable[[], Any]
+        Creates the value if it is not resident yet
+
+    Returns
+    -------
+    value: Any
+    """
+    resident_namespace, values = _RESIDENT.get(sess, (None, None))
+    if resident_namespace != namespace:
+        values = {}
+        _RESIDENT[sess] = (namespace, values)
+    if name not in values:
+        values[name] = create()
+    return values[name]
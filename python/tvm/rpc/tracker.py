@@ -38,9 +38,13 @@ List of available APIs:
 - REQUEST: request a new resource from tracker
   - input: [TrackerCode.REQUEST, [key, user, priority]]
   - return: [TrackerCode.SUCCESS, [url, port, match-key]]
+- REPORT: report the outcome of a finished session of the server to tracker
+  - input: [TrackerCode.REPORT, {"status": "ok" | "timeout" | "error", "duration": seconds}]
+  - return: TrackerCode.SUCCESS
 """
 # pylint: disable=invalid-name
 
+import collections
 import heapq
 import time
 import logging
@@ -106,6 +110,9 @@ class Scheduler(object):
             The resource to remove
         """
 
+    def poll(self):
+        """Called periodically to let the scheduler act on time-dependent state."""
+
     def summary(self):
         """Get summary information of the scheduler."""
         raise NotImplementedError()
@@ -147,6 +154,174 @@ class PriorityScheduler(Scheduler):
         return {"free": len(self._values), "pending": len(self._requests)}
 
 
+class ServerStats(object):
+    """Rolling statistics of the sessions of one RPC server.
+
+    The tracker counts a session from the time it hands out a slot of the server
+    until the server puts the slot back. The outcome of a session is reported
+    by the server, or assumed successful for servers that do not report.
+
+    Parameters
+    ----------
+    key : str
+        The device key of the server.
+    addr : Tuple[str, int]
+        The address of the server.
+    window : int
+        The number of recent sessions in the statistics.
+    max_errors : int
+        Quarantine the server after this many failed sessions in a row.
+    quarantine_period : float
+        The time in seconds a quarantined server is not dispatched to.
+    """
+
+    def __init__(self, key, addr, window=20, max_errors=3, quarantine_period=60):
+        self.key = key
+        self.addr = addr
+        self.max_errors = max_errors
+        self.quarantine_period = quarantine_period
+        self.connected = True
+        self.active = 0
+        self.num_sessions = 0
+        self.num_errors = 0
+        self.last_success = None
+        self._reports = False
+        self._starts = collections.deque()
+        self._recent = collections.deque(maxlen=window)
+        self._consecutive_errors = 0
+        self._quarantine_until = 0
+
+    def on_dispatch(self):
+        """A slot of the server is handed out to a client."""
+        self.active += 1
+        self._starts.append(time.time())
+
+    def on_put(self):
+        """The server puts a free slot, i.e. a session of it has ended."""
+        self.connected = True
+        if not self._starts:
+            return
+        self.active -= 1
+        start = self._starts.popleft()
+        if not self._reports:
+            self._record(time.time() - start, True)
+
+    def on_report(self, status, duration):
+        """The server reports the outcome of a session."""
+        self._reports = True
+        self._record(duration, status == "ok")
+
+    def on_close(self):
+        """The server is disconnected. Its unfinished sessions are failed."""
+        self.connected = False
+        now = time.time()
+        while self._starts:
+            self._record(now - self._starts.popleft(), False)
+        self.active = 0
+
+    def _record(self, duration, success):
+        self.num_sessions += 1
+        self._recent.append((duration, success))
+        if success:
+            self.last_success = time.time()
+            self._consecutive_errors = 0
+            return
+        self.num_errors += 1
+        self._consecutive_errors += 1
+        if self._consecutive_errors >= self.max_errors:
+            logger.warning(
+                "Quarantine %s:%d of %s for %g seconds after %d failed sessions",
+                self.addr[0],
+                self.addr[1],
+                self.key,
+                self.quarantine_period,
+                self._consecutive_errors,
+            )
+            self._quarantine_until = time.time() + self.quarantine_period
+
+    def quarantined(self):
+        """Whether the server should not be dispatched to now."""
+        return time.time() < self._quarantine_until
+
+    def stale(self):
+        """Whether the server is disconnected and not quarantined, so its statistics
+        can be dropped."""
+        return not self.connected and not self.quarantined()
+
+    def error_rate(self):
+        """The fraction of failed sessions in the recent sessions."""
+        if not self._recent:
+            return 0.0
+        return sum(not success for _, success in self._recent) / len(self._recent)
+
+    def mean_duration(self):
+        """The mean duration of the recent sessions."""
+        if not self._recent:
+            return 0.0
+        return sum(duration for duration, _ in self._recent) / len(self._recent)
+
+    def summary(self):
+        """Get summary information of the server."""
+        return {
+            "key": self.key,
+            "addr": list(self.addr),
+            "connected": self.connected,
+            "active": self.active,
+            "sessions": self.num_sessions,
+            "errors": self.num_errors,
+            "error_rate": self.error_rate(),
+            "mean_duration": self.mean_duration(),
+            "since_last_success": (
+                time.time() - self.last_success if self.last_success is not None else None
+            ),
+            "quarantined": self.quarantined(),
+        }
+
+
+class LoadAwareScheduler(PriorityScheduler):
+    """Scheduler that dispatches to the healthiest and least loaded server.
+
+    The free slots of quarantined servers are not handed out until the quarantine ends.
+    Among the other free slots, the ones of servers with a lower recent error rate,
+    then a smaller fraction of busy slots, then shorter sessions are preferred.
+    The order of the requests is the same as in PriorityScheduler.
+    """
+
+    @staticmethod
+    def _rank(value):
+        conn = value[0]
+        stats = conn.stats
+        load = stats.active / max(conn.summary().get("slots", 1), 1)
+        return (stats.error_rate(), load, stats.mean_duration())
+
+    def _schedule(self):
+        while self._requests:
+            candidates = [value for value in self._values if not value[0].stats.quarantined()]
+            if not candidates:
+                return
+            value = min(candidates, key=self._rank)
+            self._values.remove(value)
+            item = heapq.heappop(self._requests)
+            callback = item[-1]
+            if callback(value[1:]):
+                value[0].pending_matchkeys.remove(value[-1])
+            else:
+                self._values.append(value)
+
+    def poll(self):
+        # hand out the slots of servers whose quarantine has ended
+        self._schedule()
+
+    def summary(self):
+        """Get summary information of the scheduler."""
+        res = super(LoadAwareScheduler, self).summary()
+        res["quarantined"] = sum(value[0].stats.quarantined() for value in self._values)
+        return res
+
+
+SCHEDULERS = {"priority": PriorityScheduler, "load_aware": LoadAwareScheduler}
+
+
 class TCPEventHandler(tornado_util.TCPHandler):
     """Base asynchronize message handler.
 
@@ -167,6 +342,8 @@ class TCPEventHandler(tornado_util.TCPHandler):
         self.pending_matchkeys = set()
         self._tracker._connections.add(self)
         self.put_values = []
+        # statistics of the server on the other side, if it is a server
+        self.stats = None
 
     def name(self):
         """name of connection"""
@@ -255,6 +432,10 @@ class TCPEventHandler(tornado_util.TCPHandler):
                 return True
 
             self._tracker.request(key, user, priority, _cb)
+        elif code == TrackerCode.REPORT:
+            if self.stats is not None:
+                self.stats.on_report(args[1]["status"], args[1]["duration"])
+            self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.PING:
             self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.GET_PENDING_MATCHKEYS:
@@ -287,18 +468,23 @@ class TCPEventHandler(tornado_util.TCPHandler):
 class TrackerServerHandler(object):
     """Tracker that tracks the resources."""
 
-    def __init__(self, sock, stop_key):
+    def __init__(self, sock, stop_key, scheduler="priority"):
         self._scheduler_map = {}
         self._sock = sock
         self._sock.setblocking(0)
         self._ioloop = ioloop.IOLoop.current()
         self._stop_key = stop_key
         self._connections = set()
+        self._scheduler_class = SCHEDULERS[scheduler]
+        # (key, host, port) -> ServerStats of the connected and the quarantined servers
+        self._server_stats = {}
 
         def _event_handler(_, events):
             self._on_event(events)
 
         self._ioloop.add_handler(self._sock.fileno(), _event_handler, self._ioloop.READ)
+        self._poller = ioloop.PeriodicCallback(self._poll, 1000)
+        self._poller.start()
 
     def _on_event(self, _):
         while True:
@@ -309,24 +495,51 @@ class TrackerServerHandler(object):
                 if err.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
                     break
 
+    def _poll(self):
+        for scheduler in self._scheduler_map.values():
+            scheduler.poll()
+        self._drop_stale_stats()
+
+    def _drop_stale_stats(self):
+        # the statistics are keyed by port, which other servers may use later
+        for server in [k for k, stats in self._server_stats.items() if stats.stale()]:
+            del self._server_stats[server]
+
     def create_scheduler(self, key):
         """Create a new scheduler."""
-        return PriorityScheduler(key)
+        return self._scheduler_class(key)
 
     def put(self, key, value):
         """Report a new resource to the tracker."""
+        conn, host, port, _ = value
+        if (key, host, port) not in self._server_stats:
+            self._server_stats[(key, host, port)] = ServerStats(key, (host, port))
+        conn.stats = self._server_stats[(key, host, port)]
+        conn.stats.on_put()
         if key not in self._scheduler_map:
             self._scheduler_map[key] = self.create_scheduler(key)
         self._scheduler_map[key].put(value)
 
     def request(self, key, user, priority, callback):
         """Request a new resource."""
+
+        def _dispatch(value):
+            if not callback(value):
+                return False
+            stats = self._server_stats.get((key, value[0], value[1]))
+            if stats is not None:
+                stats.on_dispatch()
+            return True
+
         if key not in self._scheduler_map:
             self._scheduler_map[key] = self.create_scheduler(key)
-        self._scheduler_map[key].request(user, priority, callback)
+        self._scheduler_map[key].request(user, priority, _dispatch)
 
     def close(self, conn):
         self._connections.remove(conn)
+        if conn.stats is not None:
+            conn.stats.on_close()
+            self._drop_stale_stats()
         if "key" in conn._info:
             key = conn._info["key"].split(":")[1]  # 'server:rasp3b' -> 'rasp3b'
             for value in conn.put_values:
@@ -350,15 +563,16 @@ class TrackerServerHandler(object):
             res = conn.summary()
             if res.get("key", "").startswith("server"):
                 cinfo.append(res)
-        return {"queue_info": qinfo, "server_info": cinfo}
+        sinfo = [stats.summary() for stats in self._server_stats.values()]
+        return {"queue_info": qinfo, "server_info": cinfo, "server_stats": sinfo}
 
     def run(self):
         """Run the tracker server"""
         self._ioloop.start()
 
 
-def _tracker_server(listen_sock, stop_key):
-    handler = TrackerServerHandler(listen_sock, stop_key)
+def _tracker_server(listen_sock, stop_key, scheduler):
+    handler = TrackerServerHandler(listen_sock, stop_key, scheduler)
     handler.run()
 
 
@@ -380,9 +594,17 @@ class Tracker(object):
 
     silent: bool, optional
         Whether run in silent mode
+
+    scheduler: str, optional
+        The scheduler that assigns servers to requests.
+        "priority" hands out the free servers in FIFO order.
+        "load_aware" prefers healthy and lightly loaded servers and quarantines
+        failing ones, based on the session statistics the tracker keeps per server.
     """
 
-    def __init__(self, host, port=9190, port_end=9199, silent=False):
+    def __init__(self, host, port=9190, port_end=9199, silent=False, scheduler="priority"):
+        if scheduler not in SCHEDULERS:
+            raise ValueError("Unknown scheduler %s" % scheduler)
         if silent:
             logger.setLevel(logging.WARN)
 
@@ -402,7 +624,9 @@ class Tracker(object):
             raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
         logger.info("bind to %s:%d", host, self.port)
         sock.listen(1)
-        self.proc = multiprocessing.Process(target=_tracker_server, args=(sock, self.stop_key))
+        self.proc = multiprocessing.Process(
+            target=_tracker_server, args=(sock, self.stop_key, scheduler)
+        )
         self.proc.start()
         self.host = host
         # close the socket on this process
@@ -18,6 +18,7 @@
 # pylint: disable=invalid-name, unused-import, import-outside-toplevel
 """Runtime Module namespace."""
 import os
+import sys
 import ctypes
 import struct
 from collections import namedtuple
@@ -252,7 +253,9 @@ class Module(object):
     def _dso_exportable(self):
         return self.type_key == "llvm" or self.type_key == "c"
 
-    def export_library(self, file_name, fcompile=None, addons=None, **kwargs):
+    def export_library(
+        self, file_name, fcompile=None, addons=None, workers=None, object_cache_dir=None, **kwargs
+    ):
         """Export the module and its imported device code one library.
 
         This function only works on host llvm modules.
@@ -268,6 +271,14 @@ class Module(object):
             If fcompile has attribute object_format, will compile host library
             to that format. Otherwise, will use default format "o".
 
+        workers : int, optional
+            The number of C source files compiled at the same time, when the library
+            is created by the default compiler, the number of CPUs by default.
+
+        object_cache_dir : str, optional
+            A directory to cache the objects compiled from C source files in, so that
+            exporting the same sources again only links the library.
+
         kwargs : dict, optional
             Additional arguments passed to fcompile
         """
@@ -348,6 +359,21 @@ class Module(object):
             opts = options + ["-I" + path for path in find_include_path()]
             kwargs.update({"options": opts})
 
+        if fcompile is _cc.create_shared and sys.platform != "win32":
+            # compile the sources separately, in parallel, so that fcompile only links
+            sources = [x for x in files if x.endswith((".c", ".cc", ".cpp"))]
+            if len(sources) > 1 or (sources and object_cache_dir):
+                objects = _cc.compile_objects(
+                    sources,
+                    kwargs.get("options"),
+                    kwargs.get("cc", "g++"),
+                    workers=workers,
+                    cache_dir=object_cache_dir,
+                    output_dir=temp.temp_dir,
+                )
+                objects = dict(zip(sources, objects))
+                files = [objects.get(x, x) for x in files]
+
         fcompile(file_name, files, **kwargs)
 
 
@@ -372,6 +398,53 @@ def system_lib():
     return _ffi_api.SystemLib()
 
 
+def _link_shared(path, output, cc):
+    """Link a .o or .tar module into the shared library output."""
+    # Extra dependencies during runtime.
+    from tvm.contrib import cc as _cc, utils as _utils, tar as _tar
+
+    if path.endswith(".o"):
+        _cc.create_shared(output, path, cc=cc)
+    else:
+        tar_temp = _utils.tempdir(custom_path=path.replace(".tar", ""))
+        _tar.untar(path, tar_temp.temp_dir)
+        files = [tar_temp.relpath(x) for x in tar_temp.listdir()]
+        _cc.create_shared(output, files, cc=cc)
+
+
+def _load_linked_from_cache(path, fmt, cc, cache_dir):
+    """Load a .o or .tar module through the linked library cache in cache_dir."""
+    import hashlib
+    from tvm.contrib import utils as _utils
+    from tvm.contrib.file_cache import ModuleCache, file_digest
+
+    cache = ModuleCache(
+        cache_dir, int(os.environ.get("TVM_LINKED_MODULE_CACHE_SIZE", str(1 << 30)))
+    )
+    # the same archive linked by another compiler is a different library
+    digest = hashlib.sha256(("%s:%s" % (file_digest(path), cc)).encode("utf-8")).hexdigest()
+    for _ in range(2):
+        cached = cache.get(digest, ".so")
+        if cached is None:
+            # link once, even if many processes load the same archive at the same time.
+            # The empty lock file is kept: removing it while other processes wait on it
+            # would let a new process lock a fresh file and link concurrently.
+            lock = _utils.filelock(os.path.join(cache.path, ".%s.lock" % digest))
+            try:
+                cached = cache.get(digest, ".so")
+                if cached is None:
+                    temp = _utils.tempdir()
+                    _link_shared(path, temp.relpath("lib.so"), cc)
+                    cached = cache.put(digest, temp.relpath("lib.so"), ".so")
+            finally:
+                lock.release()
+        if os.path.exists(cached):
+            return _ffi_api.ModuleLoadFromFile(cached, fmt)
+    # evicted by concurrent loaders twice, e.g. as the cache is smaller than the library
+    _link_shared(path, path + ".so", cc)
+    return _ffi_api.ModuleLoadFromFile(path + ".so", fmt)
+
+
 def load_module(path, fmt=""):
     """Load module from file.
 
@@ -393,6 +466,13 @@ def load_module(path, fmt=""):
     ----
     This function will automatically call
     cc.create_shared if the path is in format .o or .tar
+
+    If the environment variable TVM_LINKED_MODULE_CACHE_DIR is set, the
+    shared libraries linked from .o and .tar files are cached in that
+    directory, keyed by the content of the file, so that loading the same
+    file again only has to load the cached library. The cache is shared
+    by concurrent processes and its size is bounded by
+    TVM_LINKED_MODULE_CACHE_SIZE bytes, 1 GB by default.
     """
 
     # c++ compiler/linker
@@ -400,20 +480,11 @@ def load_module(path, fmt=""):
 
     # High level handling for .o and .tar file.
     # We support this to be consistent with RPC module load.
-    if path.endswith(".o"):
-        # Extra dependencies during runtime.
-        from tvm.contrib import cc as _cc
-
-        _cc.create_shared(path + ".so", path, cc=cc)
-        path += ".so"
-    elif path.endswith(".tar"):
-        # Extra dependencies during runtime.
-        from tvm.contrib import cc as _cc, utils as _utils, tar as _tar
-
-        tar_temp = _utils.tempdir(custom_path=path.replace(".tar", ""))
-        _tar.untar(path, tar_temp.temp_dir)
-        files = [tar_temp.relpath(x) for x in tar_temp.listdir()]
-        _cc.create_shared(path + ".so", files, cc=cc)
+    if path.endswith(".o") or path.endswith(".tar"):
+        cache_dir = os.environ.get("TVM_LINKED_MODULE_CACHE_DIR", None)
+        if cache_dir:
+            return _load_linked_from_cache(path, fmt, cc, cache_dir)
+        _link_shared(path, path + ".so", cc)
         path += ".so"
     # TODO(weberlo): we should probably use a more distinctive suffix for uTVM object files
     elif path.endswith(".obj"):
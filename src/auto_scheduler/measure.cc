@@ -23,6 +23,7 @@
  */
 
 #include <tvm/auto_scheduler/measure.h>
+#include <tvm/auto_scheduler/search_policy.h>
 #include <tvm/runtime/registry.h>
 
 #include <algorithm>
@@ -82,13 +83,14 @@ BuildResult::BuildResult(String filename, Array<te::Tensor> args, int error_no,
 }
 
 MeasureResult::MeasureResult(Array<PrimExpr> costs, int error_no, String error_msg, double all_cost,
-                             double timestamp) {
+                             double timestamp, double variance) {
   auto node = make_object<MeasureResultNode>();
   node->costs = std::move(costs);
   node->error_no = error_no;
   node->error_msg = std::move(error_msg);
   node->all_cost = all_cost;
   node->timestamp = timestamp;
+  node->variance = variance;
   data_ = std::move(node);
 }
 
@@ -99,21 +101,25 @@ MeasureResult MeasureResultNode::copy() const {
   node->error_msg = error_msg;
   node->all_cost = all_cost;
   node->timestamp = timestamp;
+  node->variance = variance;
   return MeasureResult(node);
 }
 
 /********** LocalBuilder **********/
-LocalBuilder::LocalBuilder(int timeout, int n_parallel, const String& build_func) {
+LocalBuilder::LocalBuilder(int timeout, int n_parallel, const String& build_func,
+                           bool reuse_workers) {
   auto node = make_object<LocalBuilderNode>();
   node->timeout = timeout;
   node->n_parallel = n_parallel;
   node->build_func = build_func;
+  node->reuse_workers = reuse_workers;
   data_ = std::move(node);
 }
 
 Array<BuildResult> LocalBuilderNode::Build(const Array<MeasureInput>& inputs, int verbose) {
   if (const auto* f = runtime::Registry::Get("auto_scheduler.local_builder.build")) {
-    Array<BuildResult> results = (*f)(inputs, timeout, n_parallel, build_func, verbose);
+    Array<BuildResult> results =
+        (*f)(inputs, timeout, n_parallel, build_func, verbose, reuse_workers);
     return results;
   }
   LOG(FATAL) << "auto_scheduler.local_builder.build is not registered. "
@@ -124,7 +130,8 @@ Array<BuildResult> LocalBuilderNode::Build(const Array<MeasureInput>& inputs, in
 
 /********** LocalRunner **********/
 LocalRunner::LocalRunner(int timeout, int number, int repeat, int min_repeat_ms,
-                         double cooldown_interval, bool enable_cpu_cache_flush) {
+                         double cooldown_interval, bool enable_cpu_cache_flush, bool adaptive,
+                         int max_repeat, double early_stop_ratio, double target_ci) {
   ObjectPtr<LocalRunnerNode> node = make_object<LocalRunnerNode>();
   node->timeout = timeout;
   node->number = number;
@@ -132,6 +139,10 @@ LocalRunner::LocalRunner(int timeout, int number, int repeat, int min_repeat_ms,
   node->min_repeat_ms = min_repeat_ms;
   node->cooldown_interval = cooldown_interval;
   node->enable_cpu_cache_flush = enable_cpu_cache_flush;
+  node->adaptive = adaptive;
+  node->max_repeat = max_repeat;
+  node->early_stop_ratio = early_stop_ratio;
+  node->target_ci = target_ci;
   data_ = std::move(node);
 }
 
@@ -140,7 +151,7 @@ Array<MeasureResult> LocalRunnerNode::Run(const Array<MeasureInput>& inputs,
   if (const auto* f = runtime::Registry::Get("auto_scheduler.local_runner.run")) {
     Array<MeasureResult> results =
         (*f)(inputs, build_results, timeout, number, repeat, min_repeat_ms, cooldown_interval,
-             enable_cpu_cache_flush, verbose);
+             enable_cpu_cache_flush, verbose, adaptive, max_repeat, early_stop_ratio, target_ci);
     return results;
   }
   LOG(FATAL) << "auto_scheduler.local_runner.run is not registered. "
@@ -152,7 +163,9 @@ Array<MeasureResult> LocalRunnerNode::Run(const Array<MeasureInput>& inputs,
 /********** RPCRunner **********/
 RPCRunner::RPCRunner(const String& key, const String& host, int port, int priority, int n_parallel,
                      int timeout, int number, int repeat, int min_repeat_ms,
-                     double cooldown_interval, bool enable_cpu_cache_flush) {
+                     double cooldown_interval, bool enable_cpu_cache_flush, bool reuse_session,
+                     int batch_size, bool adaptive, int max_repeat, double early_stop_ratio,
+                     double target_ci) {
   auto node = make_object<RPCRunnerNode>();
   node->key = key;
   node->host = host;
@@ -165,6 +178,12 @@ RPCRunner::RPCRunner(const String& key, const String& host, int port, int priori
   node->min_repeat_ms = min_repeat_ms;
   node->cooldown_interval = cooldown_interval;
   node->enable_cpu_cache_flush = enable_cpu_cache_flush;
+  node->reuse_session = reuse_session;
+  node->batch_size = batch_size;
+  node->adaptive = adaptive;
+  node->max_repeat = max_repeat;
+  node->early_stop_ratio = early_stop_ratio;
+  node->target_ci = target_ci;
   data_ = std::move(node);
 }
 
@@ -173,7 +192,8 @@ Array<MeasureResult> RPCRunnerNode::Run(const Array<MeasureInput>& inputs,
   if (const auto* f = runtime::Registry::Get("auto_scheduler.rpc_runner.run")) {
     Array<MeasureResult> results =
         (*f)(inputs, build_results, key, host, port, priority, n_parallel, timeout, number, repeat,
-             min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, verbose);
+             min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, verbose, reuse_session,
+             batch_size, adaptive, max_repeat, early_stop_ratio, target_ci);
     return results;
   } else {
     LOG(FATAL) << "auto_scheduler.rpc_runner.run is not registered. "
@@ -232,41 +252,7 @@ Array<MeasureResult> ProgramMeasurerNode::Measure(const SearchTask& task,
     // build and run
     SilentMeasure(task, input_batch, &result_batch);
 
-    // update current best state according to the new measure result
-    for (size_t j = 0; j < input_batch.size(); ++j) {
-      const String& workload_key = input_batch[j]->task->workload_key;
-      double flops;
-
-      if (result_batch[j]->error_no == 0) {
-        flops = task->compute_dag->flop_ct / FloatArrayMean(result_batch[j]->costs);
-        error_ct = 0;
-        has_valid.insert(workload_key);
-      } else {
-        flops = 0.0;
-        error_ct++;
-      }
-
-      if (flops > best_flops[workload_key]) {
-        best_flops[workload_key] = flops;
-        best_state[workload_key] = input_batch[j]->state;
-        best_ct[workload_key] = ct;
-      }
-
-      ct++;
-      StdCout(verbose, 2) << std::fixed << std::setprecision(2) << Chars('=', 50) << "\n"
-                          << "No: " << ct << "\tGFLOPS: " << flops / 1e9 << " / "
-                          << best_flops[workload_key] / 1e9 << "\tresults: " << result_batch[j]
-                          << "\n"
-                          << Chars('=', 50) << "\n"
-                          << input_batch[j]->state << "\n";
-    }
-
-    // Call callback functions
-    if (callbacks) {
-      for (const auto& callback : callbacks.value()) {
-        callback->Callback(policy, input_batch, result_batch);
-      }
-    }
+    UpdateWithResults(task, policy, input_batch, result_batch);
 
     // Store result batch
     for (auto& res : result_batch) {
@@ -287,6 +273,45 @@ Array<MeasureResult> ProgramMeasurerNode::Measure(const SearchTask& task,
   return results;
 }
 
+void ProgramMeasurerNode::UpdateWithResults(const SearchTask& task, const SearchPolicy& policy,
+                                            const Array<MeasureInput>& inputs,
+                                            const Array<MeasureResult>& results) {
+  // update current best state according to the new measure result
+  for (size_t j = 0; j < inputs.size(); ++j) {
+    const String& workload_key = inputs[j]->task->workload_key;
+    double flops;
+
+    if (results[j]->error_no == 0) {
+      flops = task->compute_dag->flop_ct / FloatArrayMean(results[j]->costs);
+      error_ct = 0;
+      has_valid.insert(workload_key);
+    } else {
+      flops = 0.0;
+      error_ct++;
+    }
+
+    if (flops > best_flops[workload_key]) {
+      best_flops[workload_key] = flops;
+      best_state[workload_key] = inputs[j]->state;
+      best_ct[workload_key] = ct;
+    }
+
+    ct++;
+    StdCout(verbose, 2) << std::fixed << std::setprecision(2) << Chars('=', 50) << "\n"
+                        << "No: " << ct << "\tGFLOPS: " << flops / 1e9 << " / "
+                        << best_flops[workload_key] / 1e9 << "\tresults: " << results[j] << "\n"
+                        << Chars('=', 50) << "\n"
+                        << inputs[j]->state << "\n";
+  }
+
+  // Call callback functions
+  if (callbacks) {
+    for (const auto& callback : callbacks.value()) {
+      callback->Callback(policy, inputs, results);
+    }
+  }
+}
+
 void ProgramMeasurerNode::SilentMeasure(const SearchTask& task, const Array<MeasureInput>& inputs,
                                         Array<MeasureResult>* results) {
   results->clear();
@@ -356,8 +381,8 @@ TVM_REGISTER_GLOBAL("auto_scheduler.BuildResult")
 
 TVM_REGISTER_GLOBAL("auto_scheduler.MeasureResult")
     .set_body_typed([](Array<PrimExpr> costs, int error_no, String error_msg, double all_cost,
-                       double timestamp) {
-      return MeasureResult(costs, error_no, error_msg, all_cost, timestamp);
+                       double timestamp, double variance) {
+      return MeasureResult(costs, error_no, error_msg, all_cost, timestamp, variance);
     });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurer")
@@ -366,6 +391,12 @@ TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurer")
       return ProgramMeasurer(builder, runner, callbacks, verbose, max_continuous_error);
     });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurerUpdateWithResults")
+    .set_body_typed([](ProgramMeasurer measurer, SearchTask task, SearchPolicy policy,
+                       Array<MeasureInput> inputs, Array<MeasureResult> results) {
+      measurer->UpdateWithResults(task, policy, inputs, results);
+    });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.ProgramBuilderBuild")
     .set_body_typed([](const ProgramBuilder& builder, const Array<MeasureInput>& inputs,
                        int verbose) { return builder->Build(inputs, verbose); });
@@ -376,23 +407,29 @@ TVM_REGISTER_GLOBAL("auto_scheduler.ProgramRunnerRun")
                        int verbose) { return runner->Run(inputs, build_results, verbose); });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.LocalBuilder")
-    .set_body_typed([](int timeout, int n_parallel, const String& build_func) {
-      return LocalBuilder(timeout, n_parallel, build_func);
+    .set_body_typed([](int timeout, int n_parallel, const String& build_func,
+                       bool reuse_workers) {
+      return LocalBuilder(timeout, n_parallel, build_func, reuse_workers);
     });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.LocalRunner")
     .set_body_typed([](int timeout, int number, int repeat, int min_repeat_ms,
-                       double cooldown_interval, bool enable_cpu_cache_flush) {
+                       double cooldown_interval, bool enable_cpu_cache_flush, bool adaptive,
+                       int max_repeat, double early_stop_ratio, double target_ci) {
       return LocalRunner(timeout, number, repeat, min_repeat_ms, cooldown_interval,
-                         enable_cpu_cache_flush);
+                         enable_cpu_cache_flush, adaptive, max_repeat, early_stop_ratio,
+                         target_ci);
     });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.RPCRunner")
     .set_body_typed([](const String& key, const String& host, int port, int priority,
                        int n_parallel, int timeout, int number, int repeat, int min_repeat_ms,
-                       double cooldown_interval, bool enable_cpu_cache_flush) {
+                       double cooldown_interval, bool enable_cpu_cache_flush, bool reuse_session,
+                       int batch_size, bool adaptive, int max_repeat, double early_stop_ratio,
+                       double target_ci) {
       return RPCRunner(key, host, port, priority, n_parallel, timeout, number, repeat,
-                       min_repeat_ms, cooldown_interval, enable_cpu_cache_flush);
+                       min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, reuse_session,
+                       batch_size, adaptive, max_repeat, early_stop_ratio, target_ci);
     });
 
 }  // namespace auto_scheduler
@@ -256,6 +256,8 @@ struct Handler<::tvm::auto_scheduler::MeasureResultNode> {
     for (const auto& i : double_list) {
       data->costs.push_back(::tvm::FloatImm(::tvm::DataType::Float(64), i));
     }
+    // the variance is not logged
+    data->variance = -1;
     s = reader->NextArrayItem();
     ICHECK(s);
     reader->Read(&data->error_no);
@@ -88,22 +88,32 @@ State EmptyPolicyNode::Search(int num_measure_trials, int early_stopping,
 
 std::pair<Array<MeasureInput>, Array<MeasureResult>> EmptyPolicyNode::ContinueSearchOneRound(
     int num_measure, ProgramMeasurer measurer) {
-  Array<State> best_states;
+  Array<MeasureInput> inputs = PickMeasureInputs(num_measure);
+
+  // Measure these states
+  PrintTitle("Measure", verbose);
+  Array<MeasureResult> results = measurer->Measure(search_task, GetRef<SearchPolicy>(this), inputs);
+
+  UpdateWithMeasureResults(inputs, results);
+
+  return std::make_pair(std::move(inputs), std::move(results));
+}
+
+Array<MeasureInput> EmptyPolicyNode::PickMeasureInputs(int num_measure) {
   Array<MeasureInput> inputs;
-  Array<MeasureResult> results;
 
   // Search one round to get promising states
   PrintTitle("Search", verbose);
-  best_states = SearchOneRound();
-
-  // Measure these states
-  PrintTitle("Measure", verbose);
-  for (const auto& state : best_states) {
+  for (const auto& state : SearchOneRound()) {
     inputs.push_back(MeasureInput(search_task, state));
   }
-  results = measurer->Measure(search_task, GetRef<SearchPolicy>(this), inputs);
 
-  return std::make_pair(std::move(inputs), std::move(results));
+  return inputs;
+}
+
+void EmptyPolicyNode::UpdateWithMeasureResults(const Array<MeasureInput>& inputs,
+                                               const Array<MeasureResult>& results) {
+  // EmptyPolicy does not learn from the measurements
 }
 
 // As an example policy, EmptyPolicy always returns a init state
@@ -49,6 +49,11 @@ class EmptyPolicyNode : public SearchPolicyNode {
   std::pair<Array<MeasureInput>, Array<MeasureResult>> ContinueSearchOneRound(
       int num_measure, ProgramMeasurer measurer) final;
 
+  Array<MeasureInput> PickMeasureInputs(int num_measure) final;
+
+  void UpdateWithMeasureResults(const Array<MeasureInput>& inputs,
+                                const Array<MeasureResult>& results) final;
+
   static constexpr const char* _type_key = "auto_scheduler.EmptyPolicy";
   TVM_DECLARE_FINAL_OBJECT_INFO(EmptyPolicyNode, SearchPolicyNode);
 
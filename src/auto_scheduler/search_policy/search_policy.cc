@@ -112,6 +112,17 @@ TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicyContinueSearchOneRound")
       return Array<ObjectRef>{inputs, results};
     });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicyPickMeasureInputs")
+    .set_body_typed([](SearchPolicy policy, int num_measure) {
+      return policy->PickMeasureInputs(num_measure);
+    });
+
+TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicyUpdateWithMeasureResults")
+    .set_body_typed([](SearchPolicy policy, Array<MeasureInput> inputs,
+                       Array<MeasureResult> results) {
+      policy->UpdateWithMeasureResults(inputs, results);
+    });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicySetVerbose")
     .set_body_typed([](SearchPolicy policy, int verbose) { policy->verbose = verbose; });
 
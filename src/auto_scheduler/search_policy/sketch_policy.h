@@ -115,6 +115,11 @@ class SketchPolicyNode : public SearchPolicyNode {
   std::pair<Array<MeasureInput>, Array<MeasureResult>> ContinueSearchOneRound(
       int num_measure, ProgramMeasurer measurer) final;
 
+  Array<MeasureInput> PickMeasureInputs(int num_measure) final;
+
+  void UpdateWithMeasureResults(const Array<MeasureInput>& inputs,
+                                const Array<MeasureResult>& results) final;
+
   /*!
    * \brief Generate sketches.
    * \return The generated sketches(states).
@@ -27,6 +27,7 @@
 #include <tvm/ir/module.h>
 #include <tvm/relay/expr_functor.h>
 #include <tvm/runtime/device_api.h>
+#include <tvm/runtime/registry.h>
 
 #include <list>
 #include <string>
@@ -402,6 +403,15 @@ class GraphRuntimeCodegen : public backend::MemoizedExprTranslator<std::vector<G
       target = targets_[call_dev_type];
     }
     CCacheKey key = (*pf0)(func, target);
+    // Within the scope of a relay.backend.build_cache.BuildCache, the primitive is compiled
+    // on its own through the on-disk cache, and relay.build imports the compiled module.
+    // An empty name means the primitive is not cached and is lowered as usual.
+    if (const auto* fcache = runtime::Registry::Get("relay.backend.build_cache.compile")) {
+      String cached_name = (*fcache)(compile_engine_, key);
+      if (!cached_name.empty()) {
+        return GraphAddCallNode(op, _GetUniqueName(cached_name), cached_name);
+      }
+    }
     CachedFunc lowered_func = (*pf1)(compile_engine_, key);
     if (!lowered_funcs_.count(target->str())) {
       lowered_funcs_[target->str()] = IRModule(Map<GlobalVar, BaseFunc>({}));
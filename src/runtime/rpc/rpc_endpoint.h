@@ -58,7 +58,8 @@ enum class TrackerCode : int {
   kRequest = 4,
   kUpdateInfo = 5,
   kSummary = 6,
-  kGetPendingMatchKeys = 7
+  kGetPendingMatchKeys = 7,
+  kReport = 8
 };
 
 /*!
@@ -23,6 +23,9 @@
  */
 #include <tvm/runtime/registry.h>
 
+#include <fstream>
+#include <string>
+
 #include "../file_utils.h"
 
 namespace tvm {
@@ -57,5 +60,42 @@ TVM_REGISTER_GLOBAL("tvm.rpc.server.remove").set_body([](TVMArgs args, TVMRetVal
   RemoveFile(file_name);
 });
 
+TVM_REGISTER_GLOBAL("tvm.rpc.server.file_size").set_body([](TVMArgs args, TVMRetValue* rv) {
+  std::string file_name = RPCGetPath(args[0]);
+  std::ifstream fs(file_name, std::ios::in | std::ios::binary | std::ios::ate);
+  // -1 if the file does not exist
+  *rv = fs.fail() ? static_cast<int64_t>(-1) : static_cast<int64_t>(fs.tellg());
+});
+
+TVM_REGISTER_GLOBAL("tvm.rpc.server.upload_chunk").set_body([](TVMArgs args, TVMRetValue* rv) {
+  std::string file_name = RPCGetPath(args[0]);
+  int64_t offset = args[1];
+  std::string data = args[2];
+  // truncate the file when the first chunk arrives, otherwise write in place
+  std::fstream fs(file_name, std::ios::out | std::ios::binary |
+                                 (offset == 0 ? std::ios::trunc : std::ios::in));
+  ICHECK(!fs.fail()) << "Cannot open " << file_name;
+  fs.seekp(offset);
+  fs.write(data.data(), data.length());
+  ICHECK(!fs.fail()) << "Cannot write to " << file_name;
+  *rv = static_cast<int64_t>(fs.tellp());
+});
+
+TVM_REGISTER_GLOBAL("tvm.rpc.server.download_chunk").set_body([](TVMArgs args, TVMRetValue* rv) {
+  std::string file_name = RPCGetPath(args[0]);
+  int64_t offset = args[1];
+  int64_t nbytes = args[2];
+  std::ifstream fs(file_name, std::ios::in | std::ios::binary);
+  ICHECK(!fs.fail()) << "Cannot open " << file_name;
+  fs.seekg(offset);
+  std::string data(nbytes, '\0');
+  fs.read(&data[0], nbytes);
+  data.resize(fs.gcount());
+  TVMByteArray arr;
+  arr.data = data.c_str();
+  arr.size = data.length();
+  *rv = arr;
+});
+
 }  // namespace runtime
 }  // namespace tvm
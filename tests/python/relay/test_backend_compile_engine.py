@@ -161,6 +161,50 @@ def test_select_implementation():
                 assert impl.name == "conv2d_1"
 
 
+def test_select_implementation_cache():
+    target = tvm.target.Target("llvm")
+    compile_engine = relay.backend.compile_engine
+
+    def _select_impl(dshape, wshape):
+        data = relay.var("data", shape=dshape)
+        weight = relay.var("wshape", shape=wshape)
+        out = relay.nn.conv2d(data, weight, padding=(1, 1))
+        out = run_infer_type(out)
+        return compile_engine.select_implementation(
+            relay.op.get("nn.conv2d"),
+            out.attrs,
+            [te.placeholder(dshape), te.placeholder(wshape)],
+            out.checked_type,
+            target,
+        )
+
+    compile_engine.clear_select_implementation_cache()
+    with TempOpAttr("nn.conv2d", "FTVMStrategy", _tmp_strategy):
+        impl, _ = _select_impl((1, 8, 7, 7), (32, 8, 3, 3))
+        assert impl.name == "conv2d_2"
+        impl, outs = _select_impl((1, 8, 7, 7), (32, 8, 3, 3))
+        assert impl.name == "conv2d_2"
+        assert autotvm.task.get_workload(outs)[0] == "test/conv2d_2"
+        stats = compile_engine.select_implementation_cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+        # a cached selection follows the tuning records in the dispatch context
+        records = [_create_record("test/conv2d_1", (1, 8, 7, 7), (32, 8, 3, 3), target, 0.5)]
+        with target:
+            with autotvm.apply_history_best(records):
+                impl, outs = _select_impl((1, 8, 7, 7), (32, 8, 3, 3))
+                assert impl.name == "conv2d_1"
+                assert autotvm.task.get_workload(outs)[0] == "test/conv2d_1"
+        assert compile_engine.select_implementation_cache_stats()["hits"] == 2
+
+        impl, _ = _select_impl((1, 16, 7, 7), (32, 16, 3, 3))
+        assert impl.name == "conv2d_3"
+        assert compile_engine.select_implementation_cache_stats()["misses"] == 2
+
+    compile_engine.clear_select_implementation_cache()
+    assert compile_engine.select_implementation_cache_stats()["hits"] == 0
+
+
 def test_compile_engine():
     engine = relay.backend.compile_engine.get()
 
@@ -262,6 +306,7 @@ def test_compile_nhwc_pack():
 if __name__ == "__main__":
     test_get_valid_implementations()
     test_select_implementation()
+    test_select_implementation_cache()
     test_compile_engine()
     test_compile_placeholder_bypass()
     test_compile_injective_with_tuple()
@@ -17,6 +17,7 @@
 import os
 import numpy as np
 import tvm
+import tvm.testing
 from tvm import te
 import json
 import base64
@@ -24,7 +25,7 @@ from tvm._ffi.base import py_str
 from tvm.relay.op import add
 from tvm import relay
 from tvm import rpc
-from tvm.contrib import utils, graph_runtime
+from tvm.contrib import utils, graph_runtime, indexed_params
 
 
 def test_save_load():
@@ -53,6 +54,49 @@ def test_ndarray_reflection():
     np.testing.assert_equal(deser_param_dict["x"].asnumpy(), deser_param_dict["y"].asnumpy())
 
 
+def test_indexed_params_convert():
+    x = np.random.uniform(size=(10, 2)).astype("float32")
+    y = np.arange(6).reshape(1, 2, 3).astype("int8")
+    temp = utils.tempdir()
+    path = temp.relpath("indexed.params")
+    indexed_params.convert_param_dict(relay.save_param_dict({"x": x, "y": y}), path)
+    assert indexed_params.is_indexed_params(path)
+    assert not indexed_params.is_indexed_params(relay.save_param_dict({"x": x}))
+
+    with indexed_params.IndexedParams(path) as params:
+        assert sorted(params.keys()) == ["x", "y"]
+        np.testing.assert_equal(params["x"], x)
+        np.testing.assert_equal(params["y"], y)
+        assert params["x"].ctypes.data % 64 == 0
+        assert params.nbytes("y") == 6
+
+    param2 = relay.load_param_dict(indexed_params.to_param_dict(path))
+    np.testing.assert_equal(param2["x"].asnumpy(), x)
+    np.testing.assert_equal(param2["y"].asnumpy(), y)
+
+
+@tvm.testing.requires_llvm
+def test_indexed_params_graph_runtime():
+    x = relay.var("x", shape=(16,))
+    y = relay.var("y", shape=(16,))
+    func = relay.Function([x, y], x * y + relay.const(1.0))
+    y_np = np.random.uniform(size=(16,)).astype("float32")
+    lib = relay.build(tvm.IRModule.from_expr(func), "llvm")
+
+    temp = utils.tempdir()
+    path = temp.relpath("indexed.params")
+    # a parameter the graph does not use is skipped
+    indexed_params.save_params({"y": y_np, "unused": np.zeros((4,), "float32")}, path)
+
+    x_np = np.random.uniform(size=(16,)).astype("float32")
+    for zero_copy in [True, False]:
+        gmod = graph_runtime.GraphModule(lib["default"](tvm.cpu()))
+        gmod.load_params_file(path, zero_copy=zero_copy)
+        gmod.set_input("x", x_np)
+        gmod.run()
+        tvm.testing.assert_allclose(gmod.get_output(0).asnumpy(), x_np * y_np + 1.0, rtol=1e-5)
+
+
 def test_bigendian_rpc_param():
     """Test big endian rpc when there is a PowerPC RPC server available"""
     host = os.environ.get("TVM_POWERPC_TEST_HOST", None)
@@ -92,4 +136,6 @@ def test_bigendian_rpc_param():
 if __name__ == "__main__":
     test_save_load()
     test_ndarray_reflection()
+    test_indexed_params_convert()
+    test_indexed_params_graph_runtime()
     test_bigendian_rpc_param()
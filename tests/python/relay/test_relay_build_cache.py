@@ -0,0 +1,145 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+
+import numpy as np
+
+import tvm
+from tvm import autotvm, relay, te
+from tvm.contrib import utils
+from tvm.relay.backend.build_cache import BuildCache
+import tvm.testing
+
+
+def _get_model(head=relay.nn.softmax):
+    a = relay.var("a", dtype="float32", shape=(16, 8))
+    b = relay.var("b", dtype="float32", shape=(8, 8))
+    y = head(relay.nn.relu(relay.nn.dense(a, b)))
+    mod = tvm.IRModule.from_expr(relay.Function([a, b], y))
+    params = {"b": np.random.uniform(-1, 1, (8, 8)).astype("float32")}
+    return mod, params
+
+
+def _softmax(x):
+    x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+    return x / np.sum(x, axis=-1, keepdims=True)
+
+
+def _run(lib, a_np):
+    ctx = tvm.cpu()
+    rt = tvm.contrib.graph_runtime.GraphModule(lib["default"](ctx))
+    rt.set_input("a", a_np)
+    rt.run()
+    return rt.get_output(0).asnumpy()
+
+
+@tvm.testing.requires_llvm
+def test_build_cache():
+    # two fused functions: dense + relu, and softmax
+    mod, params = _get_model()
+    a_np = np.random.uniform(-1, 1, (16, 8)).astype("float32")
+    hidden = np.maximum(np.dot(a_np, params["b"].T), 0)
+    temp = utils.tempdir()
+
+    with BuildCache(temp.relpath("cache")) as cache:
+        lib = relay.build(mod, "llvm", params=params)
+        assert cache.stats()["misses"] == 2 and cache.stats()["stores"] == 2
+        tvm.testing.assert_allclose(_run(lib, a_np), _softmax(hidden), rtol=1e-5, atol=1e-5)
+
+        lib = relay.build(mod, "llvm", params=params)
+        assert cache.stats()["hits"] == 2
+        tvm.testing.assert_allclose(_run(lib, a_np), _softmax(hidden), rtol=1e-5, atol=1e-5)
+
+        # the parameters are inputs of the fused functions, not part of the key
+        new_b = params["b"] + 1
+        lib = relay.build(mod, "llvm", params={"b": new_b})
+        assert cache.stats()["hits"] == 4
+        expected = _softmax(np.maximum(np.dot(a_np, new_b.T), 0))
+        tvm.testing.assert_allclose(_run(lib, a_np), expected, rtol=1e-5, atol=1e-5)
+
+        # a variant of the model shares the dense + relu function
+        variant, _ = _get_model(relay.nn.log_softmax)
+        lib = relay.build(variant, "llvm", params=params)
+        assert cache.stats()["hits"] == 5 and cache.stats()["misses"] == 3
+        expected = np.log(_softmax(hidden))
+        tvm.testing.assert_allclose(_run(lib, a_np), expected, rtol=1e-5, atol=1e-5)
+
+        # a different opt_level must not hit
+        with tvm.transform.PassContext(opt_level=1):
+            relay.build(mod, "llvm", params=params)
+        assert cache.stats()["hits"] == 5
+
+    # the library with cached functions can be exported
+    lib.export_library(temp.relpath("lib.so"))
+    loaded = tvm.runtime.load_module(temp.relpath("lib.so"))
+    tvm.testing.assert_allclose(_run(loaded, a_np), expected, rtol=1e-5, atol=1e-5)
+
+    # the cache persists across cache objects and is only used in scope
+    with BuildCache(temp.relpath("cache")) as cache:
+        relay.build(mod, "llvm", params=params)
+        assert cache.stats()["hits"] == 2
+    relay.build(mod, "llvm", params=params)
+    assert cache.stats()["hits"] == 2
+
+
+@tvm.testing.requires_llvm
+def test_build_cache_tuning_records():
+    mod, params = _get_model()
+    a_np = np.random.uniform(-1, 1, (16, 8)).astype("float32")
+    expected = _softmax(np.maximum(np.dot(a_np, params["b"].T), 0))
+    target = tvm.target.Target("llvm")
+    temp = utils.tempdir()
+
+    args = [te.placeholder((16, 8)), te.placeholder((8, 8)), None, "float32"]
+    task = autotvm.task.create("dense_nopack.x86", args, target)
+    cfg = task.config_space.get(1)
+    cfg.cost = 1e-4
+    inp = autotvm.MeasureInput(target=target, task=task, config=cfg)
+    res = autotvm.MeasureResult(costs=(1e-4,), error_no=0, all_cost=-1, timestamp=-1)
+
+    with BuildCache(temp.relpath("cache")) as cache:
+        relay.build(mod, target, params=params)
+        assert cache.stats()["misses"] == 2
+
+        # a record of the dense workload only invalidates the dense + relu function
+        with autotvm.apply_history_best([(inp, res)]):
+            lib = relay.build(mod, target, params=params)
+            assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+            tvm.testing.assert_allclose(_run(lib, a_np), expected, rtol=1e-5, atol=1e-5)
+
+            relay.build(mod, target, params=params)
+            assert cache.stats()["hits"] == 3
+
+        # the entry keeps the function compiled without the record
+        relay.build(mod, target, params=params)
+        assert cache.stats()["hits"] == 5 and cache.stats()["misses"] == 3
+
+
+@tvm.testing.requires_llvm
+def test_build_cache_eviction():
+    mod, params = _get_model()
+    temp = utils.tempdir()
+    with BuildCache(temp.relpath("cache"), max_size=1) as cache:
+        relay.build(mod, "llvm", params=params)
+        assert cache.stats()["stores"] == 2
+    assert not [x for x in os.listdir(temp.relpath("cache")) if not x.startswith(".")]
+
+
+if __name__ == "__main__":
+    test_build_cache()
+    test_build_cache_tuning_records()
+    test_build_cache_eviction()
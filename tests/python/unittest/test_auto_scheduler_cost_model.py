@@ -23,6 +23,7 @@ import numpy as np
 
 import tvm
 from tvm import auto_scheduler
+from tvm.auto_scheduler.cost_model.xgb_model import flat_pack_sum_xgbmatrix, iter_row_blocks
 
 from test_auto_scheduler_common import matmul_auto_scheduler_test
 
@@ -71,6 +72,23 @@ def test_xgb_model():
     with tempfile.NamedTemporaryFile() as fp:
         auto_scheduler.save_records(fp.name, inputs, results)
         model.update_from_file(fp.name)
+        model.update_from_file(fp.name, chunk_size=16)
+
+        # the chunks are normalized together, like the records of one update,
+        # and only their memory-mapped features are kept
+        chunked = auto_scheduler.XGBModel(num_warmup_sample=-1)
+        chunked.update_from_file(fp.name, chunk_size=16)
+        _, expected, _ = auto_scheduler.feature.get_per_store_features_from_measure_pairs(
+            inputs, results
+        )
+        np.testing.assert_allclose(chunked.pretrain_sets[0][3], expected, rtol=1e-5)
+        assert not chunked.inputs and chunked.num_samples() == len(inputs)
+        assert isinstance(chunked.pretrain_sets[0][1], np.memmap)
+
+        # later updates train on the pretraining set and the new samples
+        chunked.update(inputs[:10], results[:10])
+        assert chunked.num_samples() == len(inputs) + 10
+        assert len(chunked.predict(task, [x.state for x in inputs])) == len(inputs)
 
     # test model serialization
     with tempfile.NamedTemporaryFile() as fp:
@@ -78,6 +96,53 @@ def test_xgb_model():
         model.load(fp.name)
 
 
+def test_xgb_model_pretrain_without_copy():
+    _, inputs, results = get_sample_records(50)
+
+    with tempfile.NamedTemporaryFile() as fp:
+        auto_scheduler.save_records(fp.name, inputs, results)
+        model = auto_scheduler.XGBModel(num_warmup_sample=-1)
+        model.update_from_file(fp.name, chunk_size=16)
+    _, rows, pack_sizes, throughputs, task_ids = model.pretrain_sets[0]
+
+    # the rows are fed to xgboost as views of the memory-mapped file
+    extra = np.ones((5, rows.shape[1]), dtype=np.float32)
+    blocks = list(iter_row_blocks([rows, extra], block_size=7))
+    assert all(np.shares_memory(x, rows) or np.shares_memory(x, extra) for _, x in blocks)
+    assert all(len(x) <= 7 for _, x in blocks)
+    assert [begin for begin, _ in blocks] == list(np.cumsum([0] + [len(x) for _, x in blocks])[:-1])
+    np.testing.assert_equal(np.concatenate([x for _, x in blocks]), np.concatenate([rows, extra]))
+
+    # the rows are saved sorted by task, so they are not reordered
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dtrain = flat_pack_sum_xgbmatrix(
+            [rows], pack_sizes, throughputs, task_ids, cache_prefix=tmpdir + "/dtrain"
+        )
+        assert dtrain.num_row() == len(rows)
+        np.testing.assert_allclose(
+            dtrain.get_label(), np.repeat(throughputs, pack_sizes), rtol=1e-6
+        )
+
+
+def test_xgb_model_incremental():
+    task, inputs, results = get_sample_records(60)
+
+    model = auto_scheduler.XGBModel(num_warmup_sample=-1, incremental=True, full_refit_interval=2)
+    for i in range(0, len(inputs), 20):
+        model.update(inputs[i : i + 20], results[i : i + 20])
+    assert model.num_updates == len(model.fit_times) == 3
+    assert len(model.pack_sizes) == len(inputs)
+    assert len(model.flat_features) == np.sum(model.pack_sizes)
+
+    preds = model.predict(task, [x.state for x in inputs])
+    costs = [np.mean([x.value for x in res.costs]) for res in results]
+    throughputs = np.min(costs) / costs
+    rmse = np.sqrt(np.mean([np.square(pred - label) for pred, label in zip(preds, throughputs)]))
+    assert rmse <= 0.3
+
+
 if __name__ == "__main__":
     test_random_model()
     test_xgb_model()
+    test_xgb_model_pretrain_without_copy()
+    test_xgb_model_incremental()
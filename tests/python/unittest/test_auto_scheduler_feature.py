@@ -20,6 +20,8 @@
 import math
 import tempfile
 
+import numpy as np
+
 import tvm
 from tvm import te, auto_scheduler
 
@@ -200,7 +202,61 @@ def test_gpu_feature():
         assert fequal(fea_dicts[0]["is_gpu"], 1.0)
 
 
+def test_streaming_feature_extraction():
+    inputs_per_task = []
+    for n in [64, 128]:
+        task = auto_scheduler.SearchTask(
+            func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+        )
+        states = auto_scheduler.SketchPolicy(task, verbose=0).sample_initial_population()[:10]
+        inputs_per_task.append([auto_scheduler.MeasureInput(task, s) for s in states])
+    # interleave the records of the tasks
+    inputs = [inp for pair in zip(*inputs_per_task) for inp in pair]
+    results = [
+        auto_scheduler.MeasureResult([np.random.uniform(0.5, 1.0)], 0, "", 0.1, 0) for _ in inputs
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_file = tmpdir + "/records.json"
+        auto_scheduler.save_records(log_file, inputs, results)
+        features, throughputs, task_ids = auto_scheduler.feature.get_per_store_features_from_file(
+            log_file, -1
+        )
+
+        # the chunks are normalized and numbered across the whole file
+        chunks = list(
+            auto_scheduler.feature.iter_per_store_features_from_file(log_file, chunk_size=3)
+        )
+        assert len(chunks) == 7
+        np.testing.assert_allclose(np.concatenate([c[1] for c in chunks]), throughputs)
+        np.testing.assert_equal(np.concatenate([c[2] for c in chunks]), task_ids)
+        chunk_features = [x for c in chunks for x in c[0]]
+        for x, y in zip(chunk_features, features):
+            np.testing.assert_allclose(x, y)
+
+        # memory-mapped output
+        prefix = tmpdir + "/features"
+        n_records = auto_scheduler.feature.save_per_store_features_from_file(
+            log_file, prefix, chunk_size=3
+        )
+        (
+            flat,
+            pack_sizes,
+            saved_throughputs,
+            saved_task_ids,
+        ) = auto_scheduler.feature.load_per_store_features(prefix)
+        assert n_records == len(inputs) == len(pack_sizes)
+        # the records are saved sorted by task
+        order = np.argsort(task_ids, kind="stable")
+        assert np.all(np.diff(saved_task_ids) >= 0)
+        np.testing.assert_allclose(flat, np.concatenate(list(features[order])), rtol=1e-6)
+        np.testing.assert_equal(pack_sizes, [len(features[i]) for i in order])
+        np.testing.assert_allclose(saved_throughputs, throughputs[order])
+        np.testing.assert_equal(saved_task_ids, task_ids[order])
+
+
 if __name__ == "__main__":
     test_cpu_matmul()
     test_cpu_fusion()
     test_gpu_feature()
+    test_streaming_feature_extraction()
@@ -174,7 +174,7 @@ def test_recover_measure_input():
     )
 
     inp = auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state)
-    res = auto_scheduler.measure.MeasureResult([0.1], 0, "", 0.2, 1)
+    res = auto_scheduler.measure.MeasureResult([0.1], 0, "", 0.2, 1, 0.01)
 
     with tempfile.NamedTemporaryFile() as fp:
         auto_scheduler.save_records(fp.name, [inp], [res])
@@ -183,6 +183,8 @@ def test_recover_measure_input():
         inputs, results = log_reader.read_lines()
         assert len(inputs) == 1
 
+        # the variance is not logged
+        assert results[0].variance == -1
         raw_inp = inputs[0]
 
         correct_inp = auto_scheduler.measure.recover_measure_input(raw_inp)
@@ -192,6 +194,53 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_record_index():
+    tasks = [
+        auto_scheduler.SearchTask(func=matmul_auto_scheduler_test, args=(n, n, n), target=target)
+        for n in [64, 128]
+        for target in ["llvm", "llvm -model=unknown-cpu"]
+    ]
+    inputs, results = [], []
+    for i, cost in enumerate([0.5, 0.3, 0.4, 0.2, 0.1, 0.6]):
+        task = tasks[i % len(tasks)]
+        inputs.append(auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state))
+        results.append(auto_scheduler.measure.MeasureResult([cost], 0, "", 0.2, i))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_file = tmpdir + "/records.json"
+        auto_scheduler.save_records(log_file, inputs, results)
+        expected = auto_scheduler.ApplyHistoryBest(log_file)
+
+        index_file = auto_scheduler.measure_record.make_record_index(log_file)
+        assert auto_scheduler.measure_record.find_record_index(log_file) == index_file
+        for records in [log_file, index_file]:
+            context = auto_scheduler.ApplyHistoryBest(records)
+            for name in ["best_by_targetkey", "best_by_model"]:
+                best, expected_best = getattr(context, name), getattr(expected, name)
+                assert best.keys() == expected_best.keys()
+                for key, (_, res) in best.items():
+                    assert res.costs[0].value == expected_best[key][1].costs[0].value
+
+        for task in tasks:
+            inp, res = auto_scheduler.load_best_record(index_file, task.workload_key)
+            assert inp.task.workload_key == task.workload_key
+            assert res.costs[0].value == min(
+                r.costs[0].value
+                for i, r in zip(inputs, results)
+                if i.task.workload_key == task.workload_key
+            )
+
+        # a distilled index is a valid record file
+        distilled = tmpdir + "/best.json"
+        auto_scheduler.measure_record.distill_record_file(log_file, distilled, index=True)
+        assert auto_scheduler.measure_record.is_record_index(distilled)
+        assert len(list(auto_scheduler.load_records(distilled))) <= len(inputs)
+
+        # the index is not used once the log file is modified
+        auto_scheduler.save_records(log_file, inputs[:1], results[:1])
+        assert auto_scheduler.measure_record.find_record_index(log_file) is None
+
+
 def test_measure_local_builder_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -213,6 +262,34 @@ def test_measure_local_builder_runner():
         assert mress[0].error_no == 0
 
 
+def test_measure_local_builder_reuse_workers():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(512, 512, 512), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder(n_parallel=2, reuse_workers=True)
+    local_runner = auto_scheduler.LocalRunner(timeout=60)
+
+    for _ in range(2):
+        bress = local_builder.build([minp] * 3)
+        assert len(bress) == 3
+        assert all(res.error_no == 0 for res in bress)
+    mress = local_runner.run([minp], bress[:1])
+    assert mress[0].error_no == 0
+
+    # the results are streamed in the order they finish
+    indices = [
+        i
+        for i, res in auto_scheduler.measure.iter_local_builder_build(
+            [minp] * 3, timeout=15, n_parallel=2, verbose=0
+        )
+    ]
+    assert sorted(indices) == [0, 1, 2]
+
+
 def test_measure_local_builder_rpc_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -237,6 +314,75 @@ def test_measure_local_builder_rpc_runner():
         del measure_ctx
 
 
+def test_measure_rpc_runner_reuse_session():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext(timeout=60, reuse_session=True)
+    rpc_runner = measure_ctx.runner
+
+    # the second round runs in the same worker and session as the first one
+    for _ in range(2):
+        bress = local_builder.build([minp])
+        assert bress[0].error_no == 0
+        mress = rpc_runner.run([minp], bress)
+        assert mress[0].error_no == 0
+
+    del measure_ctx
+
+
+def test_measure_rpc_runner_batch():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext(timeout=60, batch_size=2)
+    rpc_runner = measure_ctx.runner
+
+    inputs = [minp] * 3
+    bress = local_builder.build(inputs)
+    assert all(res.error_no == 0 for res in bress)
+    mress = rpc_runner.run(inputs, bress)
+    assert len(mress) == 3
+    assert all(res.error_no == 0 for res in mress)
+
+    del measure_ctx
+
+
+def test_measure_runner_adaptive():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    local_runner = auto_scheduler.LocalRunner(timeout=60, repeat=3, adaptive=True, max_repeat=6)
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext(
+        timeout=60, repeat=3, adaptive=True, max_repeat=6
+    )
+
+    for runner in [local_runner, measure_ctx.runner]:
+        bress = local_builder.build([minp])
+        assert bress[0].error_no == 0
+        mress = runner.run([minp], bress)
+        assert mress[0].error_no == 0
+        assert 2 <= len(mress[0].costs) <= 6
+        assert mress[0].variance >= 0
+
+    del measure_ctx
+
+
 def measure_local_builder_rpc_runner_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_measure_local_builder_rpc_runner()
@@ -281,6 +427,11 @@ if __name__ == "__main__":
     test_record_follow_split_follow_fused_split()
     test_record_pragma_storage_align_rfactor()
     test_recover_measure_input()
+    test_record_index()
     test_measure_local_builder_runner()
+    test_measure_local_builder_reuse_workers()
     test_measure_local_builder_rpc_runner()
+    test_measure_rpc_runner_reuse_session()
+    test_measure_rpc_runner_batch()
+    test_measure_runner_adaptive()
     test_measure_target_host()
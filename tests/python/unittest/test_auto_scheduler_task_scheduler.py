@@ -17,6 +17,7 @@
 """ Test task scheduler """
 
 import tempfile
+import time
 
 import multiprocessing
 import numpy as np
@@ -137,7 +138,90 @@ def test_task_scheduler_gradient():
         del measure_ctx
 
 
+@tvm.testing.requires_llvm
+def test_task_scheduler_concurrent():
+    tasks = []
+    for n in [2, 4, 8, 16]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    for strategy in ["round-robin", "gradient"]:
+        with tempfile.NamedTemporaryFile() as fp:
+            log_file = fp.name
+            num_trials = 3 * len(tasks)
+
+            measure_ctx = auto_scheduler.LocalRPCMeasureContext()
+            tune_option = auto_scheduler.TuningOptions(
+                num_measure_trials=num_trials,
+                runner=measure_ctx.runner,
+                num_measures_per_round=1,
+                measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+            )
+            task_scheduler = auto_scheduler.TaskScheduler(
+                tasks, strategy=strategy, num_concurrent_tasks=2
+            )
+            task_scheduler.tune(tune_option, search_policy="sketch.random")
+
+            # every task is warmed up and the budget is not exceeded
+            counters = {task.workload_key: 0 for task in tasks}
+            for inp, _ in auto_scheduler.load_records(log_file):
+                counters[inp.task.workload_key] += 1
+            assert all(ct >= 1 for ct in counters.values())
+            assert sum(counters.values()) == task_scheduler.ct <= num_trials
+            del measure_ctx
+
+
+@tvm.testing.requires_llvm
+def test_task_scheduler_concurrent_measurements_overlap():
+    tasks = []
+    for n in [2, 4, 8, 16]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    # make every measurement slow and record when it runs
+    local_runner_run = tvm.get_global_func("auto_scheduler.local_runner.run")
+    intervals = []
+
+    def slow_local_runner_run(*args):
+        start = time.time()
+        time.sleep(1)
+        ret = local_runner_run(*args)
+        intervals.append((start, time.time()))
+        return ret
+
+    tvm.register_func("auto_scheduler.local_runner.run", slow_local_runner_run, override=True)
+    try:
+        with tempfile.NamedTemporaryFile() as fp:
+            log_file = fp.name
+            tune_option = auto_scheduler.TuningOptions(
+                num_measure_trials=len(tasks),
+                num_measures_per_round=1,
+                measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+            )
+            task_scheduler = auto_scheduler.TaskScheduler(
+                tasks, strategy="round-robin", num_concurrent_tasks=2
+            )
+            task_scheduler.tune(tune_option, search_policy="sketch.random")
+
+            # all records are written by the scheduling thread
+            assert len(list(auto_scheduler.load_records(log_file))) == len(tasks)
+    finally:
+        tvm.register_func("auto_scheduler.local_runner.run", local_runner_run, override=True)
+
+    assert len(intervals) == len(tasks)
+    intervals.sort()
+    assert any(nxt[0] < cur[1] for cur, nxt in zip(intervals, intervals[1:]))
+
+
 if __name__ == "__main__":
     test_task_scheduler_round_robin()
     test_task_scheduler_round_robin_spawn()
     test_task_scheduler_gradient()
+    test_task_scheduler_concurrent()
+    test_task_scheduler_concurrent_measurements_overlap()
@@ -19,6 +19,7 @@ import copy
 import logging
 
 from tvm.autotvm import database
+from tvm.contrib import utils
 from tvm.autotvm.record import encode, MeasureResult
 
 from test_autotvm_common import get_sample_records
@@ -116,9 +117,40 @@ def test_db_filter():
     assert len(records) == 2
 
 
+def test_sqlite_db():
+    logging.info("test sqlite db ...")
+    temp = utils.tempdir()
+    records = get_sample_records(5)
+    _db = database.SQLiteDatabase(temp.relpath("records.db"))
+    for inp, result in records:
+        _db.save(inp, result)
+
+    # a second connection sees the records of the first one
+    _db2 = database.SQLiteDatabase(temp.relpath("records.db"))
+    for inp, result in records:
+        assert _db2.load(inp) == result
+
+    inp1, res1 = records[0]
+    res2 = MeasureResult(*(list(tuple(res1))[:-1] + [res1.timestamp + 1]))
+    _db.save(inp1, res2, extend=True)
+    assert _db2.load(inp1) == res2
+    assert len(_db2.load(inp1, get_all=True)) == 2
+    _db.save(inp1, res1)
+    assert _db2.load(inp1, get_all=True) == [res1]
+
+    assert len(_db2.filter(lambda inp, ress: any(r.costs[0] <= 2 for r in ress))) == 2
+
+    partial_results, unsaved = database.filter_inputs(_db2, [inp for inp, _ in records])
+    assert not unsaved and all(res is not None for res in partial_results)
+
+    _db.flush()
+    assert _db2.load(inp1) is None
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_save_load()
     test_db_hash()
     test_db_latest_all()
     test_db_filter()
+    test_sqlite_db()
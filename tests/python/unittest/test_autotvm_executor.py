@@ -15,9 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 """Test local executor"""
+import multiprocessing
+import os
 import time
 
-from tvm.autotvm.measure import LocalExecutor, executor
+from tvm.autotvm.measure import LocalExecutor, PoolExecutor, executor
 
 
 def slow(n):
@@ -64,6 +66,58 @@ def test_timeout():
     assert isinstance(res, executor.TimeoutError)
 
 
+def get_pid():
+    return os.getpid()
+
+
+def crash():
+    os._exit(1)
+
+
+def allocate(n):
+    # keep the memory alive in the worker
+    allocate.blob = bytearray(n)
+    return os.getpid()
+
+
+def test_pool_executor():
+    ex = PoolExecutor(n_parallel=2)
+    # the workers are not forked from the threads of this process
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        assert ex.start_method == "forkserver"
+    f1 = ex.submit(slow, 9999999)
+    f2 = ex.submit(fast, 9999999)
+    assert f1.get() == f2.get()
+
+    # workers are reused
+    pids = set(ex.submit(get_pid).get() for _ in range(10))
+    assert len(pids) <= 2
+    ex.close()
+
+
+def test_pool_executor_recycle():
+    timeout = 0.5
+    ex = PoolExecutor(timeout=timeout, n_parallel=1, max_memory=256 << 20)
+    pid = ex.submit(get_pid).get()
+
+    # a worker that times out or crashes is replaced
+    assert isinstance(ex.submit(timeout_job, timeout).get(), executor.TimeoutError)
+    new_pid = ex.submit(get_pid).get()
+    assert new_pid != pid
+    assert isinstance(ex.submit(crash).get(), Exception)
+    pid = ex.submit(get_pid).get()
+    assert pid != new_pid
+
+    # a worker that exceeds the memory cap is replaced after its job
+    assert ex.submit(allocate, 1 << 10).get() == pid
+    assert ex.submit(get_pid).get() == pid
+    assert ex.submit(allocate, 512 << 20).get() == pid
+    assert ex.submit(get_pid).get() != pid
+    ex.close()
+
+
 if __name__ == "__main__":
     test_local_measure_async()
     test_timeout()
+    test_pool_executor()
+    test_pool_executor_recycle()
@@ -76,6 +76,36 @@ def test_random_tuner():
         assert 8 <= idx <= 15
 
 
+def test_tuner_multi_filter():
+    """Test that the tuners skip the points rejected by multi_filter"""
+
+    task, _ = get_sample_task()
+    task.config_space.multi_filter(lambda e: e["tile_x"].size[-1] <= 8)
+    valid = [i for i in range(len(task.config_space)) if task.config_space.is_index_valid(i)]
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=DummyRunner())
+
+    for tuner_class in [GridSearchTuner, RandomTuner]:
+        tuner = tuner_class(task)
+        measured = []
+
+        def _callback(_, inputs, results):
+            measured.extend(inp.config.index for inp in inputs)
+
+        tuner.tune(
+            n_trial=len(task.config_space), measure_option=measure_option, callbacks=[_callback]
+        )
+        assert sorted(measured) == valid
+
+    tuner = autotvm.tuner.GATuner(task, pop_size=8)
+    measured = []
+    tuner.tune(
+        n_trial=len(task.config_space),
+        measure_option=measure_option,
+        callbacks=[lambda _, inputs, results: measured.extend(x.config.index for x in inputs)],
+    )
+    assert measured and set(measured) <= set(valid)
+
+
 if __name__ == "__main__":
     test_gridsearch_tuner()
     test_gridsearch_tuner_spawn()
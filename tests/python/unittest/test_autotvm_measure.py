@@ -26,6 +26,8 @@ from tvm import te
 from test_autotvm_common import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
 from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
+from tvm.autotvm.measure.measure_methods import BuildResult, adaptive_measure, run_through_rpc
+from tvm.rpc import session_cache
 
 
 def test_task_tuner_without_measurement():
@@ -47,6 +49,31 @@ def test_task_tuner_without_measurement():
         assert tuner.best_flops > 1
 
 
+def test_task_tuner_pipelined():
+    """test overlapping build and run in the tuning loop"""
+    task, _ = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=2), runner=DummyRunner()
+    )
+
+    for tuner_class in [
+        autotvm.tuner.RandomTuner,
+        autotvm.tuner.GridSearchTuner,
+        autotvm.tuner.XGBTuner,
+    ]:
+        tuner = tuner_class(task)
+        measured = []
+
+        def _callback(_, inputs, results):
+            measured.extend(inp.config.index for inp in inputs)
+
+        tuner.tune(n_trial=10, measure_option=measure_option, callbacks=[_callback], pipeline=True)
+        assert tuner.best_flops > 1
+        assert len(measured) == 10
+        assert len(set(measured)) == 10
+
+
 def task_tuner_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_task_tuner_without_measurement()
@@ -87,9 +114,171 @@ def test_check_correctness():
     tuner.tune(n_trial=2, measure_option=measure_option, callbacks=[_callback_wrong])
 
 
+def test_check_correctness_reuse_session():
+    task, target = get_sample_task()
+
+    # the reference data stays on the device of the reused session
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(),
+        runner=autotvm.LocalRunner(check_correctness=True, reuse_session=True),
+    )
+
+    def _callback_correct(tuner, measure_inputs, measure_results):
+        for _, res in zip(measure_inputs, measure_results):
+            assert res.error_no == 0
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=4, measure_option=measure_option, callbacks=[_callback_correct])
+
+    # a bad template
+    n = 128
+    target = tvm.target.Target("llvm -device=bad_device")
+    task = autotvm.task.create("testing/bad_matmul", args=(n, n, n, "float32"), target=target)
+
+    def _callback_wrong(tuner, measure_inputs, measure_results):
+        for _, res in zip(measure_inputs, measure_results):
+            assert res.error_no == MeasureErrorNo.WRONG_ANSWER
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=4, measure_option=measure_option, callbacks=[_callback_wrong])
+
+
+def test_local_runner_reuse_session():
+    task, target = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(), runner=autotvm.LocalRunner(reuse_session=True)
+    )
+
+    def _callback(tuner, measure_inputs, measure_results):
+        for _, res in zip(measure_inputs, measure_results):
+            assert res.error_no == 0
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=4, measure_option=measure_option, callbacks=[_callback])
+
+
+def test_run_through_rpc_reuse_session_error():
+    """a reused session is cleaned up and dropped after a device error"""
+    task, target = get_sample_task()
+    inp = autotvm.MeasureInput(target, task, task.config_space.get(0))
+    build_result = BuildResult("/tmp/build/mod.tar", [], None, 0.1)
+    removed = []
+    dropped = []
+
+    class _BrokenSession:
+        def upload(self, filename):
+            pass
+
+        def load_module(self, name):
+            raise tvm.TVMError("device lost")
+
+        def remove(self, name):
+            removed.append(name)
+
+    old_get_session, old_drop_session = session_cache.get_session, session_cache.drop_session
+    session_cache.get_session = lambda *args: _BrokenSession()
+    session_cache.drop_session = lambda *args: dropped.append(args)
+    try:
+        remote_args = ("key", "localhost", 9190, 1, 10)
+        res = run_through_rpc(inp, build_result, 1, 1, 0, 0, remote_args, reuse_session=True)
+    finally:
+        session_cache.get_session, session_cache.drop_session = old_get_session, old_drop_session
+    assert res.error_no == MeasureErrorNo.RUNTIME_DEVICE
+    assert dropped == [("key", "localhost", 9190)]
+    assert removed == ["mod.tar", "mod.tar.so"]
+
+
+def test_local_runner_batch():
+    task, target = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(), runner=autotvm.LocalRunner(batch_size=4)
+    )
+
+    def _callback(tuner, measure_inputs, measure_results):
+        assert len(measure_results) == len(measure_inputs)
+        for _, res in zip(measure_inputs, measure_results):
+            assert res.error_no == 0
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=8, measure_option=measure_option, callbacks=[_callback])
+
+
+def test_local_builder_reuse_workers():
+    task, target = get_sample_task()
+
+    builder = autotvm.LocalBuilder(reuse_workers=True, n_parallel=2)
+    measure_option = autotvm.measure_option(builder=builder, runner=autotvm.LocalRunner())
+
+    def _callback(tuner, measure_inputs, measure_results):
+        assert len(measure_results) == len(measure_inputs)
+        for _, res in zip(measure_inputs, measure_results):
+            assert res.error_no == 0
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=8, measure_option=measure_option, callbacks=[_callback])
+    # the workers are stopped at the end of tuning and started again on reuse
+    assert builder.executor is None
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=4, measure_option=measure_option, callbacks=[_callback])
+
+
+def test_adaptive_measure():
+    def make_measure(costs):
+        calls = []
+
+        def measure(n):
+            calls.append(n)
+            return [costs[len(calls) % len(costs)] for _ in range(n)]
+
+        return measure, calls
+
+    # a stable program stops once it has `repeat` samples
+    measure, calls = make_measure([1.0])
+    costs = adaptive_measure(measure, repeat=3, max_repeat=12)
+    assert len(costs) == 3 and calls == [2, 1]
+
+    # a program slower than 2x the best one is stopped after the first round
+    measure, calls = make_measure([5.0])
+    costs = adaptive_measure(measure, repeat=3, max_repeat=12, best_cost=1.0)
+    assert len(costs) == 2
+
+    # a noisy program is sampled up to max_repeat
+    samples = [1.0, 1.5, 0.7, 1.3]
+    noisy = lambda n: [samples[i % len(samples)] for i in range(n)]
+    costs = adaptive_measure(noisy, repeat=3, max_repeat=12, best_cost=1.0)
+    assert len(costs) == 12
+
+
+def test_local_runner_adaptive():
+    task, target = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(), runner=autotvm.LocalRunner(adaptive=True, max_repeat=8)
+    )
+
+    def _callback(tuner, measure_inputs, measure_results):
+        for _, res in zip(measure_inputs, measure_results):
+            assert res.error_no == 0
+            assert 2 <= len(res.costs) <= 8
+            assert res.variance is not None
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=4, measure_option=measure_option, callbacks=[_callback])
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
+    test_task_tuner_pipelined()
     test_task_tuner_without_measurement_spawn()
     test_check_correctness()
+    test_check_correctness_reuse_session()
+    test_local_runner_reuse_session()
+    test_run_through_rpc_reuse_session_error()
+    test_local_runner_batch()
+    test_local_builder_reuse_workers()
+    test_adaptive_measure()
+    test_local_runner_adaptive()
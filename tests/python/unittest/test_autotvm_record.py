@@ -15,6 +15,9 @@
 # specific language governing permissions and limitations
 # under the License.
 """test the correctness of dump and load of data log"""
+import os
+import subprocess
+import sys
 import time
 
 import tvm
@@ -87,7 +90,63 @@ def test_apply_history_best():
     assert str(x) == str(tsk.config_space.get(2))
 
 
+def test_record_store():
+    temp = utils.tempdir()
+    json_path = temp.relpath("temp.log")
+    store_path = temp.relpath("temp.rec")
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 10)]
+    results = [MeasureResult((10 - i,), 0, 0, 0) for i in range(0, 10)]
+    results[9] = MeasureResult((RuntimeError("error"),), MeasureErrorNo.RUNTIME_DEVICE, 0, 0)
+
+    cb = autotvm.callback.log_to_record_store(store_path)
+    cb(None, inputs[:5], results[:5])
+    cb(None, inputs[5:], results[5:])
+    assert autotvm.record_store.is_record_store(store_path)
+
+    # O(1) lookup of the best valid record
+    with autotvm.record_store.RecordStore(store_path, readonly=True) as store:
+        assert len(store) == 10
+        inp, res = store.query_best("cpu", tsk.workload)
+        assert measure_str_key(inp) == measure_str_key(inputs[8])
+        assert res.costs == (2,)
+
+    # records appended by a process that crashed before flushing the index are picked up
+    # from the data file
+    script = "\n".join(
+        [
+            "import os, sys",
+            "sys.path.insert(0, %r)" % os.path.dirname(os.path.abspath(__file__)),
+            "import test_autotvm_common",
+            "from tvm import autotvm",
+            "inp, res = autotvm.record.decode(sys.argv[1])",
+            "store = autotvm.record_store.RecordStore(sys.argv[2])",
+            "store.append(inp, res)",
+            "os._exit(0)",
+        ]
+    )
+    line = encode(inputs[9], MeasureResult((1,), 0, 0, 0))
+    subprocess.check_call([sys.executable, "-c", script, line, store_path])
+    hist_best = ApplyHistoryBest(store_path)
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(9))
+
+    # round trip through the json protocol
+    autotvm.record_store.convert_to_json(store_path, json_path)
+    ref = list(zip(inputs, results)) + [(inputs[9], MeasureResult((1,), 0, 0, 0))]
+    loaded = list(autotvm.record.load_from_file(json_path))
+    assert len(loaded) == len(ref)
+    for x, y in zip(ref, loaded):
+        assert measure_str_key(x[0]) == measure_str_key(y[0])
+        assert x[1].error_no == y[1].error_no
+
+    store_path_2 = temp.relpath("temp_2.rec")
+    autotvm.record_store.convert_from_json(json_path, store_path_2)
+    assert [x[1] for x in autotvm.record.load_from_file(store_path_2)] == [x[1] for x in loaded]
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
     test_file_io()
+    test_record_store()
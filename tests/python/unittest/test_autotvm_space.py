@@ -100,5 +100,40 @@ def test_split():
         pass
 
 
+def test_split_lazy():
+    cfg = ConfigSpace()
+    cfg.define_split("tile_x", cfg.axis(224 * 224), policy="verbose", num_outputs=4)
+    space = cfg.space_map["tile_x"]
+    assert not space.entities
+    for i in [0, len(space) // 2, len(space) - 1]:
+        size = space[i].size
+        assert 224 * 224 >= size[1] * size[2] * size[3]
+
+    # filtered entities keep the enumeration order
+    cfg.define_split(
+        "tile_y", cfg.axis(256), policy="factors", num_outputs=3, filter=lambda x: x.size[-1] <= 4
+    )
+    cfg.define_split("tile_z", cfg.axis(256), policy="factors", num_outputs=3)
+    filtered = [x.size for x in (cfg.space_map["tile_z"][i] for i in range(45)) if x.size[-1] <= 4]
+    assert [cfg.space_map["tile_y"][i].size for i in range(len(filtered))] == filtered
+    assert len(cfg.space_map["tile_y"]) == len(filtered)
+
+
+def test_multi_filter():
+    cfg = ConfigSpace()
+    gemm_func(cfg, 128)
+    assert not cfg.has_multi_filters()
+    cfg.multi_filter(filter=lambda e: e["tile_x"].size[-1] * e["tile_y"].size[-1] <= 64)
+    assert cfg.has_multi_filters()
+    assert len(cfg) == 64
+    valid = [i for i in range(len(cfg)) if cfg.is_index_valid(i)]
+    assert cfg.valid_length() == len(valid)
+    for i in range(len(cfg)):
+        entity = cfg.get(i)
+        assert (i in valid) == (entity["tile_x"].size[-1] * entity["tile_y"].size[-1] <= 64)
+
+
 if __name__ == "__main__":
     test_split()
+    test_split_lazy()
+    test_multi_filter()
@@ -24,6 +24,9 @@ from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
 from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.autotvm.tuner.model_based_tuner import CostModel, PersistentFeatureCache, point2knob
+from tvm.contrib import utils
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer, random_walk_batch
 
 from test_autotvm_common import get_sample_task, get_sample_records
 
@@ -65,7 +68,55 @@ def test_tuner():
     tuner.load_history(records)
 
 
+def test_persistent_feature_cache():
+    task, target = get_sample_task()
+    temp = utils.tempdir()
+    cache_file = temp.relpath("features.db")
+
+    model = XGBoostCostModel(
+        task, "itervar", "rank", feature_cache=PersistentFeatureCache(cache_file)
+    )
+    feas = model._get_feature(np.arange(10))
+
+    # a new session reads the features back instead of extracting them again
+    cache = PersistentFeatureCache(cache_file)
+    stored = cache.load("itervar", [(task.workload, i) for i in range(20)])
+    assert len(stored) == 10
+    model = XGBoostCostModel(task, "itervar", "rank", feature_cache=cache)
+    model._close_pool()
+    np.testing.assert_allclose(model._get_feature(np.arange(10)), feas)
+
+
+def test_sa_random_walk_batch():
+    dims = np.array([3, 1, 4, 5])
+    strides = np.array([1, 3, 3, 12])
+    points = np.random.randint(0, 60, size=1000)
+    new_points = random_walk_batch(points, dims, strides)
+    for old, new in zip(points, new_points):
+        old, new = point2knob(old, dims), point2knob(new, dims)
+        assert sum(x != y for x, y in zip(old, new)) == 1
+
+
+def test_sa_find_maximums():
+    task, _ = get_sample_task()
+
+    class IndexModel(CostModel):
+        def predict(self, xs, output_margin=False):
+            return np.array(xs, dtype="float64")
+
+    n = len(task.config_space)
+    optimizer = SimulatedAnnealingOptimizer(task, n_iter=200, parallel_size=16)
+    exclusive = {n - 1}
+    maximums = optimizer.find_maximums(IndexModel(), 8, exclusive)
+    assert len(maximums) == 8 == len(set(maximums))
+    assert not exclusive.intersection(maximums)
+    assert maximums == sorted(maximums, reverse=True)
+
+
 if __name__ == "__main__":
     test_fit()
     test_fit_spawn()
     test_tuner()
+    test_persistent_feature_cache()
+    test_sa_random_walk_batch()
+    test_sa_find_maximums()
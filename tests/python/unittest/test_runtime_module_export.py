@@ -14,6 +14,8 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
+
 from tvm import relay
 from tvm.relay import testing
 import tvm
@@ -226,5 +228,39 @@ def test_mod_export():
     verify_multi_c_mod_export()
 
 
+@tvm.testing.requires_llvm
+def test_export_library_object_cache():
+    from shutil import which
+
+    if which("g++") is None:
+        print("Skip test because g++ is not available.")
+        return
+
+    A = te.placeholder((1024,), name="A")
+    B = te.compute(A.shape, lambda *i: A(*i) + 1.0, name="B")
+    s = te.create_schedule(B.op)
+    temp = utils.tempdir()
+    kwargs = {"options": ["-O2", "-std=c++14", "-I" + header_file_dir_path.relpath("")]}
+
+    num_objects = []
+    for i in range(2):
+        host_lib = tvm.build(s, [A, B], "llvm", name="myadd_host")
+        host_lib.import_module(tvm.build(s, [A, B], "c", name="myadd"))
+        host_lib.import_module(generate_engine_module())
+        path_lib = temp.relpath("deploy_lib%d.so" % i)
+        host_lib.export_library(
+            path_lib, workers=2, object_cache_dir=temp.relpath("objects"), **kwargs
+        )
+        loaded_lib = tvm.runtime.load_module(path_lib)
+        assert loaded_lib.imported_modules[0].type_key == "library"
+        num_objects.append(
+            len([x for x in os.listdir(temp.relpath("objects")) if x.endswith(".o")])
+        )
+    # the C sources are compiled once, the second export only links
+    assert num_objects[0] >= 2
+    assert num_objects[1] == num_objects[0]
+
+
 if __name__ == "__main__":
     test_mod_export()
+    test_export_library_object_cache()
@@ -213,7 +213,48 @@ def test_combine_module_llvm():
     check_llvm()
 
 
+@tvm.testing.requires_llvm
+def test_linked_module_cache():
+    temp = utils.tempdir()
+    n = te.var("n")
+    A = te.placeholder((n,), name="A")
+    B = te.compute(A.shape, lambda *i: A(*i) + 1.0, name="B")
+    s = te.create_schedule(B.op)
+    path_tar = temp.relpath("myadd.tar")
+    tvm.build(s, [A, B], "llvm", name="myadd").export_library(path_tar)
+
+    num_links = [0]
+    create_shared = cc.create_shared
+
+    def counting_create_shared(*args, **kwargs):
+        num_links[0] += 1
+        return create_shared(*args, **kwargs)
+
+    old_env = os.environ.get("TVM_LINKED_MODULE_CACHE_DIR")
+    os.environ["TVM_LINKED_MODULE_CACHE_DIR"] = temp.relpath("cache")
+    cc.create_shared = counting_create_shared
+    try:
+        for _ in range(3):
+            f = tvm.runtime.load_module(path_tar)
+            a = tvm.nd.array(np.zeros(10, dtype=A.dtype))
+            b = tvm.nd.array(np.zeros(10, dtype=A.dtype))
+            f(a, b)
+            np.testing.assert_equal(b.asnumpy(), a.asnumpy() + 1)
+    finally:
+        cc.create_shared = create_shared
+        if old_env is None:
+            del os.environ["TVM_LINKED_MODULE_CACHE_DIR"]
+        else:
+            os.environ["TVM_LINKED_MODULE_CACHE_DIR"] = old_env
+
+    assert num_links[0] == 1
+    # the archive is linked into the cache, not next to it
+    assert not os.path.exists(path_tar + ".so")
+    assert len([x for x in os.listdir(temp.relpath("cache")) if x.endswith(".so")]) == 1
+
+
 if __name__ == "__main__":
     test_combine_module_llvm()
     test_device_module_dump()
     test_dso_module_load()
+    test_linked_module_cache()
@@ -26,8 +26,8 @@ import multiprocessing
 import pytest
 import numpy as np
 from tvm import rpc
-from tvm.contrib import utils, cc
-from tvm.rpc.tracker import Tracker
+from tvm.contrib import utils, cc, file_cache
+from tvm.rpc.tracker import LoadAwareScheduler, ServerStats, Tracker
 
 # tkonolige: The issue as I understand it is this: multiprocessing's spawn
 # method launches a new process and then imports the relevant modules. This
@@ -210,6 +210,166 @@ def test_rpc_file_exchange():
     assert rev == blob
 
 
+@tvm.testing.requires_rpc
+def test_rpc_file_exchange_chunked():
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    blob = bytearray(np.random.randint(0, 255, size=(100), dtype="uint8"))
+    progress = []
+    remote.upload(
+        blob, "dat.bin", chunk_size=16, progress_callback=lambda n, total: progress.append(n)
+    )
+    assert progress == list(range(16, 100, 16)) + [100]
+    assert remote.download("dat.bin") == blob
+
+    # resume an interrupted upload of a local file
+    temp = utils.tempdir()
+    local_path = temp.relpath("dat.bin")
+    with open(local_path, "wb") as out_file:
+        out_file.write(blob)
+    remote.upload(blob[:40], "part.bin")
+    progress = []
+    remote.upload(
+        local_path,
+        "part.bin",
+        chunk_size=32,
+        progress_callback=lambda n, total: progress.append(n),
+        resume=True,
+    )
+    assert progress == [72, 100]
+    assert remote.download("part.bin") == blob
+
+    # download in chunks, and resume it
+    remote.download_file("dat.bin", temp.relpath("rev.bin"), chunk_size=16)
+    with open(temp.relpath("rev.bin"), "rb") as in_file:
+        assert bytearray(in_file.read()) == blob
+    with open(temp.relpath("rev.bin"), "wb") as out_file:
+        out_file.write(blob[:50])
+    progress = []
+    remote.download_file(
+        "dat.bin",
+        temp.relpath("rev.bin"),
+        chunk_size=16,
+        progress_callback=lambda n, total: progress.append(n),
+        resume=True,
+    )
+    assert progress == [66, 82, 98, 100]
+    with open(temp.relpath("rev.bin"), "rb") as in_file:
+        assert bytearray(in_file.read()) == blob
+
+
+@tvm.testing.requires_rpc
+@tvm.testing.requires_llvm
+def test_rpc_time_evaluate_batch():
+    n = 102
+    A = te.placeholder((n,), name="A")
+    B = te.compute(A.shape, lambda *i: A(*i) + 1.0, name="B")
+    s = te.create_schedule(B.op)
+    # the modules of a batch usually have the same file name in different directories
+    files = []
+    for _ in range(2):
+        temp = utils.tempdir()
+        tvm.build(s, [A, B], "llvm", name="myadd").export_library(temp.relpath("tmp_func.tar"))
+        files.append((temp, temp.relpath("tmp_func.tar")))
+
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    assert remote.supports_time_evaluate_batch()
+    arg_info = [((n,), A.dtype), ((n,), B.dtype)]
+    outs = remote.time_evaluate_batch([x[1] for x in files], [arg_info] * 2, "llvm", number=2)
+    assert len(outs) == 2
+    assert all("costs" in out and len(out["costs"]) == 1 for out in outs), outs
+
+
+@tvm.testing.requires_rpc
+@tvm.testing.requires_llvm
+def test_rpc_module_cache():
+    n = 102
+    A = te.placeholder((n,), name="A")
+    B = te.compute(A.shape, lambda *i: A(*i) + 1.0, name="B")
+    s = te.create_schedule(B.op)
+    f = tvm.build(s, [A, B], "llvm", name="myadd")
+    temp = utils.tempdir()
+    path_tar = temp.relpath("dev_lib.tar")
+    f.export_library(path_tar)
+    size = os.path.getsize(path_tar)
+
+    cache_dir = temp.relpath("cache")
+    server = rpc.Server("localhost", module_cache_dir=cache_dir)
+
+    def check_remote(expect_hit):
+        remote = rpc.connect(server.host, server.port)
+        progress = []
+        remote.upload(
+            path_tar,
+            chunk_size=1024,
+            progress_callback=lambda n, total: progress.append(n),
+            use_cache=True,
+        )
+        assert (progress == [size]) == expect_hit
+        f1 = remote.load_module("dev_lib.tar")
+        ctx = remote.cpu(0)
+        a = tvm.nd.array(np.random.uniform(size=n).astype(A.dtype), ctx)
+        b = tvm.nd.array(np.zeros(n, dtype=A.dtype), ctx)
+        f1(a, b)
+        np.testing.assert_equal(b.asnumpy(), a.asnumpy() + 1)
+        local_path = temp.relpath("dev_lib.download.so")
+        with open(local_path, "wb") as fo:
+            fo.write(remote.download_linked_module("dev_lib.tar"))
+        tvm.runtime.load_module(local_path)
+
+    check_remote(expect_hit=False)
+    # the uploaded archive and the library linked from it
+    assert sorted(os.path.splitext(x)[1] for x in os.listdir(cache_dir)) == [".so", ".tar"]
+    check_remote(expect_hit=True)
+
+
+@tvm.testing.requires_rpc
+def test_rpc_upload_without_module_cache():
+    temp = utils.tempdir()
+    with open(temp.relpath("blob"), "wb") as out_file:
+        out_file.write(b"x" * 100)
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    queried = []
+    get_function = remote.get_function
+
+    def counting_get_function(name):
+        queried.append(name)
+        return get_function(name)
+
+    remote.get_function = counting_get_function
+    for _ in range(3):
+        remote.upload(temp.relpath("blob"), use_cache=True)
+        assert remote.download("blob") == bytearray(b"x" * 100)
+    # the missing cache function of the server is only looked up once per session
+    assert queried.count("tvm.rpc.server.cache_fetch") == 1
+
+
+def test_rpc_module_cache_eviction():
+    temp = utils.tempdir()
+    cache = file_cache.ModuleCache(temp.relpath("cache"), max_size=250)
+    digests = []
+    for i in range(3):
+        with open(temp.relpath("mod"), "wb") as out_file:
+            out_file.write(bytes([i]) * 100)
+        digests.append(file_cache.file_digest(temp.relpath("mod")))
+        cache.put(digests[-1], temp.relpath("mod"), ".so")
+        # make the order of the uses visible in the mtime
+        time.sleep(0.05)
+        if i == 1:
+            assert cache.get(digests[0], ".so")
+            time.sleep(0.05)
+    # the least recently used file is evicted
+    assert cache.get(digests[1], ".so") is None
+    assert cache.fetch(digests[0], ".so", temp.relpath("fetched.so"))
+    with open(temp.relpath("fetched.so"), "rb") as in_file:
+        assert in_file.read() == bytes([0]) * 100
+    assert cache.get(digests[2], ".so")
+    with pytest.raises(ValueError):
+        cache.get("../x")
+
+
 @tvm.testing.requires_rpc
 @tvm.testing.requires_llvm
 def test_rpc_remote_module():
@@ -476,6 +636,177 @@ def test_rpc_tracker_register():
     tracker.terminate()
 
 
+def test_rpc_tracker_multi_slot_server():
+    tracker = Tracker("localhost", port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=(tracker.host, tracker.port),
+        num_slots=2,
+    )
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 2
+    assert summary["server_info"][0]["slots"] == 2
+
+    # both slots serve a session at the same time, each in its own work directory
+    remote1 = client.request(device_key)
+    remote2 = client.request(device_key)
+    workpath1 = remote1.get_function("tvm.rpc.server.workpath")("")
+    workpath2 = remote2.get_function("tvm.rpc.server.workpath")("")
+    assert workpath1 != workpath2
+    time.sleep(1)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 0
+    assert summary["server_info"][0]["free_slots"] == 0
+
+    del remote1
+    time.sleep(3)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 1
+    assert summary["server_info"][0]["free_slots"] == 1
+
+    del remote2
+    server.terminate()
+    tracker.terminate()
+
+
+def test_rpc_tracker_load_aware_scheduler():
+    tracker = Tracker("localhost", port=9000, port_end=10000, scheduler="load_aware")
+    device_key = "test_device"
+    server = rpc.Server(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=(tracker.host, tracker.port),
+    )
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+
+    remote = client.request(device_key)
+    summary = client.summary()
+    assert summary["server_stats"][0]["active"] == 1
+
+    del remote
+    time.sleep(3)
+    summary = client.summary()
+    stats = summary["server_stats"][0]
+    assert stats["active"] == 0
+    assert stats["sessions"] == 1 and stats["errors"] == 0
+    assert not stats["quarantined"]
+    assert summary["queue_info"][device_key]["quarantined"] == 0
+    assert "Server Health" in client.text_summary()
+
+    # the statistics of a disconnected server are dropped
+    server.terminate()
+    time.sleep(1)
+    assert client.summary()["server_stats"] == []
+    tracker.terminate()
+
+
+def test_rpc_tracker_server_stats():
+    stats = ServerStats("dev", ("localhost", 9000), window=4, max_errors=2, quarantine_period=0.5)
+    stats.on_dispatch()
+    stats.on_report("ok", 1.0)
+    stats.on_put()
+    assert stats.active == 0 and stats.error_rate() == 0.0 and not stats.quarantined()
+
+    # quarantined after max_errors failed sessions in a row, until the period ends
+    for _ in range(2):
+        stats.on_dispatch()
+        stats.on_report("error", 2.0)
+        stats.on_put()
+    assert stats.quarantined()
+    assert stats.error_rate() == 2 / 3 and stats.mean_duration() == 5 / 3
+    time.sleep(0.6)
+    assert not stats.quarantined()
+
+    # the sessions of servers that do not report succeed when the slot is put back
+    stats = ServerStats("dev", ("localhost", 9001), max_errors=2, quarantine_period=0.5)
+    stats.on_dispatch()
+    stats.on_put()
+    assert stats.num_sessions == 1 and stats.num_errors == 0
+
+    # a disconnected server fails its open sessions
+    stats.on_dispatch()
+    stats.on_dispatch()
+    stats.on_close()
+    assert stats.active == 0 and stats.num_errors == 2 and not stats.connected
+    assert stats.quarantined() and not stats.stale()
+    time.sleep(0.6)
+    assert stats.stale()
+
+
+class _FakeServerConn(object):
+    """A tracker connection of a server, as seen by the schedulers"""
+
+    def __init__(self, port, slots=1, max_errors=3):
+        self.stats = ServerStats("dev", ("localhost", port), max_errors=max_errors)
+        self.stats.quarantine_period = 0.5
+        self.slots = slots
+        self.pending_matchkeys = set()
+
+    def summary(self):
+        return {"slots": self.slots}
+
+    def value(self):
+        matchkey = "dev:%d" % len(self.pending_matchkeys)
+        self.pending_matchkeys.add(matchkey)
+        return (self, "localhost", self.stats.addr[1], matchkey)
+
+
+def _finish_session(conn, status, duration):
+    conn.stats.on_dispatch()
+    conn.stats.on_report(status, duration)
+    conn.stats.on_put()
+
+
+def test_rpc_tracker_load_aware_scheduler_ranking():
+    slow = _FakeServerConn(9000)
+    _finish_session(slow, "ok", 2.0)
+    fast = _FakeServerConn(9001)
+    _finish_session(fast, "ok", 0.1)
+    flaky = _FakeServerConn(9002)
+    _finish_session(flaky, "ok", 0.1)
+    _finish_session(flaky, "error", 0.1)
+    busy = _FakeServerConn(9003, slots=2)
+    _finish_session(busy, "ok", 0.1)
+    busy.stats.on_dispatch()
+    broken = _FakeServerConn(9004, max_errors=1)
+    _finish_session(broken, "error", 0.1)
+
+    scheduler = LoadAwareScheduler("dev")
+    for conn in [broken, flaky, busy, slow, fast]:
+        scheduler.put(conn.value())
+    assert scheduler.summary() == {"free": 5, "pending": 0, "quarantined": 1}
+
+    # lower error rate first, then lower load, then shorter sessions
+    ports = []
+
+    def _callback(value):
+        ports.append(value[1])
+        return True
+
+    for _ in range(5):
+        scheduler.request("user", 0, _callback)
+    assert ports == [9001, 9000, 9003, 9002]
+    assert scheduler.summary()["pending"] == 1
+
+    # the slot of the quarantined server is handed out when the quarantine ends
+    scheduler.poll()
+    assert len(ports) == 4
+    time.sleep(0.6)
+    scheduler.poll()
+    assert ports[-1] == 9004
+    assert not broken.pending_matchkeys
+
+
 def _target(host, port, device_key, timeout):
     client = rpc.connect_tracker(host, port)
     remote = client.request(device_key, session_timeout=timeout)
@@ -536,10 +867,19 @@ if __name__ == "__main__":
     test_rpc_return_func()
     test_bigendian_rpc()
     test_rpc_remote_module()
+    test_rpc_time_evaluate_batch()
+    test_rpc_module_cache()
+    test_rpc_upload_without_module_cache()
+    test_rpc_module_cache_eviction()
     test_rpc_file_exchange()
+    test_rpc_file_exchange_chunked()
     test_rpc_array()
     test_rpc_simple()
     test_local_func()
     test_rpc_tracker_register()
+    test_rpc_tracker_server_stats()
+    test_rpc_tracker_load_aware_scheduler_ranking()
     test_rpc_tracker_request()
+    test_rpc_tracker_multi_slot_server()
+    test_rpc_tracker_load_aware_scheduler()
     test_rpc_large_array()
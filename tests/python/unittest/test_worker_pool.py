@@ -0,0 +1,70 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the pool of persistent worker processes"""
+import os
+import time
+
+from tvm.contrib.worker_pool import WorkerPool
+
+
+def _square(x):
+    return x * x
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _raise(msg):
+    raise ValueError(msg)
+
+
+def _exit():
+    os._exit(1)
+
+
+def test_worker_pool_reuse():
+    with WorkerPool(1) as pool:
+        assert pool.map(_square, range(5)) == [0, 1, 4, 9, 16]
+        pids = {pool.submit(_sleep, (0,)).get() for _ in range(3)}
+        assert len(pids) == 1 and os.getpid() not in pids
+
+
+def test_worker_pool_errors():
+    with WorkerPool(1) as pool:
+        pid = pool.submit(_sleep, (0,)).get()
+
+        res = pool.submit(_raise, ("error",)).get()
+        assert isinstance(res, ValueError)
+        # an exception does not kill the worker
+        assert pool.submit(_sleep, (0,)).get() == pid
+
+        res = pool.submit(_sleep, (10,), timeout=0.5).get()
+        assert isinstance(res, TimeoutError)
+        # the worker that timed out is replaced
+        new_pid = pool.submit(_sleep, (0,)).get()
+        assert new_pid != pid
+
+        res = pool.submit(_exit).get()
+        assert isinstance(res, ChildProcessError)
+        assert pool.submit(_square, (3,)).get() == 9
+
+
+if __name__ == "__main__":
+    test_worker_pool_reuse()
+    test_worker_pool_errors()